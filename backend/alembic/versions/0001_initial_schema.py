@@ -0,0 +1,212 @@
+"""Initial schema, mirroring database/init.sql
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TIMESTAMP_TABLES = ("users", "projects", "tasks", "meetings", "integrations")
+
+project_status = postgresql.ENUM(
+    "planning", "in_progress", "review", "completed", "on_hold",
+    name="project_status", create_type=False
+)
+member_role = postgresql.ENUM("owner", "admin", "member", "viewer", name="member_role", create_type=False)
+task_status = postgresql.ENUM(
+    "todo", "in_progress", "review", "done", "blocked", "cancelled",
+    name="task_status", create_type=False
+)
+task_priority = postgresql.ENUM("low", "medium", "high", "urgent", name="task_priority", create_type=False)
+integration_type = postgresql.ENUM("google_drive", "slack", "canvas", name="integration_type", create_type=False)
+
+ENUMS = (project_status, member_role, task_status, task_priority, integration_type)
+
+
+def _timestamps():
+    return (
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.DateTime(timezone=True))
+    )
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    bind = op.get_bind()
+    for enum in ENUMS:
+        enum.create(bind)
+    
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("username", sa.String(255), nullable=False, unique=True),
+        sa.Column("full_name", sa.String(255)),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("is_active", sa.Boolean, server_default=sa.true()),
+        sa.Column("is_superuser", sa.Boolean, server_default=sa.false()),
+        sa.Column("google_token", sa.Text),
+        sa.Column("slack_token", sa.Text),
+        sa.Column("canvas_token", sa.Text),
+        *_timestamps()
+    )
+    
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("status", project_status, server_default="planning"),
+        sa.Column("creator_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("google_drive_folder_id", sa.String(255)),
+        sa.Column("slack_channel_id", sa.String(255)),
+        sa.Column("canvas_course_id", sa.String(255)),
+        sa.Column("start_date", sa.DateTime(timezone=True)),
+        sa.Column("end_date", sa.DateTime(timezone=True)),
+        *_timestamps()
+    )
+    
+    op.create_table(
+        "project_members",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("role", member_role, server_default="member"),
+        sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.UniqueConstraint("project_id", "user_id")
+    )
+    
+    op.create_table(
+        "meetings",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("creator_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("meeting_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_minutes", sa.Integer),
+        sa.Column("location", sa.String(255)),
+        sa.Column("raw_notes", sa.Text),
+        sa.Column("ai_summary", sa.Text),
+        sa.Column("key_decisions", postgresql.JSONB),
+        sa.Column("action_items", postgresql.JSONB),
+        sa.Column("google_doc_id", sa.String(255)),
+        sa.Column("slack_thread_ts", sa.String(255)),
+        *_timestamps()
+    )
+    
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("status", task_status, server_default="todo"),
+        sa.Column("priority", task_priority, server_default="medium"),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("assignee_id", sa.Integer, sa.ForeignKey("users.id", ondelete="SET NULL")),
+        sa.Column("creator_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("meeting_id", sa.Integer, sa.ForeignKey("meetings.id", ondelete="SET NULL")),
+        sa.Column("estimated_hours", sa.Integer),
+        sa.Column("actual_hours", sa.Integer),
+        sa.Column("due_date", sa.DateTime(timezone=True)),
+        sa.Column("completed_at", sa.DateTime(timezone=True)),
+        sa.Column("ai_extracted", sa.Text),
+        sa.Column("ai_confidence", sa.Integer),
+        *_timestamps(),
+        sa.CheckConstraint("ai_confidence >= 0 AND ai_confidence <= 100")
+    )
+    
+    op.create_table(
+        "weekly_reports",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("project_id", sa.Integer, sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("week_number", sa.Integer, nullable=False),
+        sa.Column("year", sa.Integer, nullable=False),
+        sa.Column("tasks_completed", postgresql.JSONB),
+        sa.Column("tasks_in_progress", postgresql.JSONB),
+        sa.Column("tasks_planned", postgresql.JSONB),
+        sa.Column("completion_rate", sa.Integer),
+        sa.Column("hours_logged", sa.Integer),
+        sa.Column("summary", sa.Text),
+        sa.Column("blockers", postgresql.JSONB),
+        sa.Column("highlights", postgresql.JSONB),
+        sa.Column("next_steps", postgresql.JSONB),
+        sa.Column("week_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("week_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("generated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.CheckConstraint("completion_rate >= 0 AND completion_rate <= 100"),
+        sa.UniqueConstraint("project_id", "week_number", "year")
+    )
+    
+    op.create_table(
+        "integrations",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("type", integration_type, nullable=False),
+        sa.Column("access_token", sa.Text, nullable=False),
+        sa.Column("refresh_token", sa.Text),
+        sa.Column("token_expiry", sa.DateTime(timezone=True)),
+        sa.Column("account_email", sa.String(255)),
+        sa.Column("team_id", sa.String(255)),
+        sa.Column("canvas_domain", sa.String(255)),
+        sa.Column("is_active", sa.Boolean, server_default=sa.true()),
+        sa.Column("last_sync", sa.DateTime(timezone=True)),
+        sa.Column("sync_status", sa.String(255)),
+        sa.Column("metadata", postgresql.JSONB),
+        sa.Column("connected_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        sa.UniqueConstraint("user_id", "type")
+    )
+    
+    # Lookup indexes
+    op.create_index("idx_projects_creator", "projects", ["creator_id"])
+    op.create_index("idx_project_members_user", "project_members", ["user_id"])
+    op.create_index("idx_project_members_project", "project_members", ["project_id"])
+    op.create_index("idx_tasks_project", "tasks", ["project_id"])
+    op.create_index("idx_tasks_assignee", "tasks", ["assignee_id"])
+    op.create_index("idx_tasks_status", "tasks", ["status"])
+    op.create_index("idx_meetings_project", "meetings", ["project_id"])
+    op.create_index("idx_meetings_date", "meetings", ["meeting_date"])
+    op.create_index("idx_weekly_reports_project", "weekly_reports", ["project_id"])
+    op.create_index("idx_integrations_user", "integrations", ["user_id"])
+    
+    # Keyset pagination and task statistics
+    op.create_index("idx_projects_created_id", "projects", ["created_at", "id"])
+    op.create_index("idx_tasks_project_created_id", "tasks", ["project_id", "created_at", "id"])
+    op.create_index("idx_tasks_project_due_id", "tasks", ["project_id", "due_date", "id"])
+    op.create_index("idx_tasks_project_status", "tasks", ["project_id", "status"])
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = CURRENT_TIMESTAMP;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql'
+    """)
+    for table in TIMESTAMP_TABLES:
+        op.execute(
+            f"CREATE TRIGGER update_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()"
+        )
+
+
+def downgrade() -> None:
+    for table in TIMESTAMP_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS update_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS update_updated_at_column()")
+    
+    # Dropping a table drops its indexes
+    for table in ("integrations", "weekly_reports", "tasks", "meetings", "project_members", "projects", "users"):
+        op.drop_table(table)
+    
+    bind = op.get_bind()
+    for enum in reversed(ENUMS):
+        enum.drop(bind)
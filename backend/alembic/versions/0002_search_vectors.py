@@ -0,0 +1,43 @@
+"""Full-text search columns and GIN indexes on meetings and tasks
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Adding a stored generated column rewrites the table, so run this
+outside peak hours on large databases.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTORS = {
+    "meetings": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(raw_notes, '')), 'C')"
+    ),
+    "tasks": (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    )
+}
+
+
+def upgrade() -> None:
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column(
+            "search_vector", postgresql.TSVECTOR, sa.Computed(expression, persisted=True)
+        ))
+        op.create_index(f"idx_{table}_search", table, ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    for table in SEARCH_VECTORS:
+        op.drop_index(f"idx_{table}_search", table_name=table)
+        op.drop_column(table, "search_vector")
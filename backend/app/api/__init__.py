@@ -1,4 +1,4 @@
 """API Routes Package"""
-from . import auth, projects, tasks, meetings, integrations, oauth
+from . import auth, projects, tasks, meetings, integrations, oauth, jobs, search
 
-__all__ = ["auth", "projects", "tasks", "meetings", "integrations", "oauth"]
+__all__ = ["auth", "projects", "tasks", "meetings", "integrations", "oauth", "jobs", "search"]
@@ -6,32 +6,34 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
+from app.passwords import get_password_hash
 from app.schemas.user import User as UserSchema, UserCreate, Token, UserLogin
+from app.utils.password_pool import run_password_job
 from app.utils.auth import (
     authenticate_user, 
     create_access_token, 
-    get_current_active_user,
-    get_password_hash
+    get_current_user_record
 )
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserSchema)
-def register(
+async def register(
     user_create: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         (User.email == user_create.email) | (User.username == user_create.username)
-    ).first()
+    ))
     
     if existing_user:
         if existing_user.email == user_create.email:
@@ -45,30 +47,31 @@ def register(
                 detail="Username already taken"
             )
     
-    # Create new user
+    # Create new user (hashing runs in the bounded password pool)
+    hashed_password = await run_password_job(get_password_hash, user_create.password)
     db_user = User(
         email=user_create.email,
         username=user_create.username,
         full_name=user_create.full_name,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=hashed_password,
         is_active=user_create.is_active,
         is_superuser=user_create.is_superuser
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 @router.post("/token", response_model=Token)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login to get access token"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -86,12 +89,12 @@ def login(
 
 
 @router.post("/login", response_model=Token)
-def login_json(
+async def login_json(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login with JSON payload (for frontend)"""
-    user = authenticate_user(db, credentials.username, credentials.password)
+    user = await authenticate_user(db, credentials.username, credentials.password)
     
     if not user:
         raise HTTPException(
@@ -108,8 +111,8 @@ def login_json(
 
 
 @router.get("/me", response_model=UserSchema)
-def read_users_me(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+async def read_users_me(
+    current_user: Annotated[User, Depends(get_current_user_record)]
 ):
     """Get current user information"""
     # Add OAuth status
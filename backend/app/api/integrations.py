@@ -6,14 +6,14 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import Principal, get_current_active_user, get_current_user_record
 
 router = APIRouter()
 
 
 @router.get("/")
 def get_integrations(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """Get user's integrations"""
@@ -27,7 +27,7 @@ def get_integrations(
 @router.post("/{integration_type}/connect")
 def connect_integration(
     integration_type: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Connect an integration"""
@@ -37,7 +37,7 @@ def connect_integration(
 @router.delete("/{integration_type}")
 def disconnect_integration(
     integration_type: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Disconnect an integration"""
@@ -0,0 +1,55 @@
+"""
+Background jobs API endpoints
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.schemas.job import JobState, JobStatus
+from app.utils.auth import Principal, get_current_active_user
+from app.utils.dependencies import check_project_role
+from app.utils.jobs import job_project_id
+
+router = APIRouter()
+
+
+def _job_status(job_id: str) -> JobStatus:
+    """Read a job's state from the result backend"""
+    # Celery loads on first use rather than at API startup
+    from celery.result import AsyncResult
+    from app.worker import celery_app
+    
+    result = AsyncResult(job_id, app=celery_app)
+    state = result.state.lower()
+    
+    job = JobStatus(
+        job_id=job_id,
+        status=state if state in JobState._value2member_map_ else JobState.PENDING
+    )
+    if result.successful():
+        job.result = result.result
+    elif result.failed() or state == JobState.RETRY:
+        job.error = str(result.result)
+    
+    return job
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job_status(
+    job_id: str,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Poll the status of a background job (members of the job's project only)"""
+    project_id = job_project_id(job_id)
+    if project_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    await check_project_role(request, db, current_user, project_id)
+    
+    return await asyncio.to_thread(_job_status, job_id)
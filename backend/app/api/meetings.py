@@ -1,30 +1,235 @@
 """
 Meetings API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import json
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.database import get_async_db, AsyncSessionLocal
+from app.models.meeting import Meeting
+from app.models.project import ProjectMember, MemberRole
+from app.schemas.job import JobStatus
+from app.schemas.meeting import Meeting as MeetingSchema, MeetingCreate, MeetingUpdate
+from app.services.ai_service import AIService
+from app.utils.auth import Principal, get_current_active_user
+from app.utils.dependencies import check_project_role
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified, version_columns
+from app.utils.jobs import enqueue_job
 
 router = APIRouter()
 
+# Roles that may create or edit meetings (viewers only read)
+MEETING_WRITE_ROLES = (MemberRole.OWNER.value, MemberRole.ADMIN.value, MemberRole.MEMBER.value)
 
-@router.get("/")
-def get_meetings(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+
+@router.get("/", response_model=List[MeetingSchema])
+async def get_meetings(
+    request: Request,
+    response: Response,
+    project_id: Optional[int] = Query(None, description="Defaults to all of the user's projects"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get meetings for user's projects, newest first (supports If-None-Match)"""
+    if project_id is not None:
+        await check_project_role(request, db, current_user, project_id)
+        scope = Meeting.project_id == project_id
+    else:
+        scope = Meeting.project_id.in_(
+            select(ProjectMember.project_id).where(ProjectMember.user_id == current_user.id)
+        )
+    
+    version = (await db.execute(select(*version_columns(Meeting)).where(scope))).one()
+    etag = make_etag("meetings", current_user.id, project_id, tuple(version), skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    
+    return (await db.scalars(
+        select(Meeting).where(scope).order_by(
+            Meeting.meeting_date.desc(), Meeting.id.desc()
+        ).offset(skip).limit(limit)
+    )).all()
+
+
+def _index_meeting(meeting: Meeting) -> None:
+    """Embed a written meeting into this process's semantic index, if loaded"""
+    from app.services.embeddings import get_semantic_index
+    
+    get_semantic_index().update_meeting(meeting)
+
+
+@router.post("/", response_model=MeetingSchema)
+async def create_meeting(
+    meeting: MeetingCreate,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get meetings for user's projects"""
-    return {"message": "Meetings endpoint - to be implemented"}
+    """Create a new meeting (owners, admins and members)"""
+    await check_project_role(request, db, current_user, meeting.project_id, MEETING_WRITE_ROLES)
+    
+    db_meeting = Meeting(
+        **meeting.dict(),
+        creator_id=current_user.id
+    )
+    db.add(db_meeting)
+    await db.commit()
+    await db.refresh(db_meeting)
+    
+    # Embedding runs after the response is sent
+    background_tasks.add_task(_index_meeting, db_meeting)
+    return db_meeting
+
+
+@router.patch("/{meeting_id}", response_model=MeetingSchema)
+async def update_meeting(
+    meeting_id: int,
+    meeting_update: MeetingUpdate,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a meeting (owners, admins and members)"""
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found"
+        )
+    
+    await check_project_role(request, db, current_user, meeting.project_id, MEETING_WRITE_ROLES)
+    
+    update_data = meeting_update.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(meeting, field, value)
+    await db.commit()
+    await db.refresh(meeting)
+    
+    if {"title", "raw_notes", "ai_summary"} & update_data.keys():
+        background_tasks.add_task(_index_meeting, meeting)
+    return meeting
+
+
+async def _get_meeting_with_notes(
+    request: Request,
+    db: AsyncSession,
+    meeting_id: int,
+    current_user: Principal
+) -> Meeting:
+    """Load a meeting the user can access and that has notes to process"""
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Meeting not found"
+        )
+    
+    await check_project_role(request, db, current_user, meeting.project_id)
+    
+    if not meeting.raw_notes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Meeting has no notes to process"
+        )
+    
+    return meeting
+
+
+@router.post("/{meeting_id}/summarize", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def summarize_meeting(
+    meeting_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Queue AI summarization of a meeting; poll /api/jobs/{job_id} for the result"""
+    meeting = await _get_meeting_with_notes(request, db, meeting_id, current_user)
+    
+    def send(job_id: str) -> None:
+        # Celery loads on first enqueue rather than at API startup
+        from app.worker import PRIORITY_INTERACTIVE, summarize_meeting_job
+        summarize_meeting_job.apply_async(
+            (meeting.id, meeting.project_id), task_id=job_id, priority=PRIORITY_INTERACTIVE
+        )
+    
+    return await enqueue_job(meeting.project_id, send)
+
+
+@router.post("/{meeting_id}/extract-tasks", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def extract_meeting_tasks(
+    meeting_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Queue extraction of tasks from a meeting's notes"""
+    meeting = await _get_meeting_with_notes(request, db, meeting_id, current_user)
+    
+    def send(job_id: str) -> None:
+        from app.worker import PRIORITY_INTERACTIVE, extract_tasks_job
+        extract_tasks_job.apply_async(
+            (meeting.id, meeting.project_id, current_user.id), task_id=job_id, priority=PRIORITY_INTERACTIVE
+        )
+    
+    return await enqueue_job(meeting.project_id, send)
+
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+
+async def _save_summary(meeting_id: int, result: dict) -> None:
+    """Persist AI fields in a session of our own (the request's is closed by now)"""
+    async with AsyncSessionLocal() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        if meeting is None:
+            return
+        meeting.ai_summary = result["ai_summary"]
+        meeting.key_decisions = result["key_decisions"]
+        meeting.action_items = result["action_items"]
+        await db.commit()
 
 
-@router.post("/")
-def create_meeting(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+@router.post("/{meeting_id}/summarize/stream")
+async def stream_meeting_summary(
+    meeting_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Create a new meeting"""
-    return {"message": "Create meeting - to be implemented"}
\ No newline at end of file
+    """
+    Summarize a meeting, streaming tokens as NDJSON while they are generated.
+    
+    Emits {"type": "token", "text": ...} lines, then one
+    {"type": "done", ...} line with the parsed fields once they have been
+    saved to the meeting. If the client disconnects, generation stops.
+    """
+    meeting = await _get_meeting_with_notes(request, db, meeting_id, current_user)
+    notes = meeting.raw_notes
+    ai_service = AIService()
+    
+    async def events():
+        result = ai_service.cached_summary(notes)
+        if result is None:
+            text = []
+            try:
+                async for chunk in ai_service.stream_summary(notes):
+                    text.append(chunk)
+                    yield _ndjson({"type": "token", "text": chunk})
+            except Exception:
+                yield _ndjson({"type": "error", "detail": "Summarization failed"})
+                return
+            result = AIService.parse_summary("".join(text))
+        
+        await _save_summary(meeting_id, result)
+        yield _ndjson({"type": "done", "meeting_id": meeting_id, **result})
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
\ No newline at end of file
@@ -2,55 +2,173 @@
 Projects API endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import func, select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_async_db
 from app.models.user import User
 from app.models.project import Project, ProjectMember, MemberRole as MemberRoleModel
+from app.models.task import Task
+from app.models.meeting import Meeting
+from app.schemas.job import JobStatus
 from app.schemas.project import (
     Project as ProjectSchema, 
     ProjectCreate, 
     ProjectUpdate,
     AddProjectMember,
     UpdateProjectMember,
-    ProjectMember as ProjectMemberSchema
+    ProjectMember as ProjectMemberSchema,
+    ProjectOrder
+)
+from app.services.search import search_index
+from app.services.task_stats import invalidate_task_stats
+from app.utils.auth import Principal, get_current_active_user, invalidate_project_principals
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified, version_columns
+from app.utils.fast_json import FastRows, schema_columns
+from app.utils.jobs import enqueue_job
+from app.utils.dependencies import invalidate_project_roles, require_project_role
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    keyset_after,
+    keyset_order,
+    split_page
 )
-from app.utils.auth import get_current_active_user
 
 router = APIRouter()
 
 
+def _count_columns():
+    """Correlated subqueries for the related counts shown on a project"""
+    member_count = select(func.count(ProjectMember.id)).where(
+        ProjectMember.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    task_count = select(func.count(Task.id)).where(
+        Task.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    meeting_count = select(func.count(Meeting.id)).where(
+        Meeting.project_id == Project.id
+    ).correlate(Project).scalar_subquery()
+    
+    return (
+        member_count.label("member_count"),
+        task_count.label("task_count"),
+        meeting_count.label("meeting_count")
+    )
+
+
+# Column-only rows for the FAST_JSON_RESPONSES path
+_project_rows = FastRows(ProjectSchema, [*schema_columns(ProjectSchema, Project), *_count_columns()])
+
+
+async def _projects_version(db: AsyncSession, project_ids, with_member_users: bool = False) -> tuple:
+    """Cheap aggregates that change whenever anything shown for these projects does"""
+    def aggregate(column, model):
+        return select(column).where(model.project_id.in_(project_ids)).scalar_subquery()
+    
+    parts = [
+        select(column).where(Project.id.in_(project_ids)).scalar_subquery()
+        for column in version_columns(Project)
+    ]
+    # Related rows only contribute counts, so inserts and deletes are enough
+    related = (
+        (ProjectMember, ProjectMember.joined_at),
+        (Task, Task.created_at),
+        (Meeting, Meeting.created_at)
+    )
+    for model, added_at in related:
+        parts += [aggregate(func.count(model.id), model), aggregate(func.max(added_at), model)]
+    if with_member_users:
+        parts.append(select(func.max(func.coalesce(User.updated_at, User.created_at))).join(
+            ProjectMember, ProjectMember.user_id == User.id
+        ).where(ProjectMember.project_id.in_(project_ids)).scalar_subquery())
+    
+    return tuple((await db.execute(select(*parts))).one())
+
+
+def _with_counts(rows):
+    """Attach the counts from (project, members, tasks, meetings) rows"""
+    projects = []
+    for project, member_count, task_count, meeting_count in rows:
+        project.member_count = member_count
+        project.task_count = task_count
+        project.meeting_count = meeting_count
+        projects.append(project)
+    return projects
+
+
 @router.get("/", response_model=List[ProjectSchema])
-def get_projects(
+async def get_projects(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    order_by: Optional[ProjectOrder] = Query(None, description="Sort key; enables cursor pagination"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header"),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all projects for current user"""
-    # Get projects where user is a member
-    projects = db.query(Project).join(ProjectMember).filter(
+    """
+    Get all projects for current user.
+    
+    Passing order_by or cursor switches from offset to keyset
+    pagination; the next page's cursor is returned in X-Next-Cursor.
+    Supports If-None-Match with a weak ETag.
+    """
+    my_project_ids = select(ProjectMember.project_id).where(ProjectMember.user_id == current_user.id)
+    etag = make_etag(
+        "projects", current_user.id, await _projects_version(db, my_project_ids),
+        skip, limit, order_by, cursor
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = etag_headers(etag)
+    
+    fast = settings.FAST_JSON_RESPONSES
+    
+    # Get projects where user is a member, with counts in the same query
+    columns = _project_rows.columns if fast else [Project, *_count_columns()]
+    query = select(*columns).join(ProjectMember).where(
         ProjectMember.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    )
     
-    # Add counts for each project
-    for project in projects:
-        project.member_count = db.query(ProjectMember).filter(
-            ProjectMember.project_id == project.id
-        ).count()
-        project.task_count = len(project.tasks)
-        project.meeting_count = len(project.meetings)
+    if order_by is None and cursor is None:
+        rows = await db.execute(query.offset(skip).limit(limit))
+        if fast:
+            return _project_rows.response(rows, headers)
+        response.headers.update(headers)
+        return _with_counts(rows)
     
-    return projects
+    # Keyset pagination over (created_at, id)
+    order_by = order_by or ProjectOrder.CREATED_AT
+    if cursor is not None:
+        value, row_id = decode_cursor(cursor, order_by.value)
+        query = query.where(keyset_after(Project.created_at, Project.id, value, row_id))
+    
+    rows = (await db.execute(
+        query.order_by(*keyset_order(Project.created_at, Project.id)).limit(limit + 1)
+    )).all()
+    project = (lambda row: row) if fast else (lambda row: row[0])
+    page, next_cursor = split_page(
+        rows, limit, order_by.value, key=lambda row: (project(row).created_at, project(row).id)
+    )
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if fast:
+        return _project_rows.response(page, headers)
+    response.headers.update(headers)
+    
+    return _with_counts(page)
 
 
 @router.post("/", response_model=ProjectSchema)
-def create_project(
+async def create_project(
     project: ProjectCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new project"""
     # Create project
@@ -59,7 +177,7 @@ def create_project(
         creator_id=current_user.id
     )
     db.add(db_project)
-    db.flush()  # Get the project ID without committing
+    await db.flush()  # Get the project ID without committing
     
     # Add creator as owner
     db_member = ProjectMember(
@@ -68,88 +186,70 @@ def create_project(
         role=MemberRoleModel.OWNER
     )
     db.add(db_member)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     return db_project
 
 
-@router.get("/{project_id}", response_model=ProjectSchema)
-def get_project(
+@router.get("/{project_id}", response_model=ProjectSchema, dependencies=[Depends(require_project_role())])
+async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific project"""
-    # Check if user has access to project
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this project"
-        )
+    """Get a specific project (supports If-None-Match)"""
+    etag = make_etag("project", await _projects_version(db, [project_id], with_member_users=True))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    row = (await db.execute(
+        select(Project, *_count_columns()).where(Project.id == project_id)
+    )).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
     # Add counts
-    project.member_count = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project.id
-    ).count()
-    project.task_count = len(project.tasks)
-    project.meeting_count = len(project.meetings)
-    
-    # Add members list
-    members = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id
-    ).all()
-    
-    project.members = []
-    for m in members:
-        member_data = ProjectMemberSchema(
-            id=m.id,
-            project_id=m.project_id,
-            user_id=m.user_id,
-            role=m.role.value,
-            joined_at=m.joined_at,
-            user_email=m.user.email,
-            user_name=m.user.username
+    project = _with_counts([row])[0]
+    
+    # Add members list: one joined query, only the columns the schema needs
+    members = await db.execute(
+        select(
+            ProjectMember.id,
+            ProjectMember.project_id,
+            ProjectMember.user_id,
+            ProjectMember.role,
+            ProjectMember.joined_at,
+            User.email.label("user_email"),
+            User.username.label("user_name")
+        ).join(User, User.id == ProjectMember.user_id).where(
+            ProjectMember.project_id == project_id
         )
-        project.members.append(member_data)
+    )
+    project.members = [
+        {**member, "role": member["role"].value}
+        for member in members.mappings()
+    ]
     
     return project
 
 
-@router.patch("/{project_id}", response_model=ProjectSchema)
-def update_project(
+@router.patch("/{project_id}", response_model=ProjectSchema, dependencies=[Depends(require_project_role(
+    MemberRoleModel.OWNER, MemberRoleModel.ADMIN,
+    detail="You don't have permission to update this project"
+))])
+async def update_project(
     project_id: int,
     project_update: ProjectUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a project (requires admin or owner role)"""
-    # Check if user has admin/owner access
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role.in_([MemberRoleModel.OWNER, MemberRoleModel.ADMIN])
-    ).first()
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to update this project"
-        )
-    
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,95 +261,107 @@ def update_project(
     for field, value in update_data.items():
         setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     
     return project
 
 
-@router.delete("/{project_id}")
-def delete_project(
+@router.delete("/{project_id}", dependencies=[Depends(require_project_role(
+    MemberRoleModel.OWNER,
+    detail="Only project owner can delete the project"
+))])
+async def delete_project(
     project_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a project (requires owner role)"""
-    # Check if user is owner
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role == MemberRoleModel.OWNER
-    ).first()
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only project owner can delete the project"
-        )
-    
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    db.delete(project)
-    db.commit()
+    # Let the database cascade to members, tasks and meetings (on SQLite
+    # database.py switches foreign keys on for that)
+    await db.execute(delete(Project).where(Project.id == project_id))
+    await db.commit()
+    
+    # A Core delete skips the mapper events that keep these current
+    from app.services.embeddings import forget_project
+    from app.services.task_dedup import task_indexes
+    
+    invalidate_project_principals(project_id)
+    invalidate_project_roles(project_id)
+    invalidate_task_stats(project_id)
+    task_indexes.pop(project_id)
+    search_index.remove_project(project_id)
+    forget_project(project_id)
     
     return {"message": "Project deleted successfully"}
 
 
-@router.post("/{project_id}/members", response_model=ProjectMemberSchema)
-def add_project_member(
+@router.post(
+    "/{project_id}/reports/weekly",
+    response_model=JobStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_project_role())]
+)
+async def generate_weekly_report(project_id: int):
+    """Queue generation of this week's report for a project"""
+    def send(job_id: str) -> None:
+        # Celery loads on first enqueue rather than at API startup
+        from app.worker import PRIORITY_BATCH, weekly_report_job
+        weekly_report_job.apply_async((project_id,), task_id=job_id, priority=PRIORITY_BATCH)
+    
+    return await enqueue_job(project_id, send)
+
+
+@router.post("/{project_id}/members", response_model=ProjectMemberSchema, dependencies=[Depends(require_project_role(
+    MemberRoleModel.OWNER, MemberRoleModel.ADMIN,
+    detail="You don't have permission to add members"
+))])
+async def add_project_member(
     project_id: int,
     member_data: AddProjectMember,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a member to project (requires admin or owner role)"""
-    # Check if current user has permission
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role.in_([MemberRoleModel.OWNER, MemberRoleModel.ADMIN])
-    ).first()
-    
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to add members"
-        )
-    
     # Check if user exists
-    new_user = db.query(User).filter(User.id == member_data.user_id).first()
+    new_user = await db.get(User, member_data.user_id)
     if not new_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Check if user is already a member
-    existing_member = db.query(ProjectMember).filter(
+    already_member = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="User is already a member of this project"
+    )
+    
+    # Check if user is already a member (from the database: the role cache may be stale)
+    if await db.scalar(select(ProjectMember.id).where(
         ProjectMember.project_id == project_id,
         ProjectMember.user_id == member_data.user_id
-    ).first()
-    
-    if existing_member:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User is already a member of this project"
-        )
+    )):
+        raise already_member
     
-    # Add new member
+    # Add new member; the cached role is dropped once this commits
     db_member = ProjectMember(
         project_id=project_id,
         user_id=member_data.user_id,
         role=getattr(MemberRoleModel, member_data.role.value.upper())
     )
     db.add(db_member)
-    db.commit()
-    db.refresh(db_member)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Added concurrently since the check above
+        await db.rollback()
+        raise already_member
+    await db.refresh(db_member)
     
     return ProjectMemberSchema(
         id=db_member.id,
@@ -262,32 +374,21 @@ def add_project_member(
     )
 
 
-@router.delete("/{project_id}/members/{member_id}")
-def remove_project_member(
+@router.delete("/{project_id}/members/{member_id}", dependencies=[Depends(require_project_role(
+    MemberRoleModel.OWNER, MemberRoleModel.ADMIN,
+    detail="You don't have permission to remove members"
+))])
+async def remove_project_member(
     project_id: int,
     member_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove a member from project"""
-    # Check if current user has permission
-    current_member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id,
-        ProjectMember.role.in_([MemberRoleModel.OWNER, MemberRoleModel.ADMIN])
-    ).first()
-    
-    if not current_member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to remove members"
-        )
-    
     # Get the member to remove
-    member_to_remove = db.query(ProjectMember).filter(
+    member_to_remove = await db.scalar(select(ProjectMember).where(
         ProjectMember.id == member_id,
         ProjectMember.project_id == project_id
-    ).first()
+    ))
     
     if not member_to_remove:
         raise HTTPException(
@@ -302,7 +403,8 @@ def remove_project_member(
             detail="Cannot remove project owner"
         )
     
-    db.delete(member_to_remove)
-    db.commit()
+    # The cached role is dropped once this commits
+    await db.delete(member_to_remove)
+    await db.commit()
     
     return {"message": "Member removed successfully"}
\ No newline at end of file
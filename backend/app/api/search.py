@@ -0,0 +1,64 @@
+"""
+Search API endpoints
+"""
+from typing import List, Optional, Sequence
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.project import ProjectMember
+from app.schemas.search import SearchHit, SearchType, SemanticHit
+from app.services.search import search_documents
+from app.utils.auth import Principal, get_current_active_user
+from app.utils.dependencies import check_project_role
+
+router = APIRouter()
+
+
+async def _project_scope(
+    request: Request,
+    db: AsyncSession,
+    current_user: Principal,
+    project_id: Optional[int]
+) -> Sequence[int]:
+    """The one project asked for (if the user is a member), or all of theirs"""
+    if project_id is not None:
+        await check_project_role(request, db, current_user, project_id)
+        return [project_id]
+    return (await db.scalars(
+        select(ProjectMember.project_id).where(ProjectMember.user_id == current_user.id)
+    )).all()
+
+
+@router.get("/", response_model=List[SearchHit])
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words, \"phrases\" and -exclusions"),
+    project_id: Optional[int] = Query(None, description="Defaults to all of the user's projects"),
+    type: Optional[SearchType] = Query(None, description="Only meetings or only tasks"),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search meeting notes, summaries and tasks, best matches first"""
+    project_ids = await _project_scope(request, db, current_user, project_id)
+    types = (type,) if type else tuple(SearchType)
+    return await search_documents(db, q, project_ids, types, limit)
+
+
+@router.get("/semantic", response_model=List[SemanticHit])
+async def semantic_search(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=500, description="A question or description, e.g. who owns the database schema?"),
+    project_id: Optional[int] = Query(None, description="Defaults to all of the user's projects"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Find meetings whose notes are closest in meaning to a question"""
+    # numpy and the encoder load on first use rather than at API startup
+    from app.services.embeddings import get_semantic_index
+    
+    project_ids = await _project_scope(request, db, current_user, project_id)
+    return await get_semantic_index().search(db, q, project_ids, limit)
@@ -1,67 +1,339 @@
 """
 Tasks API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.user import User
-from app.models.task import Task
-from app.models.project import ProjectMember
-from app.schemas.task import Task as TaskSchema, TaskCreate, TaskUpdate
-from app.utils.auth import get_current_active_user
+from app.config import settings
+from app.database import get_async_db
+from app.models.task import Task, TaskStatus as TaskStatusModel
+from app.models.project import ProjectMember, MemberRole
+from app.schemas.task import (
+    Task as TaskSchema,
+    TaskCreate,
+    TaskUpdate,
+    TaskOrder,
+    TaskBulkCreate,
+    TaskBulkDuplicate,
+    TaskBulkError,
+    TaskBulkResult,
+    TaskStats,
+    ProjectTaskStats
+)
+from app.services.report_generator import ReportGenerator, TaskChange
+from app.services.search import index_documents
+from app.services.task_stats import get_task_stats, invalidate_task_stats
+from app.utils.auth import Principal, get_current_active_user
+from app.utils.dependencies import check_project_role, require_project_role
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified, version_columns
+from app.utils.fast_json import FastRows, schema_columns
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    keyset_after,
+    keyset_order,
+    split_page
+)
 
 router = APIRouter()
 
+# Column-only rows for the FAST_JSON_RESPONSES path
+_task_rows = FastRows(TaskSchema, schema_columns(TaskSchema, Task))
 
-@router.get("/", response_model=List[TaskSchema])
-def get_tasks(
+# Roles that may change or delete existing tasks (viewers only read)
+TASK_WRITE_ROLES = (MemberRole.OWNER.value, MemberRole.ADMIN.value, MemberRole.MEMBER.value)
+
+# TaskUpdate fields that may be omitted but not set to null
+NOT_NULL_FIELDS = ("title", "status", "priority")
+
+
+async def _record_report_changes(db: AsyncSession, changes: List[TaskChange]) -> None:
+    """Fold task changes into the weekly reports within the current transaction"""
+    if changes:
+        await db.run_sync(lambda session: ReportGenerator(session).record_task_changes(changes))
+
+
+async def _get_member_task(
+    request: Request,
+    db: AsyncSession,
+    task_id: int,
+    current_user: Principal,
+    roles: Sequence[str] = ()
+) -> Task:
+    """Load a task the current user can access with one of `roles` (any if none are given)"""
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    await check_project_role(request, db, current_user, task.project_id, roles)
+    return task
+
+
+@router.get("/", response_model=List[TaskSchema], dependencies=[Depends(require_project_role(detail="Access denied"))])
+async def get_tasks(
+    request: Request,
+    response: Response,
     project_id: int = Query(..., description="Project ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    order_by: Optional[TaskOrder] = Query(None, description="Sort key; enables cursor pagination"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all tasks for a project"""
-    # Check if user has access to project
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
+    """
+    Get all tasks for a project.
+    
+    Passing order_by or cursor switches from offset to keyset
+    pagination; the next page's cursor is returned in X-Next-Cursor.
+    Supports If-None-Match with a weak ETag.
+    """
+    version = (await db.execute(
+        select(*version_columns(Task)).where(Task.project_id == project_id)
+    )).one()
+    etag = make_etag("tasks", project_id, tuple(version), skip, limit, order_by, cursor)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = etag_headers(etag)
     
-    if not member:
-        raise HTTPException(status_code=403, detail="Access denied")
+    fast = settings.FAST_JSON_RESPONSES
+    query = select(*_task_rows.columns) if fast else select(Task)
+    query = query.where(Task.project_id == project_id)
+    run = db.execute if fast else db.scalars
     
-    tasks = db.query(Task).filter(
-        Task.project_id == project_id
-    ).offset(skip).limit(limit).all()
+    if order_by is None and cursor is None:
+        rows = (await run(query.offset(skip).limit(limit))).all()
+        if fast:
+            return _task_rows.response(rows, headers)
+        response.headers.update(headers)
+        return rows
+    
+    # Keyset pagination over (created_at, id) or (due_date, id)
+    order_by = order_by or TaskOrder.CREATED_AT
+    column = getattr(Task, order_by.value)
+    nullable = order_by == TaskOrder.DUE_DATE
+    if cursor is not None:
+        value, row_id = decode_cursor(cursor, order_by.value)
+        query = query.where(keyset_after(column, Task.id, value, row_id, nullable=nullable))
+    
+    rows = (await run(
+        query.order_by(*keyset_order(column, Task.id, nullable=nullable)).limit(limit + 1)
+    )).all()
+    tasks, next_cursor = split_page(
+        rows, limit, order_by.value, key=lambda task: (getattr(task, order_by.value), task.id)
+    )
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if fast:
+        return _task_rows.response(tasks, headers)
+    response.headers.update(headers)
     
     return tasks
 
 
+@router.get("/stats", response_model=TaskStats, dependencies=[Depends(require_project_role(detail="Access denied"))])
+async def get_project_task_stats(
+    project_id: int = Query(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Task counts per status and completion rate for a project"""
+    return (await get_task_stats(db, [project_id]))[project_id]
+
+
+@router.get("/stats/projects", response_model=List[ProjectTaskStats])
+async def get_projects_task_stats(
+    request: Request,
+    project_ids: Optional[List[int]] = Query(None, alias="project_id", description="Defaults to all of the user's projects"),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Task statistics for several projects at once (dashboard)"""
+    if project_ids is None:
+        project_ids = list(current_user.memberships)
+    for project_id in project_ids:
+        await check_project_role(request, db, current_user, project_id)
+    
+    stats = await get_task_stats(db, project_ids)
+    return [
+        ProjectTaskStats(project_id=project_id, **stats[project_id].dict())
+        for project_id in dict.fromkeys(project_ids)
+    ]
+
+
 @router.post("/", response_model=TaskSchema)
-def create_task(
+async def create_task(
     task: TaskCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new task"""
-    # Check if user has access to project
-    member = db.query(ProjectMember).filter(
-        ProjectMember.project_id == task.project_id,
-        ProjectMember.user_id == current_user.id
-    ).first()
-    
-    if not member:
-        raise HTTPException(status_code=403, detail="Access denied")
+    await check_project_role(request, db, current_user, task.project_id)
     
     db_task = Task(
         **task.dict(),
         creator_id=current_user.id
     )
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.flush()
+    await _record_report_changes(db, [
+        TaskChange(project_id=db_task.project_id, task_id=db_task.id, new_status=task.status)
+    ])
+    await db.commit()
+    await db.refresh(db_task)
+    
+    return db_task
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_bulk(
+    bulk: TaskBulkCreate,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create many tasks in one transaction (e.g. a meeting's action items).
+    
+    Invalid items and items for projects the caller can't access are
+    reported in errors; the rest are inserted with a single statement.
+    AI-extracted items (ai_extracted set) that repeat an open task, or an
+    earlier item, are merged into it and listed in duplicates instead.
+    """
+    errors = []
+    valid = []
+    for index, item in enumerate(bulk.tasks):
+        try:
+            valid.append((index, TaskCreate(**item)))
+        except ValidationError as e:
+            errors.append(TaskBulkError(
+                index=index,
+                detail=[{"loc": err["loc"], "msg": err["msg"]} for err in e.errors()]
+            ))
+    
+    # One membership lookup for every distinct project in the batch
+    project_ids = {task.project_id for _, task in valid}
+    allowed = set()
+    if project_ids:
+        allowed = set((await db.scalars(
+            select(ProjectMember.project_id).where(
+                ProjectMember.user_id == current_user.id,
+                ProjectMember.project_id.in_(project_ids)
+            )
+        )).all())
+    
+    accepted = []
+    extracted = {}
+    for index, task in valid:
+        if task.project_id not in allowed:
+            errors.append(TaskBulkError(index=index, detail="Access denied"))
+            continue
+        accepted.append((index, task))
+        if task.ai_extracted is not None:
+            extracted.setdefault(task.project_id, []).append((index, task))
+    
+    merged_into = {}  # item index -> existing task id
+    same_as = {}  # item index -> index of the item it repeats
+    if extracted:
+        # numpy loads with the first AI-extracted batch rather than at API startup
+        from app.services.task_dedup import dedupe_batch
+        
+        def dedupe(session):
+            for project_id, items in extracted.items():
+                plan = dedupe_batch(session, project_id, [task for _, task in items])
+                merged_into.update({items[i][0]: task_id for i, task_id in plan.merge.items()})
+                same_as.update({items[i][0]: items[j][0] for i, j in plan.same_as.items()})
+        await db.run_sync(dedupe)
+    
+    kept = [(index, task) for index, task in accepted if index not in merged_into and index not in same_as]
+    rows = [{**task.dict(), "creator_id": current_user.id} for _, task in kept]
+    
+    created = []
+    if rows:
+        created = (await db.scalars(insert(Task).returning(Task, sort_by_parameter_order=True), rows)).all()
+        await _record_report_changes(db, [
+            TaskChange(project_id=t.project_id, task_id=t.id, new_status=t.status)
+            for t in created
+        ])
+        await db.commit()
+        # ORM bulk inserts skip the mapper events that keep these up to date
+        invalidate_task_stats(*{t.project_id for t in created})
+        index_documents(created)
+    elif merged_into:
+        await db.commit()
+    
+    created_ids = {index: task.id for (index, _), task in zip(kept, created)}
+    duplicates = [TaskBulkDuplicate(index=index, task_id=task_id) for index, task_id in merged_into.items()]
+    duplicates += [TaskBulkDuplicate(index=index, task_id=created_ids[kept_index]) for index, kept_index in same_as.items()]
+    
+    errors.sort(key=lambda error: error.index)
+    duplicates.sort(key=lambda duplicate: duplicate.index)
+    return TaskBulkResult(created=created, errors=errors, duplicates=duplicates)
+
+
+@router.patch("/{task_id}", response_model=TaskSchema)
+async def update_task(
+    task_id: int,
+    task_update: TaskUpdate,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a task"""
+    update_data = task_update.dict(exclude_unset=True)
+    nulls = [field for field in NOT_NULL_FIELDS if field in update_data and update_data[field] is None]
+    if nulls:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{', '.join(nulls)} can't be null"
+        )
+    
+    task = await _get_member_task(request, db, task_id, current_user, TASK_WRITE_ROLES)
+    old_status, old_hours = task.status, task.actual_hours or 0
+    
+    if "status" in update_data:
+        update_data["status"] = TaskStatusModel(update_data["status"].value)
+    for field, value in update_data.items():
+        setattr(task, field, value)
+    
+    if task.status != old_status:
+        if task.status == TaskStatusModel.DONE:
+            task.completed_at = datetime.now(timezone.utc)
+        elif old_status == TaskStatusModel.DONE:
+            task.completed_at = None
+    
+    await _record_report_changes(db, [TaskChange(
+        project_id=task.project_id,
+        task_id=task.id,
+        old_status=old_status,
+        new_status=task.status,
+        hours_delta=(task.actual_hours or 0) - old_hours
+    )])
+    await db.commit()
+    await db.refresh(task)
+    
+    return task
+
+
+@router.delete("/{task_id}")
+async def delete_task(
+    task_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a task"""
+    task = await _get_member_task(request, db, task_id, current_user, TASK_WRITE_ROLES)
+    
+    await _record_report_changes(db, [
+        TaskChange(project_id=task.project_id, task_id=task.id, old_status=task.status)
+    ])
+    await db.delete(task)
+    await db.commit()
     
-    return db_task
\ No newline at end of file
+    return {"message": "Task deleted successfully"}
@@ -1,12 +1,31 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+import os
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, object_session, sessionmaker
 
 from app.config import settings
 
+# Async drivers for each sync database URL scheme we support
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync DATABASE_URL into its async driver equivalent"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -16,12 +35,108 @@ engine = create_engine(
     max_overflow=20
 )
 
-# Create session factory
+# Create async database engine (same database, non-blocking driver)
+ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+async_pool_options = {} if ASYNC_DATABASE_URL.startswith("sqlite") else {
+    "pool_size": settings.DB_ASYNC_POOL_SIZE,
+    "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW
+}
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    **async_pool_options
+)
+
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+for _engine in (engine, async_engine.sync_engine):
+    if _engine.dialect.name == "sqlite":
+        event.listen(_engine, "connect", _enable_sqlite_foreign_keys)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Callbacks queued by flush-time mapper events, run once the transaction commits
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def after_commit(target, callback: Callable[..., None], *args: Any) -> None:
+    """
+    Run `callback(*args)` once the session that is flushing `target` commits.
+    
+    Cache invalidations hang off mapper events, which fire at flush time;
+    invalidating there lets a concurrent reader re-cache the old rows
+    before the commit lands. Queued callbacks are discarded on rollback.
+    """
+    session = object_session(target)
+    if session is None:
+        callback(*args)
+        return
+    session.info.setdefault(_AFTER_COMMIT, []).append((callback, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback, args in session.info.pop(_AFTER_COMMIT, ()):
+        callback(*args)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session, previous_transaction):
+    # A rolled-back savepoint keeps the outer transaction's callbacks
+    if not previous_transaction.nested:
+        session.info.pop(_AFTER_COMMIT, None)
 
 # Create base class for models
 Base = declarative_base()
 
+
+def utcnow() -> datetime:
+    """
+    Python-side default for timestamp columns.
+    
+    Stored rows then share the format of the datetimes bound in keyset and
+    incremental-sync comparisons; SQLite's CURRENT_TIMESTAMP has no
+    fractional seconds and sorts before them as text.
+    """
+    return datetime.now(timezone.utc)
+
+# Alembic migration scripts (backend/alembic)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+
+def verify_schema_revision() -> None:
+    """
+    Fail fast unless the database is at the latest migration.
+    
+    One query against alembic_version, however many tables there are.
+    """
+    from alembic.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    
+    head = ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}; "
+            "run `alembic upgrade head` from backend/"
+        )
+
 def get_db():
     """
     Dependency to get database session
@@ -30,4 +145,12 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,21 +1,36 @@
 """
 Main FastAPI application
 """
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import engine, Base
-from app.api import auth, projects, tasks, meetings, integrations
+from app.database import engine, async_engine, Base, verify_schema_revision
+from app.api import auth, projects, tasks, meetings, integrations, jobs, search
+from app.services.ai_service import get_engine, get_result_cache
+from app.services.task_stats import task_stats_cache
+from app.utils.auth import principal_cache
+from app.utils.dependencies import role_cache
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.password_pool import password_pool_stats, shutdown_password_pool
 
-# Create database tables on startup
+# Check (or, in local dev, create) the database schema on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    Base.metadata.create_all(bind=engine)
+    if settings.DB_SCHEMA_MODE == "verify":
+        await asyncio.to_thread(verify_schema_revision)
+    elif settings.DB_SCHEMA_MODE == "create_all":
+        Base.metadata.create_all(bind=engine)
+    if settings.AI_PRELOAD_MODEL:
+        await asyncio.to_thread(get_engine().load)
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    await async_engine.dispose()
+    shutdown_password_pool()
+    get_engine().shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -32,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Include routers
@@ -40,6 +56,8 @@ app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
 app.include_router(meetings.router, prefix="/api/meetings", tags=["Meetings"])
 app.include_router(integrations.router, prefix="/api/integrations", tags=["Integrations"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 
 @app.get("/")
 async def root():
@@ -51,4 +69,16 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    """In-process cache and queue counters for this worker"""
+    return {
+        "auth_cache": principal_cache.stats(),
+        "role_cache": role_cache.stats(),
+        "task_stats_cache": task_stats_cache.stats(),
+        "password_pool": password_pool_stats(),
+        "ai_engine": get_engine().stats(),
+        "ai_cache": get_result_cache().stats()
+    }
\ No newline at end of file
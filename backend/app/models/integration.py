@@ -0,0 +1,54 @@
+"""
+Integration model (connected third-party accounts)
+"""
+import enum
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base, utcnow
+
+
+class IntegrationType(enum.Enum):
+    GOOGLE_DRIVE = "google_drive"
+    SLACK = "slack"
+    CANVAS = "canvas"
+
+
+class Integration(Base):
+    __tablename__ = "integrations"
+    __table_args__ = (UniqueConstraint("user_id", "type"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    type = Column(
+        Enum(IntegrationType, name="integration_type", values_callable=lambda e: [m.value for m in e]),
+        nullable=False
+    )
+    
+    # OAuth credentials
+    access_token = Column(Text, nullable=False)
+    refresh_token = Column(Text, nullable=True)
+    token_expiry = Column(DateTime(timezone=True), nullable=True)
+    
+    # Account details
+    account_email = Column(String(255), nullable=True)
+    team_id = Column(String(255), nullable=True)  # Slack workspace
+    canvas_domain = Column(String(255), nullable=True)
+    
+    # Sync state
+    is_active = Column(Boolean, default=True)
+    last_sync = Column(DateTime(timezone=True), nullable=True)
+    sync_status = Column(String(255), nullable=True)
+    metadata_ = Column("metadata", JSON, nullable=True)  # `metadata` is reserved on declarative models
+    
+    # Timestamps
+    connected_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="integrations")
+    
+    def __repr__(self):
+        return f"<Integration(id={self.id}, user_id={self.user_id}, type={self.type})>"
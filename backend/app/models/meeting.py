@@ -1,16 +1,7 @@
 """
-Meeting Module
-TODO: Copy actual implementation from artifacts
-"""
-
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
-"""
 Meeting and WeeklyReport models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -22,7 +13,7 @@ class Meeting(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Meeting details
@@ -55,9 +46,10 @@ class Meeting(Base):
 
 class WeeklyReport(Base):
     __tablename__ = "weekly_reports"
+    __table_args__ = (UniqueConstraint("project_id", "week_number", "year"),)
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     week_number = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
     
@@ -1,9 +1,85 @@
 """
-Project Module
-TODO: Copy actual implementation from artifacts
+Project and ProjectMember models
 """
+import enum
 
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base, utcnow
+
+
+class ProjectStatus(enum.Enum):
+    PLANNING = "planning"
+    IN_PROGRESS = "in_progress"
+    REVIEW = "review"
+    COMPLETED = "completed"
+    ON_HOLD = "on_hold"
+
+
+class MemberRole(enum.Enum):
+    OWNER = "owner"
+    ADMIN = "admin"
+    MEMBER = "member"
+    VIEWER = "viewer"
+
+
+class Project(Base):
+    __tablename__ = "projects"
+    __table_args__ = (
+        Index("idx_projects_created_id", "created_at", "id"),  # keyset pagination
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(
+        Enum(ProjectStatus, name="project_status", values_callable=lambda e: [m.value for m in e]),
+        default=ProjectStatus.PLANNING
+    )
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Integration references
+    google_drive_folder_id = Column(String(255), nullable=True)
+    slack_channel_id = Column(String(255), nullable=True)
+    canvas_course_id = Column(String(255), nullable=True)
+    
+    # Schedule
+    start_date = Column(DateTime(timezone=True), nullable=True)
+    end_date = Column(DateTime(timezone=True), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # Relationships (rows are removed by the database's ON DELETE CASCADE)
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    meetings = relationship("Meeting", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    weekly_reports = relationship(
+        "WeeklyReport", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    
+    def __repr__(self):
+        return f"<Project(id={self.id}, name={self.name})>"
+
+
+class ProjectMember(Base):
+    __tablename__ = "project_members"
+    __table_args__ = (UniqueConstraint("project_id", "user_id"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    role = Column(
+        Enum(MemberRole, name="member_role", values_callable=lambda e: [m.value for m in e]),
+        default=MemberRole.MEMBER
+    )
+    joined_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    
+    # Relationships
+    project = relationship("Project")
+    user = relationship("User")
+    
+    def __repr__(self):
+        return f"<ProjectMember(project_id={self.project_id}, user_id={self.user_id}, role={self.role})>"
@@ -1,9 +1,78 @@
 """
-Task Module
-TODO: Copy actual implementation from artifacts
+Task model
 """
+import enum
 
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, CheckConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base, utcnow
+
+
+class TaskStatus(enum.Enum):
+    TODO = "todo"
+    IN_PROGRESS = "in_progress"
+    REVIEW = "review"
+    DONE = "done"
+    BLOCKED = "blocked"
+    CANCELLED = "cancelled"
+
+
+class TaskPriority(enum.Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
+
+
+class Task(Base):
+    __tablename__ = "tasks"
+    __table_args__ = (
+        CheckConstraint("ai_confidence >= 0 AND ai_confidence <= 100"),
+        # Keyset pagination and the GROUP BY behind task statistics
+        Index("idx_tasks_project_created_id", "project_id", "created_at", "id"),
+        Index("idx_tasks_project_due_id", "project_id", "due_date", "id"),
+        Index("idx_tasks_project_status", "project_id", "status"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(
+        Enum(TaskStatus, name="task_status", values_callable=lambda e: [m.value for m in e]),
+        default=TaskStatus.TODO
+    )
+    priority = Column(
+        Enum(TaskPriority, name="task_priority", values_callable=lambda e: [m.value for m in e]),
+        default=TaskPriority.MEDIUM
+    )
+    
+    # Ownership
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="SET NULL"), nullable=True)
+    
+    # Tracking
+    estimated_hours = Column(Integer, nullable=True)
+    actual_hours = Column(Integer, nullable=True)
+    due_date = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # AI extraction
+    ai_extracted = Column(Text, nullable=True)  # Source text the task was extracted from
+    ai_confidence = Column(Integer, nullable=True)  # 0-100
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # Relationships
+    project = relationship("Project", back_populates="tasks")
+    meeting = relationship("Meeting", back_populates="extracted_tasks")
+    assignee = relationship("User", foreign_keys=[assignee_id])
+    creator = relationship("User", foreign_keys=[creator_id])
+    
+    def __repr__(self):
+        return f"<Task(id={self.id}, title={self.title}, status={self.status})>"
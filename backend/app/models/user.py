@@ -1,9 +1,38 @@
 """
-User Module
-TODO: Copy actual implementation from artifacts
+User model
 """
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
+from app.database import Base, utcnow
+
+
+class User(Base):
+    __tablename__ = "users"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String(255), unique=True, nullable=False)
+    username = Column(String(255), unique=True, nullable=False)
+    full_name = Column(String(255), nullable=True)
+    hashed_password = Column(String(255), nullable=False)
+    
+    # Account flags
+    is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False)
+    
+    # Legacy per-user integration tokens (see Integration for the current storage)
+    google_token = Column(Text, nullable=True)
+    slack_token = Column(Text, nullable=True)
+    canvas_token = Column(Text, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=utcnow)
+    
+    # Relationships
+    meetings = relationship("Meeting", back_populates="creator")
+    integrations = relationship("Integration", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    
+    def __repr__(self):
+        return f"<User(id={self.id}, username={self.username})>"
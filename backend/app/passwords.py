@@ -0,0 +1,20 @@
+"""
+bcrypt password hashing.
+
+Kept free of app imports: the password process pool unpickles these
+functions in each worker, and anything imported here is imported by
+every worker process too.
+"""
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password"""
+    return pwd_context.hash(password)
@@ -0,0 +1,21 @@
+"""
+Background job schemas for request/response validation
+"""
+from pydantic import BaseModel
+from typing import Optional, Any
+from enum import Enum
+
+
+class JobState(str, Enum):
+    PENDING = "pending"
+    STARTED = "started"
+    RETRY = "retry"
+    SUCCESS = "success"
+    FAILURE = "failure"
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: JobState
+    result: Optional[Any] = None
+    error: Optional[str] = None
@@ -22,6 +22,10 @@ class MemberRole(str, Enum):
     VIEWER = "viewer"
 
 
+class ProjectOrder(str, Enum):
+    CREATED_AT = "created_at"
+
+
 class ProjectBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
@@ -0,0 +1,28 @@
+"""
+Search schemas for request/response validation
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+from enum import Enum
+
+
+class SearchType(str, Enum):
+    MEETING = "meeting"
+    TASK = "task"
+
+
+class SearchHit(BaseModel):
+    type: SearchType
+    id: int
+    project_id: int
+    title: str
+    rank: float
+    highlight: Optional[str] = Field(None, description="HTML-escaped excerpt with matches wrapped in <b></b>")
+
+
+class SemanticHit(BaseModel):
+    meeting_id: int
+    project_id: int
+    title: str
+    score: float = Field(..., description="Cosine similarity of the best matching passage")
+    passage: str
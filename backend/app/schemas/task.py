@@ -2,8 +2,8 @@
 Task schemas for request/response validation
 """
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -23,6 +23,11 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
 
 
+class TaskOrder(str, Enum):
+    CREATED_AT = "created_at"
+    DUE_DATE = "due_date"
+
+
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
@@ -40,6 +45,16 @@ class TaskCreate(TaskBase):
     ai_confidence: Optional[int] = Field(None, ge=0, le=100)
 
 
+class ExtractedTask(BaseModel):
+    """An action item as AI task extraction returns it (decoding is constrained to this schema)"""
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    priority: TaskPriority = TaskPriority.MEDIUM
+    assignee: Optional[str] = None
+    due_date: Optional[date] = None
+    ai_confidence: Optional[int] = Field(None, ge=0, le=100)
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
@@ -73,7 +88,26 @@ class Task(TaskBase):
 
 
 class TaskBulkCreate(BaseModel):
-    tasks: List[TaskCreate]
+    # Items are validated against TaskCreate one by one, so a bad item
+    # is reported back instead of rejecting the whole batch
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    detail: Any
+
+
+class TaskBulkDuplicate(BaseModel):
+    # An extracted item merged into a task instead of being created
+    index: int
+    task_id: int
+
+
+class TaskBulkResult(BaseModel):
+    created: List[Task] = []
+    errors: List[TaskBulkError] = []
+    duplicates: List[TaskBulkDuplicate] = []
 
 
 class TaskStats(BaseModel):
@@ -84,4 +118,8 @@ class TaskStats(BaseModel):
     done: int = 0
     blocked: int = 0
     cancelled: int = 0
-    completion_rate: float = 0.0
\ No newline at end of file
+    completion_rate: float = 0.0
+
+
+class ProjectTaskStats(TaskStats):
+    project_id: int
\ No newline at end of file
@@ -1,13 +1,47 @@
-"""Services Package - External integrations and business logic"""
-from .ai_service import AIService
-from .oauth_service import OAuthService
-from .google_oauth_service import GoogleOAuthService
-from .slack_oauth_service import SlackOAuthService
-from .canvas_oauth_service import CanvasOAuthService
-from .google_drive_service import GoogleDriveService
-from .slack_service import SlackService
-from .canvas_service import CanvasService
-from .report_generator import ReportGenerator
+"""Services Package - External integrations and business logic
+
+Services are imported lazily on first attribute access, so processes that
+only serve auth and CRUD never import torch, transformers or the Google,
+Slack and Canvas SDKs.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_SERVICES = {
+    "AIService": ".ai_service",
+    "OAuthService": ".oauth_service",
+    "GoogleOAuthService": ".google_oauth_service",
+    "SlackOAuthService": ".slack_oauth_service",
+    "CanvasOAuthService": ".canvas_oauth_service",
+    "GoogleDriveService": ".google_drive_service",
+    "SlackService": ".slack_service",
+    "CanvasService": ".canvas_service",
+    "ReportGenerator": ".report_generator"
+}
+
+if TYPE_CHECKING:
+    from .ai_service import AIService
+    from .oauth_service import OAuthService
+    from .google_oauth_service import GoogleOAuthService
+    from .slack_oauth_service import SlackOAuthService
+    from .canvas_oauth_service import CanvasOAuthService
+    from .google_drive_service import GoogleDriveService
+    from .slack_service import SlackService
+    from .canvas_service import CanvasService
+    from .report_generator import ReportGenerator
+
+
+def __getattr__(name):
+    if name not in _SERVICES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_SERVICES[name], __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SERVICES))
+
 
 __all__ = [
     "AIService", "OAuthService", "GoogleOAuthService", "SlackOAuthService",
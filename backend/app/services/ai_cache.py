@@ -0,0 +1,123 @@
+"""
+Content-addressed cache for AI results.
+
+Results are keyed by a hash of the normalized meeting notes, the model
+name, the prompt template version and the generation parameters, so an
+identical re-submission is answered without running the model. Entries
+live in an in-memory LRU backed by JSON files on disk, one directory per
+template version; bumping PROMPT_TEMPLATE_VERSION makes old entries
+unreachable and purge_stale_templates() removes them.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_notes(notes: str) -> str:
+    """Collapse whitespace differences that don't change the notes' content"""
+    return re.sub(r"\s+", " ", notes).strip()
+
+
+class AIResultCache:
+    """Two-tier (memory LRU + disk) cache of AI results"""
+    
+    def __init__(
+        self,
+        template_version: str,
+        directory: Optional[str] = None,
+        max_memory_items: Optional[int] = None
+    ):
+        self.directory = directory or settings.AI_CACHE_DIR
+        self.template_version = template_version
+        self.memory = TTLCache(maxsize=max_memory_items or settings.AI_CACHE_MEMORY_ITEMS)
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self._lock = threading.Lock()
+    
+    def make_key(self, kind: str, notes: str, model_name: str, params: Dict[str, Any]) -> str:
+        """Hash everything that determines the model's output"""
+        material = json.dumps({
+            "kind": kind,
+            "notes": normalize_notes(notes),
+            "model": model_name,
+            "template": self.template_version,
+            "params": params
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, self.template_version, key[:2], f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached result from memory or disk, or None"""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        
+        try:
+            with open(self._path(key)) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.disk_misses += 1
+            return None
+        
+        with self._lock:
+            self.disk_hits += 1
+        self.memory.set(key, value)
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a result in both tiers"""
+        self.memory.set(key, value)
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("Could not write AI cache entry %s", path, exc_info=True)
+    
+    def invalidate(self, template_version: Optional[str] = None) -> None:
+        """Drop every entry for a template version (default: the current one)"""
+        version = template_version or self.template_version
+        if version == self.template_version:
+            self.memory.clear()
+        shutil.rmtree(os.path.join(self.directory, version), ignore_errors=True)
+    
+    def purge_stale_templates(self) -> None:
+        """Remove on-disk entries written under older template versions"""
+        try:
+            versions = os.listdir(self.directory)
+        except OSError:
+            return
+        for version in versions:
+            if version != self.template_version:
+                self.invalidate(version)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates per tier for metrics"""
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.disk_hits
+        lookups = hits + self.disk_misses
+        return {
+            "memory": memory,
+            "disk_hits": self.disk_hits,
+            "misses": self.disk_misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
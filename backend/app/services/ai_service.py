@@ -1,9 +1,831 @@
 """
-Ai Service Module
-TODO: Copy actual implementation from artifacts
+AI service for meeting summarization and task extraction.
+
+The model is owned by a process-wide InferenceEngine that loads it once
+and serves every caller from a single background thread. Prompts that
+arrive within AI_BATCH_MAX_WAIT_MS of each other are padded into one
+generate() call, which on CPU is far cheaper than running them one by
+one. torch and transformers are optional dependencies and are only
+imported when the model is first loaded.
+
+On CPU-only deployments AI_INFERENCE_BACKEND=int8 swaps every Linear
+layer for a dynamically quantized one after loading, and AI_NUM_THREADS
+caps the threads each worker process gives torch.
+
+Every prompt starts with one of a few rendered system prompts. Those
+prefixes are registered with the engine, which computes their KV cache
+once and starts each batch from a copy of it, so prefill only runs over
+the meeting notes. Requests are batched with others sharing their prefix.
+
+Task extraction decodes under a grammar compiled from ExtractedTask's JSON
+schema (AI_CONSTRAINED_DECODING), so its reply always parses and a
+malformed one never wastes the pass.
 """
+import asyncio
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.schemas.task import ExtractedTask
+from app.services.ai_cache import AIResultCache
+from app.services.structured_output import Grammar, GrammarLogitsProcessor, TokenVocabulary
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a prompt below changes; cached results key on it
+PROMPT_TEMPLATE_VERSION = "2"
+
+INFERENCE_BACKENDS = ("fp32", "int8")
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are an assistant for student project teams. Summarize the meeting "
+    "notes you are given. Reply in exactly this format:\n"
+    "Summary:\n<one short paragraph>\n"
+    "Key decisions:\n- <decision>\n"
+    "Action items:\n- <owner>: <action item>\n"
+    "Write 'None' under a heading that has no entries."
+)
+
+REDUCE_SYSTEM_PROMPT = (
+    "You are an assistant for student project teams. You are given "
+    "summaries of consecutive parts of one long meeting. Combine them into "
+    "a single summary of the whole meeting, merging duplicate decisions and "
+    "action items. Reply in exactly this format:\n"
+    "Summary:\n<one short paragraph>\n"
+    "Key decisions:\n- <decision>\n"
+    "Action items:\n- <owner>: <action item>\n"
+    "Write 'None' under a heading that has no entries."
+)
+
+TASK_EXTRACTION_SYSTEM_PROMPT = (
+    "You are an assistant for student project teams. Extract the action "
+    "items from the meeting notes you are given as a JSON array. Each "
+    "element has the keys: title, description, priority (low, medium, high "
+    "or urgent), assignee (a name or null), due_date (YYYY-MM-DD or null) "
+    "and ai_confidence (0-100). Reply with the JSON array only."
+)
+
+# The extraction prompt's reply, key for key in the order it lists them
+TASK_GRAMMAR = Grammar.for_type(List[ExtractedTask])
+
+# Templates whose rendered prefix is registered with the engine
+PROMPT_TEMPLATES = {
+    "summary": SUMMARY_SYSTEM_PROMPT,
+    "reduce": REDUCE_SYSTEM_PROMPT,
+    "tasks": TASK_EXTRACTION_SYSTEM_PROMPT
+}
+
+
+@dataclass
+class GenerationRequest:
+    """A prompt waiting for the engine, resolved through its future"""
+    prompt: str
+    max_new_tokens: int
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Set for streaming requests, which always run as a batch of one
+    streamer: Any = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    # Registered prefix the prompt starts with, if any
+    prefix: Optional[Tuple[str, str]] = None
+    # Constrains the reply to a JSON schema
+    grammar: Optional[Grammar] = None
+
+
+@dataclass
+class PromptPrefix:
+    """A registered prompt prefix and, once computed, its KV cache"""
+    text: str
+    input_ids: Any = None  # (1, prefix length)
+    past_key_values: Any = None  # per layer (key, value), batch size 1
+    usable: bool = True
+
+
+class _CancelCriteria:
+    """Stopping criterion that ends generation once the caller has gone away"""
+    
+    def __init__(self, cancel_event: threading.Event):
+        self.cancel_event = cancel_event
+    
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.cancel_event.is_set()
+
+
+def prepare_model(model: Any, backend: str) -> Any:
+    """Convert a freshly loaded fp32 model for a CPU inference backend"""
+    if backend == "fp32":
+        return model
+    if backend == "int8":
+        import torch
+        
+        # int8 weights, activations quantized per batch at run time;
+        # in place so the fp32 weights can be freed as layers are swapped
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    raise ValueError(f"Unknown inference backend {backend!r}; expected one of {INFERENCE_BACKENDS}")
+
+
+class InferenceEngine:
+    """
+    Loads the causal LM once and batches generation requests.
+    
+    A model and tokenizer can be passed in directly (e.g. a tiny randomly
+    initialized model for offline tests); otherwise AI_MODEL_NAME is
+    loaded from the local Hugging Face cache on first use.
+    """
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        model: Any = None,
+        tokenizer: Any = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+        temperature: Optional[float] = None,
+        backend: Optional[str] = None
+    ):
+        self.model_name = model_name or settings.AI_MODEL_NAME
+        self.backend = backend or settings.AI_INFERENCE_BACKEND
+        if self.backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend {self.backend!r}; expected one of {INFERENCE_BACKENDS}")
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size or settings.AI_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.AI_BATCH_MAX_WAIT_MS) / 1000
+        self.temperature = settings.AI_TEMPERATURE if temperature is None else temperature
+        
+        self._queue: "queue.Queue[Optional[GenerationRequest]]" = queue.Queue()
+        self._deferred: Deque[GenerationRequest] = deque()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # (template name, template version) -> prefix; the engine serves one model
+        self._prefixes: Dict[Tuple[str, str], PromptPrefix] = {}
+        self._vocabulary: Optional[TokenVocabulary] = None  # built for the first constrained batch
+        
+        # Metrics
+        self.batches = 0
+        self.prefix_hits = 0
+        self.prefix_tokens_reused = 0
+        self.constrained_requests = 0
+        self.requests_served = 0
+        self.tokens_generated = 0
+        self.generation_seconds = 0.0
+    
+    @property
+    def loaded(self) -> bool:
+        return self._worker is not None
+    
+    def load(self) -> "InferenceEngine":
+        """Load the model (if not injected) and start the batching thread"""
+        with self._lock:
+            if self._worker is not None:
+                return self
+            
+            import torch
+            
+            if settings.AI_NUM_THREADS > 0:
+                torch.set_num_threads(settings.AI_NUM_THREADS)
+            
+            if self.model is None or self.tokenizer is None:
+                from transformers import AutoModelForCausalLM, AutoTokenizer
+                
+                revision = settings.AI_MODEL_REVISION
+                logger.info("Loading %s@%s (%s)", self.model_name, revision, self.backend)
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, revision=revision)
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model_name,
+                    revision=revision,
+                    torch_dtype=torch.float32,
+                    low_cpu_mem_usage=True
+                )
+            self.model = prepare_model(self.model, self.backend)
+            
+            # Decoder-only models must be left-padded for batched generation
+            self.tokenizer.padding_side = "left"
+            if self.tokenizer.pad_token is None:
+                self.tokenizer.pad_token = self.tokenizer.eos_token
+            self.model.eval()
+            
+            self._worker = threading.Thread(
+                target=self._worker_loop, name="inference-engine", daemon=True
+            )
+            self._worker.start()
+        return self
+    
+    def register_prefix(self, name: str, version: str, text: str) -> None:
+        """
+        Declare a prompt prefix shared by many requests.
+        
+        Its KV cache is computed by the batching thread the first time a
+        batch needs it. Registering a new version (or new text) of a
+        template replaces the old entry.
+        """
+        if not settings.AI_PREFIX_CACHE_ENABLED or not text:
+            return
+        with self._lock:
+            current = self._prefixes.get((name, version))
+            if current is not None and current.text == text:
+                return
+            for key in [key for key in self._prefixes if key[0] == name]:
+                del self._prefixes[key]
+            self._prefixes[(name, version)] = PromptPrefix(text)
+    
+    def _match_prefix(self, prompt: str) -> Optional[Tuple[str, str]]:
+        """The longest registered prefix of `prompt`, if any"""
+        best, best_length = None, 0
+        for key, prefix in list(self._prefixes.items()):
+            length = len(prefix.text)
+            # Whitespace after the prefix would tokenize differently on its own
+            if (length > best_length and prefix.usable and prompt.startswith(prefix.text)
+                    and len(prompt) > length and not prompt[length].isspace()):
+                best, best_length = key, length
+        return best
+    
+    def _prefix_cache(self, key: Optional[Tuple[str, str]]) -> Optional[PromptPrefix]:
+        """A prefix with its KV cache, computing it on first use (batching thread only)"""
+        import torch
+        
+        prefix = self._prefixes.get(key) if key is not None else None
+        if prefix is None or not prefix.usable:
+            return None
+        if prefix.past_key_values is None:
+            input_ids = self.tokenizer(prefix.text, return_tensors="pt")["input_ids"]
+            probe = self.tokenizer(prefix.text + "Notes", return_tensors="pt")["input_ids"]
+            if not torch.equal(probe[:, :input_ids.shape[1]], input_ids):
+                logger.warning("Prompt prefix %s doesn't end on a token boundary; not caching it", key)
+                prefix.usable = False
+                return None
+            with torch.inference_mode():
+                past = self.model(input_ids=input_ids, use_cache=True).past_key_values
+            if hasattr(past, "to_legacy_cache"):
+                past = past.to_legacy_cache()
+            prefix.input_ids = input_ids
+            prefix.past_key_values = tuple(past)
+        return prefix
+    
+    def _prefixed_inputs(self, prefix: PromptPrefix, batch: List[GenerationRequest]) -> Dict[str, Any]:
+        """
+        generate() inputs for a batch sharing `prefix`, starting from its cache.
+        
+        Each suffix is left-padded on its own, so padding sits between the
+        prefix and the suffix. Position ids are derived from the attention
+        mask, which keeps them contiguous with the cached prefix.
+        """
+        import torch
+        from transformers import DynamicCache
+        
+        n = len(batch)
+        suffixes = self.tokenizer(
+            [r.prompt[len(prefix.text):] for r in batch],
+            return_tensors="pt", padding=True, add_special_tokens=False
+        )
+        prefix_ids = prefix.input_ids.expand(n, -1)
+        # generate() extends the cache it is given, so every batch gets its own copy
+        past = DynamicCache.from_legacy_cache(tuple(
+            (key.repeat(n, 1, 1, 1), value.repeat(n, 1, 1, 1)) for key, value in prefix.past_key_values
+        ))
+        return {
+            "input_ids": torch.cat([prefix_ids, suffixes["input_ids"]], dim=1),
+            "attention_mask": torch.cat([torch.ones_like(prefix_ids), suffixes["attention_mask"]], dim=1),
+            "past_key_values": past
+        }
+    
+    def _token_vocabulary(self, size: int) -> TokenVocabulary:
+        """Token texts for constrained decoding (batching thread only)"""
+        if self._vocabulary is None or self._vocabulary.size != size:
+            eos = self.model.generation_config.eos_token_id
+            eos = set(eos if isinstance(eos, (list, tuple)) else [eos]) | {self.tokenizer.eos_token_id}
+            self._vocabulary = TokenVocabulary(self.tokenizer, size, [i for i in eos if i is not None])
+        return self._vocabulary
+    
+    def submit(
+        self,
+        prompt: str,
+        max_new_tokens: Optional[int] = None,
+        grammar: Optional[Grammar] = None
+    ) -> Future:
+        """Queue a prompt; the returned future resolves to the generated text"""
+        self.load()
+        request = GenerationRequest(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens or settings.AI_MAX_TOKENS,
+            prefix=self._match_prefix(prompt),
+            grammar=grammar
+        )
+        self._queue.put(request)
+        return request.future
+    
+    async def generate(
+        self,
+        prompt: str,
+        max_new_tokens: Optional[int] = None,
+        grammar: Optional[Grammar] = None
+    ) -> str:
+        """Generate a completion without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(prompt, max_new_tokens, grammar))
+    
+    async def stream(self, prompt: str, max_new_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Yield decoded text as the model produces it.
+        
+        If the consumer stops early (e.g. the client disconnected), the
+        generation is cancelled at the next token instead of running on.
+        """
+        from transformers import TextIteratorStreamer
+        
+        self.load()
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        request = GenerationRequest(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens or settings.AI_MAX_TOKENS,
+            streamer=streamer,
+            prefix=self._match_prefix(prompt)
+        )
+        self._queue.put(request)
+        
+        chunks = iter(streamer)
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    yield chunk
+            # Surface generation errors instead of ending the stream silently
+            await asyncio.wrap_future(request.future)
+        finally:
+            request.cancel_event.set()
+            request.future.cancel()
+    
+    def shutdown(self) -> None:
+        """Stop the batching thread after the requests already queued"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+    
+    def _next_batch(self) -> Optional[List[GenerationRequest]]:
+        """Block for one request, then gather more until the batch or window is full"""
+        first = self._deferred.popleft() if self._deferred else self._queue.get()
+        if first is None:
+            return None
+        if first.streamer is not None:
+            return [first]
+        
+        batch = [first]
+        # Requests set aside for having another prefix may fit this batch
+        for request in list(self._deferred):
+            if len(batch) >= self.max_batch_size:
+                break
+            if request.streamer is None and request.prefix == first.prefix:
+                self._deferred.remove(request)
+                batch.append(request)
+        
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            if request.streamer is not None:
+                # Streams run on their own; pick it up next round
+                self._deferred.append(request)
+                break
+            if request.prefix != first.prefix:
+                # A batch starts from one prefix cache; this one waits for its own
+                self._deferred.append(request)
+                continue
+            batch.append(request)
+        return batch
+    
+    def _worker_loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Drop requests whose callers have already gone away
+            live = []
+            for request in batch:
+                if request.future.set_running_or_notify_cancel():
+                    live.append(request)
+                elif request.streamer is not None:
+                    # A thread may still be blocked reading the stream
+                    request.streamer.end()
+            if live:
+                self._run_batch(live)
+    
+    def _run_batch(self, batch: List[GenerationRequest]) -> None:
+        import torch
+        from transformers import LogitsProcessorList, StoppingCriteriaList
+        
+        streaming = {}
+        if batch[0].streamer is not None:
+            streaming = {
+                "streamer": batch[0].streamer,
+                "stopping_criteria": StoppingCriteriaList([_CancelCriteria(batch[0].cancel_event)])
+            }
+        grammars = [r.grammar for r in batch]
+        
+        try:
+            start = time.perf_counter()
+            constraints = {}
+            if any(grammars):
+                # Rows without a grammar pass through untouched
+                vocabulary = self._token_vocabulary(self.model.config.vocab_size)
+                constraints["logits_processor"] = LogitsProcessorList([GrammarLogitsProcessor(vocabulary, grammars)])
+            prefix = self._prefix_cache(batch[0].prefix)
+            if prefix is not None:
+                inputs = self._prefixed_inputs(prefix, batch)
+                self.prefix_hits += len(batch)
+                self.prefix_tokens_reused += len(batch) * prefix.input_ids.shape[1]
+            else:
+                encoded = self.tokenizer([r.prompt for r in batch], return_tensors="pt", padding=True)
+                inputs = {"input_ids": encoded["input_ids"], "attention_mask": encoded["attention_mask"]}
+            sampling = {"do_sample": True, "temperature": self.temperature} if self.temperature > 0 else {"do_sample": False}
+            with torch.inference_mode():
+                output = self.model.generate(
+                    **inputs,
+                    max_new_tokens=max(r.max_new_tokens for r in batch),
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    **sampling,
+                    **streaming,
+                    **constraints
+                )
+            elapsed = time.perf_counter() - start
+            
+            new_tokens = output[:, inputs["input_ids"].shape[1]:]
+            generated = 0
+            texts = []
+            for request, tokens in zip(batch, new_tokens):
+                tokens = tokens[:request.max_new_tokens]
+                generated += int((tokens != self.tokenizer.pad_token_id).sum())
+                texts.append(self.tokenizer.decode(tokens, skip_special_tokens=True).strip())
+            
+            # Count the batch before any caller sees its result
+            self.batches += 1
+            self.requests_served += len(batch)
+            self.constrained_requests += sum(grammar is not None for grammar in grammars)
+            self.tokens_generated += generated
+            self.generation_seconds += elapsed
+            for request, text in zip(batch, texts):
+                request.future.set_result(text)
+        except Exception as e:
+            logger.exception("Generation batch of %d failed", len(batch))
+            for request in batch:
+                if request.streamer is not None:
+                    # Unblock the consumer waiting on the stream
+                    request.streamer.end()
+                if not request.future.done():
+                    request.future.set_exception(e)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters for metrics"""
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self.loaded,
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "requests_served": self.requests_served,
+            "avg_batch_size": round(self.requests_served / self.batches, 2) if self.batches else 0.0,
+            "tokens_generated": self.tokens_generated,
+            "prefix_cache": {
+                "prefixes": len(self._prefixes),
+                "hits": self.prefix_hits,
+                "tokens_reused": self.prefix_tokens_reused
+            },
+            "constrained_requests": self.constrained_requests,
+            "tokens_per_second": round(self.tokens_generated / self.generation_seconds, 2) if self.generation_seconds else 0.0
+        }
+
+
+_engine: Optional[InferenceEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> InferenceEngine:
+    """The process-wide engine (the model itself loads on first request)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = InferenceEngine()
+        return _engine
+
+
+_result_cache: Optional[AIResultCache] = None
+
+
+def get_result_cache() -> AIResultCache:
+    """The process-wide AI result cache for the current prompt templates"""
+    global _result_cache
+    with _engine_lock:
+        if _result_cache is None:
+            _result_cache = AIResultCache(template_version=PROMPT_TEMPLATE_VERSION)
+            _result_cache.purge_stale_templates()
+        return _result_cache
+
+
+def _parse_sections(text: str) -> Dict[str, List[str]]:
+    """Split 'Heading:' sections of a summary reply into their lines"""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        heading = re.match(r"^(summary|key decisions|action items)\s*:\s*(.*)$", line, re.IGNORECASE)
+        if heading:
+            current = heading.group(1).lower()
+            sections[current] = [heading.group(2)] if heading.group(2) else []
+        elif current and line:
+            sections[current].append(line)
+    return sections
+
+
+def _bullets(lines: List[str]) -> List[str]:
+    items = [re.sub(r"^[-*\d.)\s]+", "", line).strip() for line in lines]
+    return [item for item in items if item and item.lower() != "none"]
+
 
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
+class AIService:
+    """Meeting summarization and task extraction on top of the shared engine"""
+    
+    def __init__(
+        self,
+        engine: Optional[InferenceEngine] = None,
+        cache: Optional[AIResultCache] = None
+    ):
+        self.engine = engine or get_engine()
+        if cache is None and settings.AI_CACHE_ENABLED:
+            cache = get_result_cache()
+        self.cache = cache
+    
+    def build_prompt(self, system_prompt: str, content: str) -> str:
+        """Render a system + user exchange with the model's chat template"""
+        self.engine.load()
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content}
+        ]
+        return self.engine.tokenizer.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True
+        )
+    
+    def register_prompt_prefixes(self) -> None:
+        """Register each template's prompt up to the content with the engine"""
+        marker = "\x00content\x00"
+        for name, system_prompt in PROMPT_TEMPLATES.items():
+            prompt = self.build_prompt(system_prompt, marker)
+            if marker in prompt:
+                self.engine.register_prefix(name, PROMPT_TEMPLATE_VERSION, prompt[:prompt.index(marker)])
+    
+    @staticmethod
+    def parse_summary(text: str) -> Dict[str, Any]:
+        """Turn a summary reply into ai_summary, key_decisions and action_items"""
+        sections = _parse_sections(text)
+        if "summary" not in sections:
+            # Model ignored the format; keep the whole reply as the summary
+            return {"ai_summary": text.strip(), "key_decisions": [], "action_items": []}
+        
+        action_items = []
+        for item in _bullets(sections.get("action items", [])):
+            owner, sep, action = item.partition(":")
+            if sep and action.strip():
+                action_items.append({"owner": owner.strip(), "description": action.strip()})
+            else:
+                action_items.append({"owner": None, "description": item})
+        
+        return {
+            "ai_summary": " ".join(sections["summary"]).strip(),
+            "key_decisions": _bullets(sections.get("key decisions", [])),
+            "action_items": action_items
+        }
+    
+    @staticmethod
+    def parse_tasks(text: str) -> List[Dict[str, Any]]:
+        """
+        Pull the JSON array of extracted tasks out of a reply.
+        
+        A constrained reply cut off by the token limit is still a prefix of
+        valid JSON; the objects completed before the cut are kept.
+        """
+        start, end = text.find("["), text.rfind("]")
+        if start == -1:
+            return []
+        tasks = None
+        if end > start:
+            try:
+                tasks = json.loads(text[start:end + 1])
+            except json.JSONDecodeError:
+                pass
+        if tasks is None:
+            end = len(text)
+            while tasks is None and end > start:
+                end = text.rfind("}", start, end)
+                try:
+                    tasks = json.loads(text[start:end + 1] + "]")
+                except json.JSONDecodeError:
+                    pass
+        if not isinstance(tasks, list):
+            return []
+        return [task for task in tasks if isinstance(task, dict) and task.get("title")]
+    
+    async def _ensure_loaded(self) -> None:
+        # Loading takes seconds; keep it off the event loop
+        if not self.engine.loaded:
+            await asyncio.to_thread(self.engine.load)
+        if settings.AI_PREFIX_CACHE_ENABLED:
+            self.register_prompt_prefixes()
+    
+    def count_tokens(self, text: str) -> int:
+        return len(self.engine.tokenizer(text, add_special_tokens=False)["input_ids"])
+    
+    def chunk_notes(
+        self,
+        notes: str,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None
+    ) -> List[str]:
+        """
+        Split notes into windows of at most max_tokens tokens.
+        
+        Consecutive windows share overlap_tokens tokens so that a point
+        made across a boundary is seen whole by at least one chunk, and a
+        window ends at a line break in its second half when there is one.
+        """
+        max_tokens = max_tokens or settings.AI_CHUNK_TOKENS
+        overlap = min(overlap_tokens if overlap_tokens is not None else settings.AI_CHUNK_OVERLAP_TOKENS, max_tokens // 2)
+        offsets = self.engine.tokenizer(
+            notes, add_special_tokens=False, return_offsets_mapping=True
+        )["offset_mapping"]
+        
+        chunks = []
+        start, total = 0, len(offsets)
+        while start < total:
+            end = min(start + max_tokens, total)
+            if end < total:
+                for k in range(end - 1, start + max_tokens // 2, -1):
+                    if "\n" in notes[offsets[k][0]:offsets[k][1]]:
+                        end = k + 1
+                        break
+            chunk = notes[offsets[start][0]:offsets[end - 1][1]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= total:
+                break
+            start = max(end - overlap, start + 1)
+        return chunks
+    
+    def _pack(self, parts: List[str], max_tokens: int) -> List[str]:
+        """Join consecutive parts into groups that fit the budget (at least two per group)"""
+        groups, current, size = [], [], 0
+        for part in parts:
+            tokens = self.count_tokens(part)
+            if len(current) >= 2 and size + tokens > max_tokens:
+                groups.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += tokens
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+    
+    async def _summary_prompt(self, notes: str) -> str:
+        """
+        The prompt whose reply is the final summary.
+        
+        Short notes are summarized directly. Long notes are chunked, the
+        chunks summarized in parallel (the engine batches them), and the
+        partial summaries reduced pairwise-or-more until they fit in one
+        reduce prompt.
+        """
+        if self.count_tokens(notes) <= settings.AI_CHUNK_TOKENS:
+            return self.build_prompt(SUMMARY_SYSTEM_PROMPT, notes)
+        
+        partials = await asyncio.gather(*[
+            self.engine.generate(
+                self.build_prompt(SUMMARY_SYSTEM_PROMPT, chunk), settings.AI_CHUNK_SUMMARY_TOKENS
+            )
+            for chunk in self.chunk_notes(notes)
+        ])
+        partials = [f"Part {i + 1}:\n{partial}" for i, partial in enumerate(partials)]
+        
+        groups = self._pack(partials, settings.AI_CHUNK_TOKENS)
+        while len(groups) > 1:
+            partials = await asyncio.gather(*[
+                self.engine.generate(
+                    self.build_prompt(REDUCE_SYSTEM_PROMPT, group), settings.AI_CHUNK_SUMMARY_TOKENS
+                )
+                for group in groups
+            ])
+            partials = [f"Part {i + 1}:\n{partial}" for i, partial in enumerate(partials)]
+            groups = self._pack(partials, settings.AI_CHUNK_TOKENS)
+        return self.build_prompt(REDUCE_SYSTEM_PROMPT, groups[0])
+    
+    def _cache_key(self, kind: str, notes: str) -> str:
+        params = {
+            "temperature": self.engine.temperature,
+            "max_new_tokens": settings.AI_MAX_TOKENS,
+            # Different weights or quantization give different outputs
+            "revision": settings.AI_MODEL_REVISION,
+            "backend": self.engine.backend,
+            # Long notes are summarized chunk by chunk
+            "chunking": [
+                settings.AI_CHUNK_TOKENS,
+                settings.AI_CHUNK_OVERLAP_TOKENS,
+                settings.AI_CHUNK_SUMMARY_TOKENS
+            ]
+        }
+        if kind == "tasks":
+            # Replies are parsed into ExtractedTask (and, when constrained,
+            # decoded against its schema), so a schema change is a new key
+            params["schema"] = TASK_GRAMMAR.fingerprint
+            params["constrained"] = settings.AI_CONSTRAINED_DECODING
+        return self.cache.make_key(kind, notes, self.engine.model_name, params)
+    
+    async def _cached(self, kind: str, notes: str, compute):
+        """Return a cached result for these notes, or compute and store it"""
+        if self.cache is None:
+            return await compute()
+        
+        key = self._cache_key(kind, notes)
+        result = self.cache.get(key)
+        if result is None:
+            result = await compute()
+            self.cache.set(key, result)
+        return result
+    
+    async def summarize_meeting(self, notes: str) -> Dict[str, Any]:
+        """Summarize meeting notes into the Meeting AI fields"""
+        async def compute():
+            await self._ensure_loaded()
+            prompt = await self._summary_prompt(notes)
+            return self.parse_summary(await self.engine.generate(prompt))
+        
+        return await self._cached("summary", notes, compute)
+    
+    def cached_summary(self, notes: str) -> Optional[Dict[str, Any]]:
+        """A previously computed summary for these notes, if any"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self._cache_key("summary", notes))
+    
+    async def stream_summary(self, notes: str) -> AsyncIterator[str]:
+        """
+        Yield the summary reply as it is generated.
+        
+        The parsed result is cached once the stream completes; a stream
+        abandoned part-way caches nothing.
+        """
+        await self._ensure_loaded()
+        # For long notes only the final reduce pass is streamed
+        prompt = await self._summary_prompt(notes)
+        text = []
+        async for chunk in self.engine.stream(prompt):
+            text.append(chunk)
+            yield chunk
+        
+        if self.cache is not None:
+            self.cache.set(self._cache_key("summary", notes), self.parse_summary("".join(text)))
+    
+    async def extract_tasks(self, notes: str) -> List[Dict[str, Any]]:
+        """Extract action items from meeting notes as task dicts"""
+        async def compute():
+            await self._ensure_loaded()
+            chunks = [notes]
+            if self.count_tokens(notes) > settings.AI_CHUNK_TOKENS:
+                chunks = self.chunk_notes(notes)
+            grammar = TASK_GRAMMAR if settings.AI_CONSTRAINED_DECODING else None
+            replies = await asyncio.gather(*[
+                self.engine.generate(self.build_prompt(TASK_EXTRACTION_SYSTEM_PROMPT, chunk), grammar=grammar)
+                for chunk in chunks
+            ])
+            
+            # Overlapping chunks can yield the same item twice
+            tasks, seen = [], set()
+            for reply in replies:
+                for task in self.parse_tasks(reply):
+                    title = " ".join(str(task["title"]).lower().split())
+                    if title not in seen:
+                        seen.add(title)
+                        tasks.append(task)
+            return tasks
+        
+        return await self._cached("tasks", notes, compute)
@@ -0,0 +1,405 @@
+"""
+Semantic search over meeting notes.
+
+A small sentence encoder (AI_EMBEDDING_MODEL_NAME) runs on CPU and is
+only ever loaded from the local Hugging Face cache. Meetings are split
+into overlapping passages that are embedded in batches. Each project's
+passages are stored as an int8 matrix with one float32 scale per row,
+about a quarter of the float32 size. A query scores every row with a
+blocked matrix-vector product. Once a project has more than
+AI_EMBEDDING_IVF_THRESHOLD passages, only the rows in the nearest lists
+of a k-means (IVF) index are scored.
+
+Indexes live in this process. Before a query, the project's meeting
+version (row count and latest update, as used for ETags) is compared
+with the index's. Only meetings added, changed or removed since then are
+re-embedded. Meeting writes through the API update a loaded index
+straight away. The API imports this module lazily, and torch and
+transformers are only imported when the encoder loads.
+"""
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.meeting import Meeting
+from app.schemas.search import SemanticHit
+from app.utils.cache import TTLCache
+from app.utils.etag import version_columns
+
+logger = logging.getLogger(__name__)
+
+# Rows dequantized per step when scoring, bounding the float32 scratch space
+SCORE_BLOCK_ROWS = 65536
+
+
+class SentenceEncoder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from a local encoder.
+    
+    A model and tokenizer can be passed in directly (e.g. a tiny randomly
+    initialized model for offline tests).
+    """
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        model: Any = None,
+        tokenizer: Any = None,
+        batch_size: Optional[int] = None
+    ):
+        self.model_name = model_name or settings.AI_EMBEDDING_MODEL_NAME
+        self.model = model
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size or settings.AI_EMBEDDING_BATCH_SIZE
+        self.texts_encoded = 0
+        self._lock = threading.Lock()
+    
+    def load(self) -> "SentenceEncoder":
+        with self._lock:
+            if self.model is None or self.tokenizer is None:
+                from transformers import AutoModel, AutoTokenizer
+                
+                logger.info("Loading %s", self.model_name)
+                # Never reach out to the Hub from a request
+                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, local_files_only=True)
+                self.model = AutoModel.from_pretrained(self.model_name, local_files_only=True)
+                self.model.eval()
+        return self
+    
+    @property
+    def dim(self) -> int:
+        return self.load().model.config.hidden_size
+    
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as rows of a float32 matrix with unit norm"""
+        import torch
+        
+        self.load()
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        # Similar lengths batch together, so little of each batch is padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        with self._lock, torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                rows = order[start:start + self.batch_size]
+                batch = self.tokenizer(
+                    [texts[i] for i in rows],
+                    padding=True,
+                    truncation=True,
+                    max_length=settings.AI_EMBEDDING_MAX_TOKENS,
+                    return_tensors="pt"
+                )
+                hidden = self.model(**batch).last_hidden_state
+                mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                vectors[rows] = torch.nn.functional.normalize(pooled, dim=-1).numpy()
+            self.texts_encoded += len(texts)
+        return vectors
+
+
+def split_passages(text: Optional[str], words: Optional[int] = None) -> List[str]:
+    """Overlapping windows of `words` words (a quarter overlap between neighbours)"""
+    words = words or settings.AI_EMBEDDING_PASSAGE_WORDS
+    tokens = (text or "").split()
+    if not tokens:
+        return []
+    step = max(words - words // 4, 1)
+    # Stop once a window would only repeat the previous one's overlap
+    return [" ".join(tokens[start:start + words]) for start in range(0, max(len(tokens) - words // 4, 1), step)]
+
+
+def meeting_passages(title: str, ai_summary: Optional[str], raw_notes: Optional[str]) -> List[str]:
+    """What gets embedded for a meeting; the title alone if it has no text yet"""
+    return split_passages(ai_summary) + split_passages(raw_notes) or [title]
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization: vectors ~= codes * scales[:, None]"""
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class IVFIndex:
+    """Spherical k-means centroids and the rows assigned to each of them"""
+    
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = centroids
+        self.lists: List[List[int]] = [[] for _ in range(len(centroids))]
+    
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            filled = np.bincount(assignment, minlength=nlist) > 0
+            centroids[filled] = sums[filled] / np.linalg.norm(sums[filled], axis=1, keepdims=True)
+        
+        index = cls(centroids)
+        index.add(np.arange(len(vectors)), vectors)
+        return index
+    
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        for row, nearest in zip(rows.tolist(), np.argmax(vectors @ self.centroids.T, axis=1).tolist()):
+            self.lists[nearest].append(row)
+    
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows in the `nprobe` lists whose centroids are closest to the query"""
+        nearest = np.argsort(self.centroids @ query)[::-1][:nprobe]
+        return np.fromiter((row for i in nearest for row in self.lists[i]), dtype=np.int64)
+
+
+@dataclass
+class _IndexedMeeting:
+    marker: Any  # coalesce(updated_at, created_at) when embedded
+    title: str
+
+
+class ProjectIndex:
+    """One project's passage embeddings, quantized to int8"""
+    
+    def __init__(self, project_id: int, dim: int):
+        self.project_id = project_id
+        self.version: Optional[tuple] = None
+        self.meetings: Dict[int, _IndexedMeeting] = {}
+        self.codes = np.zeros((0, dim), dtype=np.int8)
+        self.scales = np.zeros(0, dtype=np.float32)
+        self.owners = np.zeros(0, dtype=np.int64)  # meeting id per row, -1 once removed
+        self.passages: List[str] = []
+        self.count = 0
+        self.removed = 0
+        self.ivf: Optional[IVFIndex] = None
+        self._ivf_rows = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def live_rows(self) -> int:
+        return self.count - self.removed
+    
+    def _grow(self, rows: int) -> None:
+        capacity = max(2 * len(self.codes), self.count + rows, 64)
+        codes = np.zeros((capacity, self.codes.shape[1]), dtype=np.int8)
+        codes[:self.count] = self.codes[:self.count]
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[:self.count] = self.scales[:self.count]
+        owners = np.full(capacity, -1, dtype=np.int64)
+        owners[:self.count] = self.owners[:self.count]
+        self.codes, self.scales, self.owners = codes, scales, owners
+    
+    def _remove(self, meeting_id: int) -> None:
+        if self.meetings.pop(meeting_id, None) is None:
+            return
+        rows = np.flatnonzero(self.owners[:self.count] == meeting_id)
+        self.owners[rows] = -1
+        for row in rows.tolist():
+            self.passages[row] = ""
+        self.removed += len(rows)
+        if self.removed > self.count // 2:
+            self._compact()
+    
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.owners[:self.count] >= 0)
+        self.codes = self.codes[keep]
+        self.scales = self.scales[keep]
+        self.owners = self.owners[keep]
+        self.passages = [self.passages[row] for row in keep.tolist()]
+        self.count, self.removed = len(keep), 0
+        self.ivf = None  # row numbers changed; retrained on the next search
+    
+    def _dequantized(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        if rows is None:
+            return self.codes[:self.count].astype(np.float32) * self.scales[:self.count, None]
+        return self.codes[rows].astype(np.float32) * self.scales[rows, None]
+    
+    def replace(self, meetings: Dict[int, Tuple[_IndexedMeeting, List[str], np.ndarray]], gone: Sequence[int] = ()) -> None:
+        """Drop `gone` meetings and (re-)index the given ones"""
+        with self._lock:
+            for meeting_id in list(gone) + list(meetings):
+                self._remove(meeting_id)
+            
+            for meeting_id, (indexed, passages, vectors) in meetings.items():
+                rows = len(passages)
+                if self.count + rows > len(self.codes):
+                    self._grow(rows)
+                codes, scales = quantize(vectors)
+                self.codes[self.count:self.count + rows] = codes
+                self.scales[self.count:self.count + rows] = scales
+                self.owners[self.count:self.count + rows] = meeting_id
+                self.passages.extend(passages)
+                if self.ivf is not None:
+                    self.ivf.add(np.arange(self.count, self.count + rows), vectors)
+                self.count += rows
+                self.meetings[meeting_id] = indexed
+    
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score, or None for all of them"""
+        if self.live_rows <= settings.AI_EMBEDDING_IVF_THRESHOLD:
+            self.ivf = None
+            return None
+        if self.ivf is None or self.count > 2 * self._ivf_rows:
+            # Retrain as the project doubles, so lists stay balanced
+            nlist = max(int(np.sqrt(self.live_rows)), 1)
+            self.ivf = IVFIndex.train(self._dequantized(), nlist)
+            self._ivf_rows = self.count
+        rows = self.ivf.candidates(query, settings.AI_EMBEDDING_IVF_NPROBE)
+        return rows[self.owners[rows] >= 0]
+    
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float, str]]:
+        """Best (meeting_id, score, passage) per meeting, top `k` meetings"""
+        with self._lock:
+            rows = self._candidate_rows(query)
+            if rows is None:
+                n = self.count
+                scores = np.empty(n, dtype=np.float32)
+                for start in range(0, n, SCORE_BLOCK_ROWS):
+                    end = min(start + SCORE_BLOCK_ROWS, n)
+                    scores[start:end] = self.codes[start:end].astype(np.float32) @ query
+                scores *= self.scales[:n]
+                scores[self.owners[:n] < 0] = -np.inf
+                rows = np.arange(n)
+            else:
+                scores = (self.codes[rows].astype(np.float32) @ query) * self.scales[rows]
+            
+            # Several passages can come from one meeting; widen the cut until
+            # it holds k distinct meetings (or every row)
+            best: Dict[int, Tuple[int, float, str]] = {}
+            cut = min(len(rows), 4 * k)
+            while True:
+                top = np.argpartition(-scores, cut - 1)[:cut] if cut < len(rows) else np.arange(len(rows))
+                best = {}
+                for i in top[np.argsort(-scores[top])].tolist():
+                    if scores[i] == -np.inf:
+                        break
+                    meeting_id = int(self.owners[rows[i]])
+                    if meeting_id not in best:
+                        best[meeting_id] = (meeting_id, float(scores[i]), self.passages[rows[i]])
+                if len(best) >= k or cut >= len(rows):
+                    break
+                cut = min(2 * cut, len(rows))
+            return list(best.values())[:k]
+
+
+class SemanticIndex:
+    """Per-project embedding indexes for this process, least recently used evicted"""
+    
+    def __init__(self, encoder: Optional[SentenceEncoder] = None):
+        self.encoder = encoder or SentenceEncoder()
+        self.projects = TTLCache(maxsize=settings.AI_EMBEDDING_MAX_PROJECTS)
+    
+    def _embed(self, meetings: Dict[int, Tuple[_IndexedMeeting, List[str]]]) -> Dict[int, Tuple[_IndexedMeeting, List[str], np.ndarray]]:
+        """Embed every meeting's passages in one batched pass"""
+        texts = [passage for _, passages in meetings.values() for passage in passages]
+        vectors = self.encoder.encode(texts) if texts else None
+        embedded, start = {}, 0
+        for meeting_id, (indexed, passages) in meetings.items():
+            embedded[meeting_id] = (indexed, passages, vectors[start:start + len(passages)])
+            start += len(passages)
+        return embedded
+    
+    async def _current(self, db: AsyncSession, project_id: int) -> ProjectIndex:
+        """The project's index, brought up to date with its meetings"""
+        in_project = Meeting.project_id == project_id
+        version = tuple((await db.execute(select(*version_columns(Meeting)).where(in_project))).one())
+        index = self.projects.get(project_id)
+        if index is not None and index.version == version:
+            return index
+        if index is None:
+            index = ProjectIndex(project_id, await asyncio.to_thread(lambda: self.encoder.dim))
+            self.projects.set(project_id, index)
+        
+        marker = func.coalesce(Meeting.updated_at, Meeting.created_at)
+        current = {
+            meeting_id: _IndexedMeeting(marker=value, title=title)
+            for meeting_id, title, value in await db.execute(select(Meeting.id, Meeting.title, marker).where(in_project))
+        }
+        stale = [
+            meeting_id for meeting_id, indexed in current.items()
+            if meeting_id not in index.meetings or index.meetings[meeting_id].marker != indexed.marker
+        ]
+        gone = [meeting_id for meeting_id in index.meetings if meeting_id not in current]
+        
+        changed = {}
+        if stale:
+            rows = await db.execute(
+                select(Meeting.id, Meeting.title, Meeting.ai_summary, Meeting.raw_notes).where(Meeting.id.in_(stale))
+            )
+            changed = {
+                meeting_id: (current[meeting_id], meeting_passages(title, ai_summary, raw_notes))
+                for meeting_id, title, ai_summary, raw_notes in rows
+            }
+        if changed or gone:
+            index.replace(await asyncio.to_thread(self._embed, changed), gone)
+        index.version = version
+        return index
+    
+    def update_meeting(self, meeting: Meeting) -> None:
+        """Re-embed a meeting just written by this process, if its project is loaded"""
+        index = self.projects.get(meeting.project_id)
+        if index is None:
+            return
+        indexed = _IndexedMeeting(marker=meeting.updated_at or meeting.created_at, title=meeting.title)
+        passages = meeting_passages(meeting.title, meeting.ai_summary, meeting.raw_notes)
+        index.replace(self._embed({meeting.id: (indexed, passages)}))
+    
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        project_ids: Sequence[int],
+        limit: int = 10
+    ) -> List[SemanticHit]:
+        """Meetings whose notes are closest in meaning to `query`"""
+        if not project_ids:
+            return []
+        indexes = [await self._current(db, project_id) for project_id in project_ids]
+        vector = (await asyncio.to_thread(self.encoder.encode, [query]))[0]
+        
+        hits = []
+        for index in indexes:
+            for meeting_id, score, passage in await asyncio.to_thread(index.search, vector, limit):
+                hits.append(SemanticHit(
+                    meeting_id=meeting_id,
+                    project_id=index.project_id,
+                    title=index.meetings[meeting_id].title,
+                    score=round(score, 4),
+                    passage=passage
+                ))
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:limit]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.encoder.model_name,
+            "texts_encoded": self.encoder.texts_encoded,
+            "projects": self.projects.stats()
+        }
+
+
+_semantic_index: Optional[SemanticIndex] = None
+_semantic_index_lock = threading.Lock()
+
+
+def get_semantic_index() -> SemanticIndex:
+    """The process-wide semantic index (the encoder loads on first use)"""
+    global _semantic_index
+    with _semantic_index_lock:
+        if _semantic_index is None:
+            _semantic_index = SemanticIndex()
+        return _semantic_index
+
+
+def forget_project(project_id: int) -> None:
+    """Drop a deleted project's index, if this process built one"""
+    if _semantic_index is not None:
+        _semantic_index.projects.pop(project_id)
@@ -1,9 +1,250 @@
 """
-Report Generator Module
-TODO: Copy actual implementation from artifacts
+Weekly report generation.
+
+Reports are maintained incrementally: every task status change or hours
+update is applied to the current week's WeeklyReport row as it happens,
+so reading or finalizing a week never scans the tasks table. A new week's
+report starts from the previous week's open tasks; only a project's very
+first report is built from a scan of its tasks.
 """
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.meeting import WeeklyReport
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+
+# Which report list a task in each status belongs to
+STATUS_LISTS = {
+    TaskStatus.DONE.value: "tasks_completed",
+    TaskStatus.IN_PROGRESS.value: "tasks_in_progress",
+    TaskStatus.TODO.value: "tasks_planned"
+}
+
+
+@dataclass
+class TaskChange:
+    """
+    One task event to fold into a weekly report.
+    
+    old_status is None for a new task and new_status is None for a
+    deleted one.
+    """
+    project_id: int
+    task_id: int
+    old_status: Any = None
+    new_status: Any = None
+    hours_delta: int = 0
+
+
+def week_bounds(when: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """Monday 00:00 UTC of the week containing `when`, and the following Monday"""
+    when = when or datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    start = (when - timedelta(days=when.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return start, start + timedelta(days=7)
+
+
+def _status_value(status) -> Optional[str]:
+    # Accepts model enums, schema enums or plain strings
+    return getattr(status, "value", status)
+
+
+def _completion_rate(report: WeeklyReport) -> int:
+    completed = len(report.tasks_completed or [])
+    total = completed + len(report.tasks_in_progress or []) + len(report.tasks_planned or [])
+    return round(100 * completed / total) if total else 0
+
 
-# Placeholder implementation
-def placeholder():
-    """This is a placeholder file - replace with actual implementation"""
-    pass
+class ReportGenerator:
+    """Keeps WeeklyReport rows up to date as a project's tasks change"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _scan(self, project_ids: Iterable[int], week_start: datetime, week_end: datetime) -> Dict[int, Dict[str, list]]:
+        """Build report lists from the tasks table (first report of a project only)"""
+        lists = {
+            project_id: {"tasks_completed": [], "tasks_in_progress": [], "tasks_planned": [], "hours": 0}
+            for project_id in project_ids
+        }
+        rows = self.db.execute(
+            select(Task.project_id, Task.id, Task.status, Task.completed_at, Task.actual_hours).where(
+                Task.project_id.in_(list(lists))
+            )
+        ).all()
+        
+        for project_id, task_id, task_status, completed_at, actual_hours in rows:
+            name = STATUS_LISTS.get(_status_value(task_status))
+            if name == "tasks_completed":
+                if completed_at is None:
+                    continue
+                if completed_at.tzinfo is None:
+                    completed_at = completed_at.replace(tzinfo=timezone.utc)
+                if not week_start <= completed_at < week_end:
+                    continue
+                lists[project_id]["hours"] += actual_hours or 0
+            if name:
+                lists[project_id][name].append(task_id)
+        return lists
+    
+    def _new_report(
+        self,
+        project_id: int,
+        week_start: datetime,
+        week_end: datetime,
+        previous: Optional[WeeklyReport],
+        scanned: Optional[Dict[str, list]] = None
+    ) -> WeeklyReport:
+        """A report for a new week, carrying open tasks over from the previous one"""
+        year, week_number, _ = week_start.isocalendar()
+        report = WeeklyReport(
+            project_id=project_id,
+            year=year,
+            week_number=week_number,
+            week_start=week_start,
+            week_end=week_end,
+            tasks_completed=[],
+            hours_logged=0
+        )
+        if previous is not None:
+            report.tasks_in_progress = list(previous.tasks_in_progress or [])
+            report.tasks_planned = list(previous.tasks_planned or [])
+        else:
+            lists = scanned or self._scan([project_id], week_start, week_end)[project_id]
+            report.tasks_completed = lists["tasks_completed"]
+            report.tasks_in_progress = lists["tasks_in_progress"]
+            report.tasks_planned = lists["tasks_planned"]
+            report.hours_logged = lists["hours"]
+        report.completion_rate = _completion_rate(report)
+        return report
+    
+    def _latest_before(self, project_id: int, week_start: datetime) -> Optional[WeeklyReport]:
+        return self.db.scalar(
+            select(WeeklyReport).where(
+                WeeklyReport.project_id == project_id,
+                WeeklyReport.week_start < week_start
+            ).order_by(WeeklyReport.week_start.desc()).limit(1)
+        )
+    
+    def current_report(self, project_id: int, when: Optional[datetime] = None) -> WeeklyReport:
+        """The (locked) report for the week containing `when`, created if needed"""
+        week_start, week_end = week_bounds(when)
+        year, week_number, _ = week_start.isocalendar()
+        query = select(WeeklyReport).where(
+            WeeklyReport.project_id == project_id,
+            WeeklyReport.year == year,
+            WeeklyReport.week_number == week_number
+        ).with_for_update()
+        
+        report = self.db.scalar(query)
+        if report is not None:
+            return report
+        
+        report = self._new_report(project_id, week_start, week_end, self._latest_before(project_id, week_start))
+        try:
+            with self.db.begin_nested():
+                self.db.add(report)
+        except IntegrityError:
+            # Another request created this week's report first
+            report = self.db.scalar(query)
+        return report
+    
+    def record_task_changes(self, changes: Iterable[TaskChange], when: Optional[datetime] = None) -> None:
+        """
+        Apply task changes to the current week's reports.
+        
+        Flushes but does not commit, so the report updates are part of the
+        caller's transaction.
+        """
+        reports: Dict[int, WeeklyReport] = {}
+        for change in changes:
+            old_list = STATUS_LISTS.get(_status_value(change.old_status))
+            new_list = STATUS_LISTS.get(_status_value(change.new_status))
+            if old_list == new_list and not change.hours_delta:
+                continue
+            
+            report = reports.get(change.project_id)
+            if report is None:
+                report = reports[change.project_id] = self.current_report(change.project_id, when)
+            if old_list != new_list:
+                # Reassign rather than mutate so the JSON columns are marked dirty
+                if old_list:
+                    setattr(report, old_list, [i for i in getattr(report, old_list) or [] if i != change.task_id])
+                if new_list and change.task_id not in (getattr(report, new_list) or []):
+                    setattr(report, new_list, (getattr(report, new_list) or []) + [change.task_id])
+            report.hours_logged = max((report.hours_logged or 0) + change.hours_delta, 0)
+        
+        for report in reports.values():
+            report.completion_rate = _completion_rate(report)
+        self.db.flush()
+    
+    def generate_weekly_report(self, project_id: int, when: Optional[datetime] = None) -> WeeklyReport:
+        """Return an up-to-date report for one project's week"""
+        report = self.current_report(project_id, when)
+        report.completion_rate = _completion_rate(report)
+        report.generated_at = datetime.now(timezone.utc)
+        self.db.commit()
+        self.db.refresh(report)
+        return report
+    
+    def finalize_week(self, when: Optional[datetime] = None) -> int:
+        """
+        Finalize every project's report for the week containing `when`.
+        
+        Projects with no changes that week get a report carried over from
+        their previous one. Returns the number of reports finalized.
+        """
+        week_start, week_end = week_bounds(when)
+        year, week_number, _ = week_start.isocalendar()
+        now = datetime.now(timezone.utc)
+        
+        reports: List[WeeklyReport] = list(self.db.scalars(select(WeeklyReport).where(
+            WeeklyReport.year == year,
+            WeeklyReport.week_number == week_number
+        )))
+        have_report = {report.project_id for report in reports}
+        missing = [
+            project_id for project_id in self.db.scalars(select(Project.id))
+            if project_id not in have_report
+        ]
+        
+        if missing:
+            # Each missing project's most recent earlier report, in one query
+            latest = select(
+                WeeklyReport.project_id,
+                func.max(WeeklyReport.week_start).label("week_start")
+            ).where(
+                WeeklyReport.project_id.in_(missing),
+                WeeklyReport.week_start < week_start
+            ).group_by(WeeklyReport.project_id).subquery()
+            previous = {
+                report.project_id: report for report in self.db.scalars(
+                    select(WeeklyReport).join(latest, and_(
+                        WeeklyReport.project_id == latest.c.project_id,
+                        WeeklyReport.week_start == latest.c.week_start
+                    ))
+                )
+            }
+            
+            scanned = self._scan([p for p in missing if p not in previous], week_start, week_end)
+            for project_id in missing:
+                report = self._new_report(
+                    project_id, week_start, week_end, previous.get(project_id), scanned.get(project_id)
+                )
+                self.db.add(report)
+                reports.append(report)
+        
+        for report in reports:
+            report.completion_rate = _completion_rate(report)
+            report.generated_at = now
+        self.db.commit()
+        return len(reports)
@@ -0,0 +1,326 @@
+"""
+Full-text search over meetings and tasks.
+
+On PostgreSQL both tables carry a generated `search_vector` tsvector
+column with a GIN index (Alembic revision 0002). Queries are parsed with
+websearch_to_tsquery and ranked with ts_rank_cd, and ts_headline (which
+re-parses the document text) only runs on the page being returned.
+
+Highlights are HTML: document text is escaped and only the <b></b> around
+matches is markup.
+
+Other databases (SQLite test runs) get an in-process inverted index
+instead. It is built from the tables on the first search and kept current
+by mapper events, applied once the writing transaction commits, so it
+only sees writes made by this process.
+"""
+import heapq
+import html
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import DDL, cast, event, func, literal_column, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import after_commit
+from app.models.meeting import Meeting
+from app.models.task import Task
+from app.schemas.search import SearchHit, SearchType
+
+# Text search configuration baked into the generated columns
+SEARCH_CONFIG = "english"
+# ts_headline marks matches with control characters, which become <b></b>
+# once the rest of the excerpt has been escaped
+_START_SEL, _STOP_SEL = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={_START_SEL}, StopSel={_STOP_SEL}, MaxWords=35, MinWords=15, MaxFragments=2"
+
+# Weighted fields per document type: (column, tsvector weight)
+SEARCH_FIELDS = {
+    SearchType.MEETING: (Meeting, (("title", "A"), ("ai_summary", "B"), ("raw_notes", "C"))),
+    SearchType.TASK: (Task, (("title", "A"), ("description", "B")))
+}
+
+
+def _headline_html(headline: Optional[str]) -> Optional[str]:
+    if headline is None:
+        return None
+    return html.escape(headline).replace(_START_SEL, "<b>").replace(_STOP_SEL, "</b>")
+
+
+def _vector_sql(fields: Sequence[Tuple[str, str]]) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in fields
+    )
+
+
+# Databases created with DB_SCHEMA_MODE=create_all get the same columns and
+# indexes as the migration
+for _model, _fields in SEARCH_FIELDS.values():
+    _table = _model.__tablename__
+    event.listen(_model.__table__, "after_create", DDL(
+        f"ALTER TABLE {_table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_vector_sql(_fields)}) STORED"
+    ).execute_if(dialect="postgresql"))
+    event.listen(_model.__table__, "after_create", DDL(
+        f"CREATE INDEX idx_{_table}_search ON {_table} USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"))
+
+
+async def _search_postgres(
+    db: AsyncSession,
+    query: str,
+    project_ids: Sequence[int],
+    types: Iterable[SearchType],
+    limit: int
+) -> List[SearchHit]:
+    tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query)
+    hits = []
+    for search_type in types:
+        model, fields = SEARCH_FIELDS[search_type]
+        vector = literal_column(f"{model.__tablename__}.search_vector")
+        rank = func.ts_rank_cd(vector, tsquery)
+        # Rank and cut the page first, then build headlines for that page only
+        page = select(model.id, rank.label("rank")).where(
+            vector.op("@@")(tsquery),
+            model.project_id.in_(project_ids)
+        ).order_by(rank.desc(), model.id.desc()).limit(limit).subquery()
+        document = func.concat_ws(" ", *(getattr(model, column) for column, _ in fields))
+        rows = await db.execute(
+            select(
+                model.id, model.project_id, model.title, page.c.rank,
+                func.ts_headline(cast(SEARCH_CONFIG, REGCONFIG), document, tsquery, HEADLINE_OPTIONS)
+            ).join(page, page.c.id == model.id)
+        )
+        hits.extend(
+            SearchHit(
+                type=search_type, id=id_, project_id=project_id, title=title, rank=rank,
+                highlight=_headline_html(headline)
+            )
+            for id_, project_id, title, rank, headline in rows
+        )
+    return heapq.nlargest(limit, hits, key=lambda hit: (hit.rank, hit.id))
+
+
+# Fallback index ---------------------------------------------------------------
+
+_WORD = re.compile(r"\w+")
+_QUERY_TOKEN = re.compile(r'-?"[^"]*"|\S+')
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its no not "
+    "of on or so such that the their then there these they this to was were will with".split()
+)
+# ts_rank's default weights for A, B and C
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2}
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping, close enough to the english stemmer for tests
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased, stemmed terms of a text, without stop words"""
+    return [_stem(word) for word in _WORD.findall((text or "").lower()) if word not in STOP_WORDS]
+
+
+def parse_query(query: str) -> Tuple[List[str], List[str]]:
+    """
+    Split a web-search style query into required and excluded terms.
+    
+    Every term is required; "-term" excludes documents containing it and
+    quoted phrases are treated as their individual terms.
+    """
+    required, excluded = [], []
+    for token in _QUERY_TOKEN.findall(query):
+        terms = tokenize(token.lstrip("-").strip('"'))
+        (excluded if token.startswith("-") else required).extend(terms)
+    return list(dict.fromkeys(required)), excluded
+
+
+def highlight(text: str, terms: Set[str], max_words: int = 35) -> str:
+    """An HTML-escaped window of `text` around the first match, with matches wrapped in <b>"""
+    words = text.split()
+    matched = [i for i, word in enumerate(words) if terms.intersection(tokenize(word))]
+    start = max(matched[0] - max_words // 3, 0) if matched else 0
+    marked = set(matched)
+    return " ".join(
+        f"<b>{html.escape(word)}</b>" if i in marked else html.escape(word)
+        for i, word in enumerate(words[start:start + max_words], start)
+    )
+
+
+@dataclass
+class _Document:
+    project_id: int
+    title: str
+    text: str
+    terms: Tuple[str, ...]
+
+
+class SearchIndex:
+    """In-process inverted index for databases without full-text search"""
+    
+    def __init__(self):
+        self.built = False
+        self._docs: Dict[Tuple[SearchType, int], _Document] = {}
+        self._postings: Dict[str, Dict[Tuple[SearchType, int], float]] = defaultdict(dict)
+        self._lock = threading.RLock()
+    
+    def add(self, obj) -> None:
+        """Index (or re-index) a Meeting or Task"""
+        self._store(*self._document(obj))
+    
+    @staticmethod
+    def _document(obj) -> Tuple[Tuple[SearchType, int], _Document, Dict[str, float]]:
+        """A Meeting or Task's index key, document and term weights"""
+        search_type = SearchType.MEETING if isinstance(obj, Meeting) else SearchType.TASK
+        _, fields = SEARCH_FIELDS[search_type]
+        weights: Dict[str, float] = defaultdict(float)
+        for column, weight in fields:
+            for term in tokenize(getattr(obj, column)):
+                weights[term] += WEIGHTS[weight]
+        document = _Document(
+            project_id=obj.project_id,
+            title=obj.title,
+            text=" ".join(filter(None, (getattr(obj, column) for column, _ in fields))),
+            terms=tuple(weights)
+        )
+        return (search_type, obj.id), document, weights
+    
+    def _store(self, key: Tuple[SearchType, int], document: _Document, weights: Dict[str, float]) -> None:
+        with self._lock:
+            self.remove(*key)
+            self._docs[key] = document
+            for term, weight in weights.items():
+                self._postings[term][key] = weight
+    
+    def remove(self, search_type: SearchType, doc_id: int) -> None:
+        key = (search_type, doc_id)
+        with self._lock:
+            doc = self._docs.pop(key, None)
+            if doc is None:
+                return
+            for term in doc.terms:
+                docs = self._postings[term]
+                docs.pop(key, None)
+                if not docs:
+                    del self._postings[term]
+    
+    def build(self, db: Session) -> None:
+        """Index every meeting and task"""
+        with self._lock:
+            if self.built:
+                return
+            for model, _ in SEARCH_FIELDS.values():
+                for obj in db.scalars(select(model)):
+                    self.add(obj)
+            self.built = True
+    
+    def remove_project(self, project_id: int) -> None:
+        """Drop every document of a project (e.g. after it is deleted)"""
+        with self._lock:
+            for search_type, doc_id in [key for key, doc in self._docs.items() if doc.project_id == project_id]:
+                self.remove(search_type, doc_id)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self.built = False
+    
+    def search(
+        self,
+        query: str,
+        project_ids: Sequence[int],
+        types: Iterable[SearchType],
+        limit: int
+    ) -> List[SearchHit]:
+        required, excluded = parse_query(query)
+        if not required:
+            return []
+        
+        types = set(types)
+        project_ids = set(project_ids)
+        with self._lock:
+            postings = sorted((self._postings.get(term, {}) for term in required), key=len)
+            excluded_keys = set().union(*(self._postings.get(term, {}) for term in excluded))
+            scored = []
+            # Walk the rarest term's postings and probe the others
+            for key in postings[0]:
+                doc = self._docs[key]
+                if (key[0] not in types or doc.project_id not in project_ids or key in excluded_keys
+                        or not all(key in docs for docs in postings[1:])):
+                    continue
+                rank = sum(docs[key] for docs in postings) / (1 + math.log1p(len(doc.terms)))
+                scored.append((rank, key[1], key, doc))
+            top = heapq.nlargest(limit, scored, key=lambda item: item[:2])
+        
+        terms = set(required)
+        return [
+            SearchHit(
+                type=key[0], id=key[1], project_id=doc.project_id, title=doc.title,
+                rank=round(rank, 6), highlight=highlight(doc.text, terms)
+            )
+            for rank, _, key, doc in top
+        ]
+
+
+search_index = SearchIndex()
+
+
+def index_documents(objs: Iterable) -> None:
+    """Index meetings or tasks written without mapper events (bulk inserts)"""
+    if search_index.built:
+        for obj in objs:
+            search_index.add(obj)
+
+
+def _if_built(method, *args) -> None:
+    if search_index.built:
+        method(*args)
+
+
+@event.listens_for(Meeting, "after_insert")
+@event.listens_for(Meeting, "after_update")
+@event.listens_for(Task, "after_insert")
+@event.listens_for(Task, "after_update")
+def _document_saved(mapper, connection, target):
+    # Snapshot the row at flush time; it may be expired by the time the
+    # transaction commits, and a rollback discards the update
+    after_commit(target, _if_built, search_index._store, *search_index._document(target))
+
+
+@event.listens_for(Meeting, "after_delete")
+@event.listens_for(Task, "after_delete")
+def _document_deleted(mapper, connection, target):
+    search_type = SearchType.MEETING if isinstance(target, Meeting) else SearchType.TASK
+    after_commit(target, _if_built, search_index.remove, search_type, target.id)
+
+
+async def search_documents(
+    db: AsyncSession,
+    query: str,
+    project_ids: Sequence[int],
+    types: Iterable[SearchType] = tuple(SearchType),
+    limit: int = 20
+) -> List[SearchHit]:
+    """Best matches for `query` among the given projects' meetings and tasks"""
+    if not project_ids:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        return await _search_postgres(db, query, project_ids, types, limit)
+    
+    if not search_index.built:
+        await db.run_sync(search_index.build)
+    return search_index.search(query, project_ids, types, limit)
@@ -0,0 +1,403 @@
+"""
+JSON-schema constrained decoding.
+
+A Pydantic model's JSON schema is compiled into a small grammar of
+literals, strings, integers, choices and sequences. During generation a
+logits processor tracks, for each sequence in the batch, where in the
+grammar its output so far can be, and masks every token whose text can't
+continue from there. The reply is therefore JSON of the schema's shape in
+one pass, written with json.dumps' default separators and every property
+present, in schema order.
+
+Allowed-token sets are cached per grammar position. Inside a free-text
+string nearly the whole vocabulary is allowed; those tokens are admitted
+by a length check and only tokens containing a quote or backslash are run
+through the grammar. torch is imported only by the decoding side.
+"""
+import hashlib
+import json
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from pydantic import TypeAdapter
+
+from app.utils.cache import TTLCache
+
+# Stack of (grammar node, position within it) frames, innermost last
+Stack = Tuple[Tuple[Any, Any], ...]
+States = FrozenSet[Stack]
+
+_OPEN, _CLOSED = -1, -2
+_ESCAPES = frozenset('"\\/bfnrt')
+DATE_TEMPLATE = "9999-99-99"  # '9' is any digit
+MAX_INTEGER_DIGITS = 18
+
+
+class Literal:
+    """Text that must appear exactly"""
+    
+    def __init__(self, text: str):
+        self.text = text
+    
+    def start(self) -> int:
+        return 0
+    
+    def step(self, pos: int, ch: str) -> Optional[int]:
+        return pos + 1 if pos < len(self.text) and self.text[pos] == ch else None
+    
+    def can_end(self, pos: int) -> bool:
+        return pos == len(self.text)
+
+
+class String:
+    """
+    A JSON string, optionally shaped by a template.
+    
+    Free text is tracked as (characters so far, after a backslash); the
+    count stops at min_length when there's no max_length, which keeps the
+    number of distinct positions finite.
+    """
+    
+    def __init__(self, min_length: int = 0, max_length: Optional[int] = None, template: Optional[str] = None):
+        self.min_length = min_length
+        self.max_length = max_length
+        self.template = template
+    
+    def start(self) -> Any:
+        return _OPEN
+    
+    def step(self, local: Any, ch: str) -> Any:
+        if local == _OPEN:
+            if ch != '"':
+                return None
+            return "" if self.template is not None else (0, False)
+        if local == _CLOSED:
+            return None
+        
+        if self.template is not None:
+            if ch == '"':
+                return _CLOSED if len(local) == len(self.template) else None
+            if len(local) == len(self.template):
+                return None
+            expected = self.template[len(local)]
+            return local + ch if (ch.isdigit() if expected == "9" else ch == expected) else None
+        
+        count, escaped = local
+        if escaped:
+            return (self._count(count + 1), False) if ch in _ESCAPES else None
+        if ch == '"':
+            return _CLOSED if count >= self.min_length else None
+        if ch < " " or (self.max_length is not None and count >= self.max_length):
+            return None
+        if ch == "\\":
+            return (count, True)
+        return (self._count(count + 1), False)
+    
+    def can_end(self, local: Any) -> bool:
+        return local == _CLOSED
+    
+    def _count(self, count: int) -> int:
+        return count if self.max_length is not None else min(count, self.min_length)
+    
+    def room(self, local: Any) -> Optional[Tuple[int, Optional[int]]]:
+        """(characters so far, characters left) while inside free text, else None"""
+        if self.template is not None or not isinstance(local, tuple) or local[1]:
+            return None
+        count = local[0]
+        return count, None if self.max_length is None else self.max_length - count
+
+
+class Integer:
+    """A JSON integer within optional bounds, without leading zeros"""
+    
+    def __init__(self, minimum: Optional[int] = None, maximum: Optional[int] = None):
+        self.minimum = minimum
+        self.maximum = maximum
+    
+    def start(self) -> str:
+        return ""
+    
+    def step(self, text: str, ch: str) -> Optional[str]:
+        if ch == "-":
+            return "-" if not text and (self.minimum is None or self.minimum < 0) else None
+        if not ch.isdigit() or text in ("0", "-0") or len(text.lstrip("-")) >= MAX_INTEGER_DIGITS:
+            return None
+        text += ch
+        return text if self._reachable(text) else None
+    
+    def can_end(self, text: str) -> bool:
+        return text not in ("", "-") and self._in_range(int(text), int(text))
+    
+    def _in_range(self, low: int, high: int) -> bool:
+        return (self.minimum is None or high >= self.minimum) and (self.maximum is None or low <= self.maximum)
+    
+    def _reachable(self, text: str) -> bool:
+        """Whether `text`, possibly with more digits appended, can land in range"""
+        value = int(text)
+        if value == 0:
+            return self._in_range(0, 0)
+        for extra in range(MAX_INTEGER_DIGITS - len(text.lstrip("-")) + 1):
+            scale = 10 ** extra
+            low, high = (value * scale, value * scale + scale - 1) if value > 0 else (value * scale - scale + 1, value * scale)
+            if self._in_range(low, high):
+                return True
+        return False
+
+
+class Choice:
+    """Exactly one of several alternatives"""
+    
+    def __init__(self, options: Sequence[Any] = ()):
+        self.options = list(options)
+
+
+class Concat:
+    """Items one after another"""
+    
+    def __init__(self, items: Sequence[Any] = ()):
+        self.items = list(items)
+
+
+def _enter(node: Any, rest: Stack) -> List[Stack]:
+    """Stacks positioned at the start of `node`, with `rest` to follow it"""
+    if isinstance(node, Choice):
+        return [stack for option in node.options for stack in _enter(option, rest)]
+    if isinstance(node, Concat):
+        # The last item replaces the frame, so repetition doesn't grow the stack
+        return _enter(node.items[0], rest + ((node, 1),) if len(node.items) > 1 else rest)
+    return [rest + ((node, node.start()),)]
+
+
+def _exit(rest: Stack) -> List[Stack]:
+    """Stacks positioned after the node that `rest` was waiting on"""
+    if not rest:
+        return [()]
+    node, index = rest[-1]
+    follow = rest[:-1] + ((node, index + 1),) if index + 1 < len(node.items) else rest[:-1]
+    return _enter(node.items[index], follow)
+
+
+def _feed(stack: Stack, ch: str) -> List[Stack]:
+    node, local = stack[-1]
+    stacks = []
+    advanced = node.step(local, ch)
+    if advanced is not None:
+        stacks.append(stack[:-1] + ((node, advanced),))
+    if node.can_end(local):
+        for following in _exit(stack[:-1]):
+            if following:
+                stacks.extend(_feed(following, ch))
+    return stacks
+
+
+def compile_schema(schema: Dict[str, Any]) -> Any:
+    """
+    Grammar for the JSON schema subset Pydantic emits for plain models.
+    
+    Supports objects, arrays, strings (min/maxLength, format "date"),
+    integers (minimum/maximum), booleans, null, enum, anyOf and $ref.
+    """
+    definitions = schema.get("$defs", {})
+    
+    def resolve(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+        if len(node.get("allOf", ())) == 1:
+            return resolve(node["allOf"][0])
+        return node
+    
+    def build(node: Dict[str, Any]) -> Any:
+        node = resolve(node)
+        if "anyOf" in node:
+            return Choice([build(option) for option in node["anyOf"]])
+        if "enum" in node:
+            return Choice([Literal(json.dumps(value)) for value in node["enum"]])
+        
+        kind = node.get("type")
+        if kind == "null":
+            return Literal("null")
+        if kind == "boolean":
+            return Choice([Literal("true"), Literal("false")])
+        if kind == "integer":
+            return Integer(node.get("minimum"), node.get("maximum"))
+        if kind == "string":
+            return String(
+                node.get("minLength", 0), node.get("maxLength"),
+                DATE_TEMPLATE if node.get("format") == "date" else None
+            )
+        if kind == "object":
+            properties = node.get("properties", {})
+            if not properties:
+                return Literal("{}")
+            items = []
+            for i, (name, prop) in enumerate(properties.items()):
+                items.append(Literal(("{" if i == 0 else ", ") + json.dumps(name) + ": "))
+                items.append(build(prop))
+            items.append(Literal("}"))
+            return Concat(items)
+        if kind == "array":
+            item = build(node["items"])
+            more = Choice()
+            more.options = [Literal("]"), Concat([Literal(", "), item, more])]
+            return Concat([Literal("["), Choice([Literal("]"), Concat([item, more])])])
+        raise ValueError(f"Unsupported JSON schema for constrained decoding: {node}")
+    
+    return build(schema)
+
+
+class Grammar:
+    """A compiled schema and the parse-state operations decoding needs"""
+    
+    def __init__(self, root: Any, fingerprint: str = ""):
+        self.root = root
+        self.initial: States = frozenset(_enter(root, ()))
+        # Hash of the source schema, for keying results produced under it
+        self.fingerprint = fingerprint
+    
+    @classmethod
+    def for_type(cls, annotation: Any) -> "Grammar":
+        """Grammar for a Pydantic model or type, e.g. List[ExtractedTask]"""
+        schema = TypeAdapter(annotation).json_schema()
+        fingerprint = hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:16]
+        return cls(compile_schema(schema), fingerprint)
+    
+    @staticmethod
+    def advance(states: States, text: str) -> States:
+        """Positions reachable after `text`; empty if `text` can't follow"""
+        for ch in text:
+            states = frozenset(following for stack in states for following in _feed(stack, ch))
+            if not states:
+                break
+        return states
+    
+    @staticmethod
+    def is_complete(states: States) -> bool:
+        return any(
+            stack[-1][0].can_end(stack[-1][1]) and () in _exit(stack[:-1])
+            for stack in states
+        )
+
+
+class TokenVocabulary:
+    """
+    Decoded text of every token, indexed for computing allowed-token masks.
+    
+    Token text comes from decoding each id on its own, which is exact for
+    byte-level BPE vocabularies (GPT-2, Qwen, Llama 3). Special tokens and
+    tokens holding part of a UTF-8 character are never allowed by a
+    grammar; EOS is allowed once the output is complete.
+    """
+    
+    def __init__(self, tokenizer: Any, size: int, eos_token_ids: Sequence[int], cache_size: int = 4096):
+        import torch
+        
+        self.size = size
+        self.eos_token_ids = frozenset(eos_token_ids)
+        special = set(tokenizer.all_special_ids)
+        count = min(len(tokenizer), size)
+        decoded = tokenizer.batch_decode([[i] for i in range(count)], clean_up_tokenization_spaces=False)
+        
+        self.texts: List[Optional[str]] = [None] * size
+        self.by_first: Dict[str, List[int]] = {}
+        self.quoted: List[int] = []  # contain a quote or backslash
+        lengths = torch.zeros(size, dtype=torch.int32)
+        plain = torch.zeros(size, dtype=torch.bool)
+        for token_id, text in enumerate(decoded):
+            if token_id in special or not text or "\ufffd" in text:
+                continue
+            self.texts[token_id] = text
+            self.by_first.setdefault(text[0], []).append(token_id)
+            lengths[token_id] = len(text)
+            if '"' in text or "\\" in text:
+                self.quoted.append(token_id)
+            elif min(text) >= " ":
+                plain[token_id] = True
+        self.lengths = lengths
+        self.plain = plain  # can sit anywhere inside free text
+        self.longest_quoted = max((len(self.texts[i]) for i in self.quoted), default=0)
+        self._eos = torch.tensor(sorted(i for i in self.eos_token_ids if i < size), dtype=torch.long)
+        self._allowed = TTLCache(maxsize=cache_size)
+    
+    def mask(self, states: States) -> Any:
+        """Boolean mask over the vocabulary of the tokens that may come next"""
+        import torch
+        
+        if not states:
+            mask = torch.zeros(self.size, dtype=torch.bool)
+            mask[self._eos] = True
+            return mask
+        
+        inside = self._free_text(states)
+        if inside is not None:
+            stack, node, (count, room) = inside
+            mask = self.plain.clone() if room is None else self.plain & (self.lengths <= room)
+            # Only room under the longest quoted token matters for those tokens
+            key = (stack[:-1], node, min(count, node.min_length), room if room is not None and room <= self.longest_quoted else None)
+            candidates = self.quoted
+        else:
+            mask = torch.zeros(self.size, dtype=torch.bool)
+            key = states
+            candidates = None
+        
+        allowed = self._allowed.get(key)
+        if allowed is None:
+            allowed = self._compute(states, candidates)
+            self._allowed.set(key, allowed)
+        mask[allowed] = True
+        if not mask.any():
+            # Nothing can follow (e.g. the vocabulary lacks a needed character)
+            mask[self._eos] = True
+        return mask
+    
+    def _free_text(self, states: States) -> Optional[tuple]:
+        if len(states) != 1:
+            return None
+        stack = next(iter(states))
+        node, local = stack[-1]
+        room = node.room(local) if isinstance(node, String) else None
+        return (stack, node, room) if room is not None else None
+    
+    def _compute(self, states: States, candidates: Optional[List[int]]) -> Any:
+        import torch
+        
+        if candidates is None:
+            candidates = [
+                token_id
+                for first, token_ids in self.by_first.items() if Grammar.advance(states, first)
+                for token_id in token_ids
+            ]
+        allowed = [token_id for token_id in candidates if Grammar.advance(states, self.texts[token_id])]
+        if Grammar.is_complete(states):
+            allowed.extend(self._eos.tolist())
+        return torch.tensor(allowed, dtype=torch.long)
+
+
+class GrammarLogitsProcessor:
+    """
+    transformers LogitsProcessor constraining each row of a batch to its
+    grammar. Rows without one, and rows that have ended, are left alone.
+    """
+    
+    def __init__(self, vocabulary: TokenVocabulary, grammars: Sequence[Optional[Grammar]]):
+        self.vocabulary = vocabulary
+        self.states: List[Optional[States]] = [
+            grammar.initial if grammar is not None else None for grammar in grammars
+        ]
+        self._started = False
+    
+    def __call__(self, input_ids: Any, scores: Any) -> Any:
+        if self._started:
+            for row, token_id in enumerate(input_ids[:, -1].tolist()):
+                states = self.states[row]
+                if states is None:
+                    continue
+                text = self.vocabulary.texts[token_id] if token_id < self.vocabulary.size else None
+                if token_id in self.vocabulary.eos_token_ids or text is None:
+                    self.states[row] = None
+                else:
+                    self.states[row] = Grammar.advance(states, text)
+        self._started = True
+        
+        for row, states in enumerate(self.states):
+            if states is not None:
+                scores[row].masked_fill_(~self.vocabulary.mask(states), float("-inf"))
+        return scores
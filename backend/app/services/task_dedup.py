@@ -0,0 +1,269 @@
+"""
+Near-duplicate detection for AI-extracted tasks.
+
+The same action item often comes up in several meetings. Before an
+extracted task is inserted, it is compared with its project's open tasks
+(and the rest of its batch). A duplicate is merged into the task it
+repeats instead of being created.
+
+Each task is reduced to a MinHash signature over its title and
+description terms. Signatures are banded into an LSH table per project,
+so a lookup only touches tasks that share a band bucket, however many
+tasks the project has. Candidates are then confirmed with the exact
+Jaccard similarity of their term sets.
+
+Indexes live in this process and are brought up to date before each use.
+Rows changed since the last sync are fetched by updated_at, and the
+index is rebuilt only if tasks were deleted. A write is stamped when its
+transaction starts but becomes visible when it commits, so each sync
+re-reads TASK_DEDUP_SYNC_WINDOW_SECONDS behind the newest stamp seen, and
+keeps doing so (even if the version is unchanged) until that stamp is a
+full window old.
+"""
+import threading
+import zlib
+from datetime import timedelta
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Union
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskCreate, TaskPriority
+from app.services.search import tokenize
+from app.utils.cache import TTLCache
+from app.utils.etag import version_columns
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Universal hashing h(x) = (a * x + b) mod p over 32-bit term hashes;
+# a * x + b stays below 2**64
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240901)
+_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+# Odd multipliers folding each band's rows into one 64-bit bucket key
+_BAND_MIX = _rng.integers(1, 1 << 63, size=ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+
+CLOSED_STATUSES = (TaskStatus.DONE, TaskStatus.CANCELLED)
+PRIORITY_RANK = {priority.value: rank for rank, priority in enumerate(TaskPriority)}
+
+
+def task_terms(title: str, description: Optional[str] = None) -> FrozenSet[str]:
+    """The set a task's similarity is measured on"""
+    return frozenset(tokenize(title)) | frozenset(tokenize(description))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def minhash(terms: FrozenSet[str]) -> np.ndarray:
+    """NUM_PERM minimum hash values of a term set"""
+    if not terms:
+        return np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(term.encode()) for term in terms), dtype=np.uint64, count=len(terms))
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+
+def minhash_many(term_sets: Sequence[FrozenSet[str]], chunk: int = 2048) -> np.ndarray:
+    """Signatures of many non-empty term sets, one row each, in chunked array passes"""
+    signatures = np.empty((len(term_sets), NUM_PERM), dtype=np.uint64)
+    for start in range(0, len(term_sets), chunk):
+        sets = term_sets[start:start + chunk]
+        lengths = np.fromiter(map(len, sets), dtype=np.int64, count=len(sets))
+        hashes = np.fromiter((zlib.crc32(term.encode()) for terms in sets for term in terms), dtype=np.uint64)
+        values = (_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE_PRIME
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        signatures[start:start + len(sets)] = np.minimum.reduceat(values, offsets, axis=1).T
+    return signatures
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """One bucket key per band, for a signature or a matrix of them"""
+    banded = signatures.reshape(*signatures.shape[:-1], BANDS, ROWS_PER_BAND)
+    return (banded * _BAND_MIX).sum(axis=-1)  # wraps around, which is fine for a hash
+
+
+class ProjectTaskIndex:
+    """LSH table over one project's open tasks"""
+    
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+        self.lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self) -> None:
+        self.version: Optional[tuple] = None
+        self.synced_to = None  # latest coalesce(updated_at, created_at) seen
+        self.settled = False  # whether writes stamped up to synced_to have all committed
+        self.task_ids: Set[int] = set()  # every task seen, open or not
+        self.terms: Dict[int, FrozenSet[str]] = {}  # open tasks only
+        self.buckets: List[Dict[int, Set[int]]] = [{} for _ in range(BANDS)]
+        self._keys: Dict[int, List[int]] = {}
+    
+    def add(self, task_id: int, terms: FrozenSet[str], keys: Optional[List[int]] = None) -> None:
+        """Index an open task; `keys` are its band keys if already computed"""
+        self.discard(task_id)
+        self.terms[task_id] = terms
+        if not terms:
+            return  # can't match anything; keep it out of the buckets
+        self._keys[task_id] = keys = keys or band_keys(minhash(terms)).tolist()
+        for buckets, key in zip(self.buckets, keys):
+            buckets.setdefault(key, set()).add(task_id)
+    
+    def discard(self, task_id: int) -> None:
+        self.terms.pop(task_id, None)
+        for buckets, key in zip(self.buckets, self._keys.pop(task_id, ())):
+            bucket = buckets[key]
+            bucket.discard(task_id)
+            if not bucket:
+                del buckets[key]
+    
+    def candidates(self, terms: FrozenSet[str]) -> Set[int]:
+        """Open tasks sharing at least one band bucket with `terms`"""
+        found: Set[int] = set()
+        if not terms:
+            return found
+        for buckets, key in zip(self.buckets, band_keys(minhash(terms)).tolist()):
+            found.update(buckets.get(key, ()))
+        return found
+    
+    def best_match(self, terms: FrozenSet[str], threshold: float) -> Optional[int]:
+        """The most similar open task at or above `threshold`, if any"""
+        best, best_score = None, threshold
+        for task_id in self.candidates(terms):
+            score = jaccard(terms, self.terms[task_id])
+            if score >= best_score:
+                best, best_score = task_id, score
+        return best
+    
+    def sync(self, db: Session) -> None:
+        """Catch up with task writes made since the last sync (by any process)"""
+        in_project = Task.project_id == self.project_id
+        *version, now = db.execute(select(*version_columns(Task), func.now()).where(in_project)).one()
+        version = tuple(version)
+        if version == self.version and self.settled:
+            return
+        
+        # A transaction still open at the last sync may commit rows stamped
+        # before synced_to without moving the version, so look back a window
+        window = timedelta(seconds=settings.TASK_DEDUP_SYNC_WINDOW_SECONDS)
+        marker = func.coalesce(Task.updated_at, Task.created_at)
+        query = select(Task.id, Task.title, Task.description, Task.status, marker).where(in_project)
+        synced_to = self.synced_to
+        if synced_to is not None:
+            query = query.where(marker >= synced_to - window)
+        rows = db.execute(query).all()
+        
+        opened = {
+            task_id: task_terms(title, description)
+            for task_id, title, description, status, _ in rows if status not in CLOSED_STATUSES
+        }
+        hashed = [task_id for task_id, terms in opened.items() if terms]
+        keys = dict(zip(hashed, band_keys(minhash_many([opened[task_id] for task_id in hashed])).tolist()))
+        
+        # The lock is never held across a query: under the async API the
+        # session's I/O runs on the event loop that would wait for it
+        with self.lock:
+            for task_id, _, _, _, changed_at in rows:
+                self.task_ids.add(task_id)
+                if task_id in opened:
+                    self.add(task_id, opened[task_id], keys.get(task_id))
+                else:
+                    self.discard(task_id)
+                if changed_at is not None and (self.synced_to is None or changed_at > self.synced_to):
+                    self.synced_to = changed_at
+            
+            rebuild = synced_to is not None and len(self.task_ids) != version[0]
+            if rebuild:
+                # Tasks were deleted; only a full rebuild finds which
+                self._reset()
+            else:
+                self.version = version
+                self.settled = self.synced_to is None or now - self.synced_to > window
+        if rebuild:
+            self.sync(db)
+
+
+@dataclass
+class DedupPlan:
+    """What to do with each task of a batch"""
+    insert: List[int] = field(default_factory=list)  # batch indexes to create
+    merge: Dict[int, int] = field(default_factory=dict)  # batch index -> existing task id
+    same_as: Dict[int, int] = field(default_factory=dict)  # batch index -> earlier batch index
+
+
+# project_id -> ProjectTaskIndex
+task_indexes = TTLCache(maxsize=settings.TASK_DEDUP_MAX_PROJECTS)
+
+
+def _project_index(project_id: int) -> ProjectTaskIndex:
+    index = task_indexes.get(project_id)
+    if index is None:
+        index = ProjectTaskIndex(project_id)
+        task_indexes.set(project_id, index)
+    return index
+
+
+def plan_batch(db: Session, project_id: int, tasks: Sequence[TaskCreate]) -> DedupPlan:
+    """Match a batch of new tasks against the project's open tasks and each other"""
+    plan = DedupPlan()
+    threshold = settings.TASK_DEDUP_THRESHOLD
+    index = _project_index(project_id)
+    index.sync(db)
+    with index.lock:
+        batch = ProjectTaskIndex(project_id)
+        for i, task in enumerate(tasks):
+            terms = task_terms(task.title, task.description)
+            existing = index.best_match(terms, threshold)
+            earlier = batch.best_match(terms, threshold)
+            if existing is not None:
+                plan.merge[i] = existing
+            elif earlier is not None:
+                plan.same_as[i] = earlier
+            else:
+                plan.insert.append(i)
+                batch.add(i, terms)
+    return plan
+
+
+def merge_into(task: Union[Task, TaskCreate], duplicate: TaskCreate) -> None:
+    """Fold what a repeated mention adds into the task it repeats"""
+    if not task.description and duplicate.description:
+        task.description = duplicate.description
+    if task.due_date is None and duplicate.due_date is not None:
+        task.due_date = duplicate.due_date
+    current = getattr(task.priority, "value", task.priority)
+    if current is None or PRIORITY_RANK[duplicate.priority.value] > PRIORITY_RANK[current]:
+        task.priority = duplicate.priority
+    if duplicate.ai_confidence is not None:
+        task.ai_confidence = max(task.ai_confidence or 0, duplicate.ai_confidence)
+
+
+def dedupe_batch(db: Session, project_id: int, tasks: Sequence[TaskCreate]) -> DedupPlan:
+    """
+    Merge near-duplicates out of a batch of extracted tasks.
+    
+    Duplicates of open tasks are merged into those rows (in the session,
+    not committed) and duplicates within the batch into the item they
+    repeat, in place. The caller inserts the plan's `insert` items.
+    """
+    if not settings.TASK_DEDUP_ENABLED:
+        return DedupPlan(insert=list(range(len(tasks))))
+    
+    plan = plan_batch(db, project_id, tasks)
+    if plan.merge:
+        existing = {
+            task.id: task for task in db.scalars(select(Task).where(Task.id.in_(set(plan.merge.values()))))
+        }
+        for i, task_id in plan.merge.items():
+            merge_into(existing[task_id], tasks[i])
+    for i, earlier in plan.same_as.items():
+        merge_into(tasks[earlier], tasks[i])
+    return plan
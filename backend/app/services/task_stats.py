@@ -0,0 +1,75 @@
+"""
+Per-project task statistics.
+
+Counts come from one GROUP BY over the tasks table and are cached briefly
+per project. Task writes committed in this process invalidate the
+affected project; writes from other processes (e.g. Celery workers) show
+up once the entry expires.
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import after_commit
+from app.models.task import Task
+from app.schemas.task import TaskStats, TaskStatus
+from app.utils.cache import TTLCache
+
+# project_id -> TaskStats
+task_stats_cache = TTLCache(
+    maxsize=settings.TASK_STATS_CACHE_MAX_SIZE,
+    ttl=settings.TASK_STATS_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_task_stats(*project_ids: int) -> None:
+    """Drop cached statistics for the given projects"""
+    for project_id in project_ids:
+        task_stats_cache.pop(project_id)
+
+
+@event.listens_for(Task, "after_insert")
+@event.listens_for(Task, "after_update")
+@event.listens_for(Task, "after_delete")
+def _task_changed(mapper, connection, target):
+    after_commit(target, invalidate_task_stats, target.project_id)
+
+
+def _build_stats(counts: Dict[str, int]) -> TaskStats:
+    total = sum(counts.values())
+    done = counts.get(TaskStatus.DONE.value, 0)
+    return TaskStats(
+        total=total,
+        **{status.value: counts.get(status.value, 0) for status in TaskStatus},
+        completion_rate=round(100 * done / total, 1) if total else 0.0
+    )
+
+
+async def get_task_stats(db: AsyncSession, project_ids: Iterable[int]) -> Dict[int, TaskStats]:
+    """Task counts per status for each project, from cache where possible"""
+    stats: Dict[int, TaskStats] = {}
+    missing = []
+    for project_id in project_ids:
+        cached = task_stats_cache.get(project_id)
+        if cached is not None:
+            stats[project_id] = cached
+        else:
+            missing.append(project_id)
+    
+    if missing:
+        counts: Dict[int, Dict[str, int]] = {project_id: {} for project_id in missing}
+        rows = await db.execute(
+            select(Task.project_id, Task.status, func.count(Task.id)).where(
+                Task.project_id.in_(missing)
+            ).group_by(Task.project_id, Task.status)
+        )
+        for project_id, task_status, count in rows:
+            counts[project_id][getattr(task_status, "value", task_status)] = count
+        
+        for project_id, project_counts in counts.items():
+            stats[project_id] = _build_stats(project_counts)
+            task_stats_cache.set(project_id, stats[project_id])
+    
+    return stats
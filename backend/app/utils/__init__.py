@@ -1,5 +1,6 @@
 """Utility functions and helpers"""
-from .auth import get_current_user, create_access_token, verify_password, get_password_hash
+from app.passwords import verify_password, get_password_hash
+from .auth import get_current_user, create_access_token
 from .dependencies import get_db
 
 __all__ = [
@@ -1,35 +1,66 @@
 """
 Authentication utilities
 """
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.database import get_db
+from app.database import after_commit, get_async_db
 from app.models.user import User
+from app.models.project import ProjectMember
+from app.passwords import verify_password
 from app.schemas.user import TokenData
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.cache import TTLCache
+from app.utils.password_pool import run_password_job
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller as resolved from a token subject"""
+    id: int
+    username: str
+    is_active: bool
+    memberships: Dict[int, str] = field(default_factory=dict)  # project_id -> role
+
+
+# Resolved principals keyed by token subject, so most requests skip the users table
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop the cached principal for a user (e.g. after an update)"""
+    principal_cache.evict_where(lambda _, principal: principal.id == user_id)
+
+
+def invalidate_project_principals(project_id: int) -> None:
+    """Drop cached principals that list a project among their memberships"""
+    principal_cache.evict_where(lambda _, principal: project_id in principal.memberships)
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    after_commit(target, invalidate_principal, target.id)
+
+
+@event.listens_for(ProjectMember, "after_insert")
+@event.listens_for(ProjectMember, "after_update")
+@event.listens_for(ProjectMember, "after_delete")
+def _membership_changed(mapper, connection, target):
+    after_commit(target, invalidate_principal, target.user_id)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -57,10 +88,29 @@ def decode_access_token(token: str) -> Optional[str]:
         return None
 
 
+async def load_principal(db: AsyncSession, username: str) -> Optional[Principal]:
+    """Load a user and their project roles from the database"""
+    user = await db.scalar(select(User).where(User.username == username))
+    if user is None:
+        return None
+    
+    roles = await db.execute(
+        select(ProjectMember.project_id, ProjectMember.role).where(
+            ProjectMember.user_id == user.id
+        )
+    )
+    return Principal(
+        id=user.id,
+        username=user.username,
+        is_active=user.is_active,
+        memberships={project_id: role.value for project_id, role in roles}
+    )
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
     """Get the current authenticated user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,30 +122,48 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
-        raise credentials_exception
+    principal = principal_cache.get(username)
+    if principal is None:
+        principal = await load_principal(db, username)
+        if principal is None:
+            raise credentials_exception
+        principal_cache.set(username, principal)
     
-    return user
+    return principal
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get the current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+async def get_current_user_record(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Load the full user row, for handlers that need more than the principal"""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
     """Authenticate a user by username and password"""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         (User.username == username) | (User.email == username)
-    ).first()
+    ))
     
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await run_password_job(verify_password, password, user.hashed_password):
         return None
     return user
\ No newline at end of file
@@ -1,7 +1,107 @@
 """
-Database dependencies for FastAPI
+Database and permission dependencies for FastAPI
 """
-from app.database import get_db
+from typing import Optional, Sequence
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import after_commit, get_db, get_async_db
+from app.models.project import ProjectMember, MemberRole
+from app.utils.auth import Principal, get_current_active_user
+from app.utils.cache import TTLCache
 
 # Re-export for convenience
-__all__ = ["get_db"]
\ No newline at end of file
+__all__ = [
+    "get_db", "role_cache", "get_project_role", "check_project_role",
+    "require_project_role", "invalidate_project_role", "invalidate_project_roles"
+]
+
+# (user_id, project_id) -> role value, "" for "not a member"
+role_cache = TTLCache(
+    maxsize=settings.ROLE_CACHE_MAX_SIZE,
+    ttl=settings.ROLE_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_project_role(user_id: int, project_id: int) -> None:
+    """Drop a user's cached role in a project"""
+    role_cache.pop((user_id, project_id))
+
+
+def invalidate_project_roles(project_id: int) -> None:
+    """Drop every cached role in a project (e.g. after it is deleted)"""
+    role_cache.evict_where(lambda key, _: key[1] == project_id)
+
+
+@event.listens_for(ProjectMember, "after_insert")
+@event.listens_for(ProjectMember, "after_update")
+@event.listens_for(ProjectMember, "after_delete")
+def _member_changed(mapper, connection, target):
+    after_commit(target, invalidate_project_role, target.user_id, target.project_id)
+
+
+async def get_project_role(
+    request: Request,
+    db: AsyncSession,
+    user_id: int,
+    project_id: int
+) -> Optional[str]:
+    """A user's role in a project, or None if they aren't a member"""
+    # Resolved at most once per request, then from the shared cache
+    resolved = getattr(request.state, "project_roles", None)
+    if resolved is None:
+        resolved = request.state.project_roles = {}
+    key = (user_id, project_id)
+    if key in resolved:
+        return resolved[key]
+    
+    role = role_cache.get(key)
+    if role is None:
+        db_role = await db.scalar(select(ProjectMember.role).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id
+        ))
+        role = db_role.value if db_role is not None else ""
+        role_cache.set(key, role)
+    
+    resolved[key] = role or None
+    return resolved[key]
+
+
+async def check_project_role(
+    request: Request,
+    db: AsyncSession,
+    current_user: Principal,
+    project_id: int,
+    roles: Sequence[str] = (),
+    detail: str = "Access denied"
+) -> str:
+    """Return the caller's role in a project, or raise 403 if it isn't one of `roles`"""
+    role = await get_project_role(request, db, current_user.id, project_id)
+    if role is None or (roles and role not in roles):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+    return role
+
+
+def require_project_role(*roles: MemberRole, detail: str = "You don't have access to this project"):
+    """
+    Dependency requiring one of `roles` (any membership if none are given)
+    in the project named by the `project_id` path or query parameter.
+    """
+    allowed = tuple(role.value for role in roles)
+    
+    async def dependency(
+        project_id: int,
+        request: Request,
+        current_user: Principal = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> str:
+        return await check_project_role(request, db, current_user, project_id, allowed, detail)
+    
+    return dependency
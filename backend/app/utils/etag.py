@@ -0,0 +1,50 @@
+"""
+Weak ETags and conditional GETs for collection reads.
+
+A collection's version is a cheap aggregate (row count plus the latest
+coalesce(updated_at, created_at)) computed before the real query. If the
+client's If-None-Match still matches, the handler answers 304 without
+loading or sending the rows.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlalchemy import func
+
+# Clients may cache but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def version_columns(model):
+    """Aggregates that change whenever a row of `model` is added, updated or removed"""
+    return (
+        func.count(model.id),
+        func.max(func.coalesce(model.updated_at, model.created_at))
+    )
+
+
+def make_etag(*parts: Any) -> str:
+    """A weak ETag over a collection's version and the request's parameters"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against the request's If-None-Match header"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """A 304 for a client whose copy is still current"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
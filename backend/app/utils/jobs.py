@@ -0,0 +1,37 @@
+"""
+Enqueueing background jobs from request handlers.
+
+Importing the worker module (Celery, the AI service) and publishing to
+the broker are both blocking, so they run in a thread instead of on the
+event loop. Job ids carry the id of the project the job belongs to,
+which lets /api/jobs/{job_id} check membership before handing out a
+result without keeping a separate job -> project mapping.
+"""
+import asyncio
+import uuid
+from typing import Any, Callable, Optional
+
+from app.schemas.job import JobState, JobStatus
+
+
+def new_job_id(project_id: int) -> str:
+    """A fresh job id scoped to a project"""
+    return f"{project_id}-{uuid.uuid4()}"
+
+
+def job_project_id(job_id: str) -> Optional[int]:
+    """The project a job id belongs to, or None if it isn't one of ours"""
+    project, sep, _ = job_id.partition("-")
+    if not sep or not project.isdigit():
+        return None
+    return int(project)
+
+
+async def enqueue_job(project_id: int, send: Callable[[str], Any]) -> JobStatus:
+    """
+    Call `send(job_id)` off the event loop; it should import the job from
+    app.worker and apply_async it with task_id=job_id.
+    """
+    job_id = new_job_id(project_id)
+    await asyncio.to_thread(send, job_id)
+    return JobStatus(job_id=job_id, status=JobState.PENDING)
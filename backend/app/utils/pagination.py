@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort column name, the
+sort value and the id of the last row on the previous page. The next
+page is "rows strictly after (value, id)" in (value, id) order, which
+an index on those columns answers without scanning skipped rows, and
+which does not shift when rows are inserted mid-scroll.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(order_by: str, value: Optional[datetime], row_id: int) -> str:
+    """Build an opaque cursor pointing just after (value, row_id)"""
+    payload = {
+        "o": order_by,
+        "v": value.isoformat() if value is not None else None,
+        "id": row_id
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> Tuple[Optional[datetime], int]:
+    """Parse a cursor produced by encode_cursor for the given sort column"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload["o"] != order_by:
+            raise ValueError("cursor was issued for a different ordering")
+        value = datetime.fromisoformat(payload["v"]) if payload["v"] is not None else None
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_order(column, id_column, nullable: bool = False) -> Tuple[Any, Any]:
+    """ORDER BY clauses matching keyset_after (NULLs sort last)"""
+    return (column.asc().nulls_last() if nullable else column.asc(), id_column.asc())
+
+
+def keyset_after(column, id_column, value: Optional[datetime], row_id: int, nullable: bool = False):
+    """WHERE clause selecting rows strictly after (value, row_id)"""
+    if value is None:
+        # Only reachable for nullable columns: we are inside the NULL tail
+        return and_(column.is_(None), id_column > row_id)
+    after = tuple_(column, id_column) > tuple_(value, row_id)
+    if nullable:
+        return or_(after, column.is_(None))
+    return after
+
+
+def split_page(
+    rows: Sequence[Any],
+    limit: int,
+    order_by: str,
+    key: Callable[[Any], Tuple[Optional[datetime], int]]
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a limit + 1 fetch to one page and build the next cursor.
+    
+    Returns the page and the cursor for the following page, or None
+    when this is the last page.
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    value, row_id = key(page[-1])
+    return page, encode_cursor(order_by, value, row_id)
@@ -0,0 +1,88 @@
+"""
+Bounded process pool for password hashing.
+
+bcrypt is deliberately slow and CPU-bound, so hashing runs in a small
+dedicated pool of worker processes instead of the event loop or the
+request threadpool. When every worker is busy and the queue is full,
+new requests are turned away with 503 + Retry-After rather than piling
+up behind a login storm and starving the rest of the API.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+_in_flight = 0
+_rejected = 0
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Start the pool on first use"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _capacity() -> int:
+    return settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH
+
+
+def _release(_: Future) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+
+async def run_password_job(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a function from app.passwords in the pool, or raise 503 if saturated"""
+    global _in_flight, _rejected
+    with _lock:
+        if _in_flight >= _capacity():
+            _rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-in requests, please retry shortly",
+                headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+        _in_flight += 1
+    
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        with _lock:
+            _in_flight -= 1
+        raise
+    # Released when the job really finishes, even if the caller goes away
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+def shutdown_password_pool() -> None:
+    """Stop the worker processes"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def password_pool_stats() -> Dict[str, int]:
+    """Pool occupancy counters for metrics"""
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "capacity": _capacity(),
+        "in_flight": _in_flight,
+        "rejected": _rejected
+    }
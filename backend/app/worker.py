@@ -0,0 +1,289 @@
+"""
+Background job queue for AI processing.
+
+Meeting summarization, task extraction and weekly report generation run
+here instead of inside HTTP requests. Start a worker with:
+
+    celery -A app.worker worker --loglevel=info
+
+Workers that run AI jobs should set AI_PRELOAD_MODEL=true so each process
+loads the model once at startup instead of on its first job.
+
+Jobs go to a Redis broker by default. Set CELERY_BROKER_URL=memory:// and
+CELERY_RESULT_BACKEND=cache+memory:// to use in-memory stand-ins (with
+CELERY_TASK_ALWAYS_EAGER=true jobs run inline, which is handy in tests).
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import redis
+from celery import Celery
+from celery.exceptions import Ignore
+from celery.schedules import crontab
+from celery.signals import worker_process_init
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.meeting import Meeting
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskPriority
+from app.services.ai_service import AIService, get_engine
+from app.services.report_generator import ReportGenerator, TaskChange, week_bounds
+from app.services.task_dedup import dedupe_batch
+
+logger = logging.getLogger(__name__)
+
+# With the Redis transport a lower number is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BATCH = 9
+
+celery_app = Celery(
+    "workflow",
+    broker=settings.CELERY_BROKER_URL or settings.REDIS_URL,
+    backend=settings.CELERY_RESULT_BACKEND or settings.REDIS_URL
+)
+celery_app.conf.update(
+    task_acks_late=True,
+    task_track_started=True,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_store_eager_result=True,
+    task_default_priority=PRIORITY_DEFAULT,
+    # One AI job per worker process at a time; don't hoard queued jobs
+    worker_prefetch_multiplier=1,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "queue_order_strategy": "priority"
+    },
+    result_expires=24 * 3600,
+    timezone="UTC",
+    # Run with `celery -A app.worker beat` alongside the workers
+    beat_schedule={
+        "finalize-weekly-reports": {
+            "task": "reports.finalize_week",
+            "schedule": crontab(minute=15, hour=0, day_of_week="mon"),
+            "options": {"priority": PRIORITY_BATCH}
+        }
+    }
+)
+
+
+@worker_process_init.connect
+def _preload_model(**kwargs):
+    """Load the model in each worker process up front on designated AI workers"""
+    if settings.AI_PRELOAD_MODEL:
+        get_engine().load()
+
+
+# KEYS[1]: a project's running jobs (ZSET of job id -> start time)
+# ARGV: job id, now, slot TTL, limit. Returns 1 if the job holds a slot.
+_ACQUIRE_SLOT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2] - ARGV[3])
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) or redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[4]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class ProjectSlots:
+    """
+    Caps how many jobs run at once for a single project.
+    
+    Each running job holds its slot under its own id, stamped with when it
+    took it. Slots older than JOB_SLOT_TTL_SECONDS are presumed leaked by a
+    crashed worker and pruned on the next acquire, however busy the project
+    is, and releasing a slot that was never taken (or already pruned) is a
+    no-op. The sets live in the Redis broker so the cap holds across worker
+    processes; with a non-Redis broker they fall back to this process only.
+    """
+    
+    def __init__(self, limit: int, url: str):
+        self.limit = limit
+        self._redis = None
+        if url.startswith("redis"):
+            self._redis = redis.Redis.from_url(url)
+            self._acquire = self._redis.register_script(_ACQUIRE_SLOT)
+        self._local: Dict[int, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, project_id: int) -> str:
+        return f"jobs:project:{project_id}:running"
+    
+    def acquire(self, project_id: int, job_id: str) -> bool:
+        """Take a slot for the job, or return False if all are busy"""
+        now = time.time()
+        ttl = settings.JOB_SLOT_TTL_SECONDS
+        if self._redis is not None:
+            return bool(self._acquire(keys=[self._key(project_id)], args=[job_id, now, ttl, self.limit]))
+        
+        with self._lock:
+            running = self._local.setdefault(project_id, {})
+            for stale in [job for job, started in running.items() if started <= now - ttl]:
+                del running[stale]
+            if job_id not in running and len(running) >= self.limit:
+                return False
+            running[job_id] = now
+            return True
+    
+    def release(self, project_id: int, job_id: str) -> None:
+        """Give the job's slot back"""
+        if self._redis is not None:
+            self._redis.zrem(self._key(project_id), job_id)
+            return
+        with self._lock:
+            self._local.get(project_id, {}).pop(job_id, None)
+
+
+project_slots = ProjectSlots(settings.JOB_PROJECT_CONCURRENCY, celery_app.conf.broker_url)
+
+
+def _project_slot(task, project_id: int) -> None:
+    """
+    Wait (by re-queueing) until the project has a free slot.
+    
+    The job goes back on the queue under the same id with its retry count
+    untouched, so waiting for a slot never eats into JOB_MAX_RETRIES.
+    Eager mode runs jobs inline, where re-queueing would recurse while
+    the slot is held, so there is no gate.
+    """
+    if task.app.conf.task_always_eager:
+        return
+    if not project_slots.acquire(project_id, task.request.id):
+        task.signature_from_request(countdown=settings.JOB_SLOT_RETRY_SECONDS).apply_async()
+        raise Ignore()
+
+
+def _run(coro):
+    """Run a coroutine to completion from synchronous job code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Eager mode runs jobs inside the API's own event loop
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _task_from_extraction(item: Dict[str, Any], project_id: int, meeting_id: int) -> Optional[TaskCreate]:
+    """Map one extracted action item onto TaskCreate, or None if unusable"""
+    priority = str(item.get("priority") or "").lower()
+    due_date = item.get("due_date")
+    if isinstance(due_date, str) and len(due_date) == 10:
+        due_date += "T00:00:00"  # the prompt asks for YYYY-MM-DD
+    data = {
+        "title": str(item.get("title", ""))[:255],
+        "description": item.get("description"),
+        "priority": priority if priority in TaskPriority._value2member_map_ else TaskPriority.MEDIUM,
+        "due_date": due_date,
+        "project_id": project_id,
+        "meeting_id": meeting_id,
+        "ai_extracted": json.dumps(item),
+        "ai_confidence": item.get("ai_confidence")
+    }
+    try:
+        return TaskCreate(**data)
+    except ValidationError as e:
+        # Keep the task even if the model mangled some optional fields
+        for error in e.errors():
+            if error["loc"] and error["loc"][0] not in ("title", "project_id"):
+                data[error["loc"][0]] = None
+        try:
+            return TaskCreate(**data)
+        except ValidationError:
+            return None
+
+
+job_options = dict(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=300,
+    retry_jitter=True,
+    max_retries=settings.JOB_MAX_RETRIES
+)
+
+
+@celery_app.task(name="meetings.summarize", **job_options)
+def summarize_meeting_job(self, meeting_id: int, project_id: int) -> Dict[str, Any]:
+    """Generate and store a meeting's summary, key decisions and action items"""
+    _project_slot(self, project_id)
+    try:
+        with SessionLocal() as db:
+            meeting = db.get(Meeting, meeting_id)
+            if meeting is None or not meeting.raw_notes:
+                return {"meeting_id": meeting_id, "summarized": False}
+            
+            result = _run(AIService().summarize_meeting(meeting.raw_notes))
+            meeting.ai_summary = result["ai_summary"]
+            meeting.key_decisions = result["key_decisions"]
+            meeting.action_items = result["action_items"]
+            db.commit()
+            return {"meeting_id": meeting_id, "summarized": True}
+    finally:
+        project_slots.release(project_id, self.request.id)
+
+
+@celery_app.task(name="meetings.extract_tasks", **job_options)
+def extract_tasks_job(self, meeting_id: int, project_id: int, user_id: int) -> Dict[str, Any]:
+    """Extract action items from a meeting's notes and create them as tasks"""
+    _project_slot(self, project_id)
+    try:
+        with SessionLocal() as db:
+            meeting = db.get(Meeting, meeting_id)
+            if meeting is None or not meeting.raw_notes:
+                return {"meeting_id": meeting_id, "task_ids": []}
+            
+            items = _run(AIService().extract_tasks(meeting.raw_notes))
+            extracted = [
+                task for task in (_task_from_extraction(item, project_id, meeting_id) for item in items)
+                if task is not None
+            ]
+            # Action items already open in the project are merged, not re-created
+            plan = dedupe_batch(db, project_id, extracted)
+            tasks: List[Task] = [Task(**extracted[i].dict(), creator_id=user_id) for i in plan.insert]
+            db.add_all(tasks)
+            db.flush()
+            ReportGenerator(db).record_task_changes([
+                TaskChange(project_id=project_id, task_id=task.id, new_status=task.status)
+                for task in tasks
+            ])
+            db.commit()
+            return {
+                "meeting_id": meeting_id,
+                "task_ids": [task.id for task in tasks],
+                "merged_into": sorted(set(plan.merge.values()))
+            }
+    finally:
+        project_slots.release(project_id, self.request.id)
+
+
+@celery_app.task(name="reports.weekly", **job_options)
+def weekly_report_job(self, project_id: int) -> Dict[str, Any]:
+    """Build the current week's report for a project"""
+    _project_slot(self, project_id)
+    try:
+        with SessionLocal() as db:
+            report = ReportGenerator(db).generate_weekly_report(project_id)
+            return {"project_id": project_id, "report_id": report.id}
+    finally:
+        project_slots.release(project_id, self.request.id)
+
+
+@celery_app.task(name="reports.finalize_week", **job_options)
+def finalize_weekly_reports_job(self, when: Optional[str] = None) -> Dict[str, Any]:
+    """Finalize all projects' reports for a week (default: the week that just ended)"""
+    moment = datetime.fromisoformat(when) if when else datetime.now(timezone.utc) - timedelta(days=7)
+    with SessionLocal() as db:
+        finalized = ReportGenerator(db).finalize_week(moment)
+    return {"week_start": week_bounds(moment)[0].isoformat(), "reports": finalized}
@@ -0,0 +1 @@
+"""Benchmark scripts; see common.py for how to run them"""
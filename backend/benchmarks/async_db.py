@@ -0,0 +1,229 @@
+"""
+Throughput of the sync (get_db) and async (get_async_db) database paths.
+
+Serves the statements behind the ported auth, project and task routes
+twice from one uvicorn process: as `def` handlers on a get_db Session,
+which Starlette runs in its threadpool as the routes did before the
+port, and as `async def` handlers on a get_async_db AsyncSession, as
+they run now. The statements come from the app's own query helpers,
+so the two paths differ only in how they reach the database:
+
+    auth      load_principal's user and membership lookups
+    projects  get_projects' member listing with correlated counts
+    tasks     get_tasks' first page for a project
+
+--concurrency clients cycle through the three routes for --seconds per
+path and level; req/s and latency are reported for each. Point
+DATABASE_URL at Postgres to measure the deployment driver (asyncpg).
+
+    python -m benchmarks.async_db --concurrency 1 16 64 --seconds 10
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure, create_schema, percentiles, report
+
+PATHS = ("sync", "async")
+ROUTES = ("auth", "projects", "tasks")
+
+
+def seed(users: int, projects: int, tasks: int) -> None:
+    from sqlalchemy import insert
+    
+    from app.database import engine
+    from app.models.project import MemberRole, Project, ProjectMember
+    from app.models.task import Task
+    from app.models.user import User
+    
+    start = datetime(2024, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "unused"}
+            for i in range(users)
+        ])
+        connection.execute(insert(Project), [
+            {"name": f"project {i}", "creator_id": 1 + i % users, "created_at": start + timedelta(hours=i)}
+            for i in range(projects)
+        ])
+        # Every user is in a handful of projects
+        connection.execute(insert(ProjectMember), [
+            {"project_id": 1 + (u + k * 7) % projects, "user_id": 1 + u, "role": MemberRole.MEMBER}
+            for u in range(users) for k in range(min(5, projects))
+        ])
+        connection.execute(insert(Task), [
+            {
+                "title": f"task {i}",
+                "description": "Follow up on the sprint review",
+                "project_id": 1 + i % projects,
+                "creator_id": 1 + i % users,
+                "created_at": start + timedelta(minutes=i)
+            }
+            for i in range(tasks)
+        ])
+
+
+def create_app():
+    """The benchmark app (uvicorn --factory entry point)"""
+    from typing import List
+    
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+    
+    from app.api.projects import _count_columns, _with_counts
+    from app.database import get_async_db, get_db
+    from app.models.project import Project, ProjectMember
+    from app.models.task import Task
+    from app.models.user import User
+    from app.schemas.project import Project as ProjectSchema
+    from app.schemas.task import Task as TaskSchema
+    
+    def user_query(user_id: int):
+        return select(User).where(User.username == f"user{user_id - 1}")
+    
+    def roles_query(user_id: int):
+        return select(ProjectMember.project_id, ProjectMember.role).where(ProjectMember.user_id == user_id)
+    
+    def projects_query(user_id: int):
+        return select(Project, *_count_columns()).join(ProjectMember).where(
+            ProjectMember.user_id == user_id
+        ).offset(0).limit(100)
+    
+    def tasks_query(project_id: int):
+        return select(Task).where(Task.project_id == project_id).offset(0).limit(100)
+    
+    def principal(user, roles) -> dict:
+        return {
+            "id": user.id,
+            "username": user.username,
+            "memberships": {project_id: role.value for project_id, role in roles}
+        }
+    
+    bench = FastAPI()
+    
+    @bench.get("/sync/auth/{user_id}")
+    def sync_auth(user_id: int, db: Session = Depends(get_db)):
+        user = db.scalar(user_query(user_id))
+        return principal(user, db.execute(roles_query(user.id)))
+    
+    @bench.get("/sync/projects/{user_id}", response_model=List[ProjectSchema])
+    def sync_projects(user_id: int, db: Session = Depends(get_db)):
+        return _with_counts(db.execute(projects_query(user_id)))
+    
+    @bench.get("/sync/tasks/{project_id}", response_model=List[TaskSchema])
+    def sync_tasks(project_id: int, db: Session = Depends(get_db)):
+        return db.scalars(tasks_query(project_id)).all()
+    
+    @bench.get("/async/auth/{user_id}")
+    async def async_auth(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        user = await db.scalar(user_query(user_id))
+        return principal(user, await db.execute(roles_query(user.id)))
+    
+    @bench.get("/async/projects/{user_id}", response_model=List[ProjectSchema])
+    async def async_projects(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        return _with_counts(await db.execute(projects_query(user_id)))
+    
+    @bench.get("/async/tasks/{project_id}", response_model=List[TaskSchema])
+    async def async_tasks(project_id: int, db: AsyncSession = Depends(get_async_db)):
+        return (await db.scalars(tasks_query(project_id))).all()
+    
+    return bench
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def load(base_url: str, path: str, concurrency: int, seconds: float, users: int, projects: int) -> dict:
+    import httpx
+    
+    latencies, errors = [], 0
+    urls = itertools.cycle(
+        f"/{path}/{route}/{1 + i % (projects if route == 'tasks' else users)}"
+        for i in range(1009) for route in ROUTES
+    )
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + seconds
+        
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get(next(urls))
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += response.status_code != 200
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    
+    stats = percentiles(latencies)
+    return {
+        "path": path,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": stats["p50"],
+        "p95_ms": stats["p95"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64], help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10, help="load duration per path and level")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=20000)
+    args = parser.parse_args()
+    
+    configure()
+    create_schema()
+    seed(args.users, args.projects, args.tasks)
+    
+    port = free_port()
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "--factory", "benchmarks.async_db:create_app",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=backend, env=os.environ
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        import httpx
+        for _ in range(300):
+            try:
+                httpx.get(f"{base_url}/docs")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        
+        rows = []
+        for concurrency in args.concurrency:
+            for path in PATHS:
+                asyncio.run(load(base_url, path, concurrency, 1, args.users, args.projects))  # warm the pools
+                rows.append(asyncio.run(
+                    load(base_url, path, concurrency, args.seconds, args.users, args.projects)
+                ))
+    finally:
+        server.terminate()
+        server.wait()
+    
+    from app.database import engine
+    report(f"Auth, project and task reads on {engine.dialect.name}, {args.seconds:g} s per row", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Shared setup for the benchmark scripts.
+
+Run a benchmark from backend/ as a module, e.g.
+
+    python -m benchmarks.password_pool --help
+
+Unless DATABASE_URL is already set, each run gets a fresh SQLite database
+(schema from create_all) in a temporary directory, and Celery runs eagerly
+on the in-memory broker. App modules read settings at import time, so
+scripts call configure() before importing anything from app.
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+def configure(**overrides: str) -> str:
+    """Point the app at scratch storage; returns the scratch directory"""
+    data_dir = tempfile.mkdtemp(prefix="workflow-bench-")
+    defaults = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(data_dir, 'bench.db')}",
+        "DB_SCHEMA_MODE": "create_all",
+        "CELERY_BROKER_URL": "memory://",
+        "CELERY_RESULT_BACKEND": "cache+memory://",
+        "CELERY_TASK_ALWAYS_EAGER": "true",
+        "AI_CACHE_ENABLED": "false",
+        "AI_CACHE_DIR": os.path.join(data_dir, "ai_results")
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+    os.environ.update(overrides)
+    return data_dir
+
+
+def create_schema() -> None:
+    """Create the tables, as DB_SCHEMA_MODE=create_all does"""
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+    from app.database import Base, engine
+    Base.metadata.create_all(bind=engine)
+
+
+@contextmanager
+def timed(samples: List[float]) -> Iterator[None]:
+    """Append the block's wall time in milliseconds to `samples`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50 / p95 / max of millisecond samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "p50": round(statistics.median(ordered), 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max": round(ordered[-1], 2)
+    }
+
+
+def tiny_tokenizer(corpus: List[str], vocab_size: int = 400):
+    """A byte-level BPE chat tokenizer trained on `corpus`, so nothing is downloaded"""
+    import string
+    
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import PreTrainedTokenizerFast
+    
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(
+        vocab_size=vocab_size,
+        special_tokens=["<|endoftext|>", "<|im_start|>", "<|im_end|>"],
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet()
+    )
+    tokenizer.train_from_iterator([*corpus, string.printable], trainer)
+    wrapped = PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<|im_end|>", pad_token="<|endoftext|>")
+    wrapped.chat_template = (
+        "{% for m in messages %}<|im_start|>{{ m['role'] }}\n{{ m['content'] }}<|im_end|>\n{% endfor %}"
+        "{% if add_generation_prompt %}<|im_start|>assistant\n{% endif %}"
+    )
+    return wrapped
+
+
+def tiny_model(tokenizer, layers: int = 2, hidden_size: int = 64, max_positions: int = 32768, seed: int = 0):
+    """A randomly initialized Qwen2 causal LM sized for CPU benchmarks"""
+    import torch
+    from transformers import Qwen2Config, Qwen2ForCausalLM
+    
+    torch.manual_seed(seed)
+    config = Qwen2Config(
+        vocab_size=len(tokenizer), hidden_size=hidden_size, intermediate_size=hidden_size * 2,
+        num_hidden_layers=layers, num_attention_heads=4, num_key_value_heads=2,
+        max_position_embeddings=max_positions,
+        eos_token_id=tokenizer.eos_token_id, pad_token_id=tokenizer.pad_token_id
+    )
+    return Qwen2ForCausalLM(config).eval()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far"""
+    import resource
+    import sys
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def report(title: str, rows: List[Dict[str, object]]) -> None:
+    """Print rows of results as an aligned table"""
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
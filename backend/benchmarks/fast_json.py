@@ -0,0 +1,116 @@
+"""
+Task list serialization: the ORM + Pydantic path versus FAST_JSON_RESPONSES.
+
+Times encoding one page of tasks both ways (ORM objects validated into
+TaskSchema and dumped with the stdlib encoder, as FastAPI does, versus
+column rows through FastRows and orjson) and the whole GET /api/tasks/
+request with the setting off and on. The two bodies are compared for
+equality first.
+
+    python -m benchmarks.fast_json --limit 100
+"""
+import argparse
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from benchmarks.common import configure, create_schema, percentiles, report, timed
+
+
+def seed(tasks: int) -> int:
+    from app.database import SessionLocal
+    from app.models.project import MemberRole, Project, ProjectMember
+    from app.models.task import Task
+    from app.models.user import User
+    
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="unused")
+        db.add(user)
+        db.flush()
+        project = Project(name="bench", creator_id=user.id)
+        db.add(project)
+        db.flush()
+        db.add(ProjectMember(project_id=project.id, user_id=user.id, role=MemberRole.OWNER))
+        start = datetime(2024, 1, 1)
+        db.add_all(
+            Task(
+                title=f"Task {i}: follow up on the sprint review",
+                description="Collect feedback from the client and update the backlog accordingly. " * 3,
+                project_id=project.id,
+                creator_id=user.id,
+                assignee_id=user.id,
+                due_date=start + timedelta(days=i % 30),
+                estimated_hours=i % 8,
+                created_at=start + timedelta(minutes=i)
+            )
+            for i in range(tasks)
+        )
+        db.commit()
+        return project.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=100, help="tasks per page (at most 100 over HTTP)")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per measurement")
+    args = parser.parse_args()
+    
+    configure()
+    create_schema()
+    
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    
+    from app.api.tasks import _task_rows
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.task import Task
+    from app.schemas.task import Task as TaskSchema
+    from app.utils.auth import create_access_token
+    
+    project_id = seed(args.limit)
+    adapter = TypeAdapter(List[TaskSchema])
+    rows = []
+    
+    with SessionLocal() as db:
+        tasks = db.scalars(select(Task).where(Task.project_id == project_id)).all()
+        columns = db.execute(select(*_task_rows.columns).where(Task.project_id == project_id)).all()
+        
+        def orm_path() -> bytes:
+            models = adapter.validate_python(tasks, from_attributes=True)
+            return json.dumps(adapter.dump_python(models, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+        
+        def fast_path() -> bytes:
+            return _task_rows.render(columns)
+        
+        assert json.loads(orm_path()) == json.loads(fast_path()), "the two paths disagree"
+        for name, encode in (("orm + pydantic", orm_path), ("FastRows + orjson", fast_path)):
+            samples = []
+            for _ in range(args.repeat):
+                with timed(samples):
+                    encode()
+            rows.append({"measure": "serialize", "path": name, **{f"{k}_ms": v for k, v in percentiles(samples).items()}})
+    
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+    params = {"project_id": project_id, "limit": min(args.limit, 100)}
+    with TestClient(app) as client:
+        bodies = {}
+        for fast in (False, True):
+            settings.FAST_JSON_RESPONSES = fast
+            client.get("/api/tasks/", params=params, headers=headers)
+            samples = []
+            for _ in range(args.repeat):
+                with timed(samples):
+                    response = client.get("/api/tasks/", params=params, headers=headers)
+            bodies[fast] = response.json()
+            path = "FAST_JSON_RESPONSES=true" if fast else "FAST_JSON_RESPONSES=false"
+            rows.append({"measure": "request", "path": path, **{f"{k}_ms": v for k, v in percentiles(samples).items()}})
+        assert bodies[False] == bodies[True], "the two responses disagree"
+    
+    report(f"A page of {args.limit} tasks", rows)
+
+
+if __name__ == "__main__":
+    main()
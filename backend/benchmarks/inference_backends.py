@@ -0,0 +1,111 @@
+"""
+fp32 versus int8 CPU inference: throughput, first-token latency, peak
+memory and how often int8 output agrees with fp32.
+
+Each backend runs in a fresh process (so peak RSS is its own) on a small
+random Qwen2 model; pass --model to load a cached Hugging Face model,
+which gives far more meaningful agreement numbers than random weights.
+
+    python -m benchmarks.inference_backends --threads 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from typing import Optional
+
+from benchmarks.common import configure, peak_rss_mb, percentiles, report, tiny_model, tiny_tokenizer
+
+PROMPTS = [
+    "Summarize: the team agreed to move the launch to Friday and Alice owns the release notes.",
+    "Extract tasks: Bob will book the demo room; Carol reviews the schema migration by Monday.",
+    "Summarize: the client asked for weekly reports and a shared dashboard.",
+    "Extract tasks: Dan fixes the failing staging deploy and writes a runbook.",
+    "Summarize: we decided to keep Postgres and drop the session cache.",
+    "Extract tasks: Erin sends the invoice and updates the project budget."
+]
+
+
+def run(backend: str, model_name: Optional[str], options: dict, results) -> None:
+    configure(AI_NUM_THREADS=str(options["threads"]))
+    
+    from app.services.ai_service import InferenceEngine
+    
+    kwargs = {"backend": backend, "temperature": 0, "max_batch_size": len(PROMPTS)}
+    if model_name:
+        engine = InferenceEngine(model_name=model_name, **kwargs)
+    else:
+        tokenizer = tiny_tokenizer(PROMPTS * 20, vocab_size=2000)
+        model = tiny_model(tokenizer, layers=options["layers"], hidden_size=options["hidden"], max_positions=4096)
+        engine = InferenceEngine(model=model, tokenizer=tokenizer, **kwargs)
+    start = time.perf_counter()
+    engine.load()
+    load_s = time.perf_counter() - start
+    tokens = options["tokens"]
+    
+    async def first_token(prompt: str) -> float:
+        start = time.perf_counter()
+        async for _ in engine.stream(prompt, max_new_tokens=tokens):
+            break
+        return (time.perf_counter() - start) * 1000
+    
+    # Greedy output of each prompt on its own; also warms the engine up
+    outputs = [engine.submit(prompt, max_new_tokens=tokens).result() for prompt in PROMPTS]
+    first_ms = [asyncio.run(first_token(prompt)) for prompt in PROMPTS]
+    
+    generated, seconds = engine.tokens_generated, engine.generation_seconds
+    for _ in range(options["rounds"]):
+        futures = [engine.submit(prompt, max_new_tokens=tokens) for prompt in PROMPTS]
+        for future in futures:
+            future.result()
+    throughput = (engine.tokens_generated - generated) / (engine.generation_seconds - seconds)
+    engine.shutdown()
+    
+    results.put({
+        "row": {
+            "backend": backend,
+            "load_s": round(load_s, 2),
+            "tokens_per_s": round(throughput, 1),
+            "first_token_p50_ms": percentiles(first_ms)["p50"],
+            "peak_rss_mb": peak_rss_mb()
+        },
+        "outputs": outputs
+    })
+
+
+def agreement(reference: list, outputs: list) -> dict:
+    """Exact matches, and how far outputs run before diverging, on average"""
+    identical = sum(a == b for a, b in zip(reference, outputs))
+    shared = [len(os.path.commonprefix([a, b])) / max(len(a), 1) for a, b in zip(reference, outputs)]
+    return {"identical": f"{identical}/{len(reference)}", "shared_prefix": f"{100 * sum(shared) / len(shared):.0f}%"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Hugging Face model to load from the local cache instead of the random one")
+    parser.add_argument("--layers", type=int, default=4, help="random model depth")
+    parser.add_argument("--hidden", type=int, default=512, help="random model width")
+    parser.add_argument("--tokens", type=int, default=32, help="new tokens per request")
+    parser.add_argument("--rounds", type=int, default=3, help="batches of all prompts for throughput")
+    parser.add_argument("--threads", type=int, default=0, help="AI_NUM_THREADS (0 keeps torch's default)")
+    args = parser.parse_args()
+    
+    options = {"layers": args.layers, "hidden": args.hidden, "tokens": args.tokens, "rounds": args.rounds, "threads": args.threads}
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in ("fp32", "int8"):
+        queue = context.Queue()
+        process = context.Process(target=run, args=(backend, args.model, options, queue))
+        process.start()
+        results[backend] = queue.get()
+        process.join()
+    
+    rows = []
+    for backend, result in results.items():
+        rows.append({**result["row"], **agreement(results["fp32"]["outputs"], result["outputs"])})
+    report(f"{args.model or 'random Qwen2'}: {args.tokens} new tokens, greedy", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Deep-page latency: OFFSET versus keyset (cursor) pagination of tasks.
+
+Seeds one project with --rows tasks (plus the composite index init.sql
+creates) and reads a page at several depths, once with ?skip= and once
+with a cursor pointing at the same row. Both the page query on its own
+and the whole GET /api/tasks/ request (which also runs the ETag version
+query) are timed.
+
+    python -m benchmarks.pagination --rows 1000000
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.common import configure, create_schema, percentiles, report, timed
+
+BATCH = 20000
+
+
+def seed(rows: int) -> tuple:
+    from sqlalchemy import insert, text
+    
+    from app.database import engine
+    from app.models.project import MemberRole, Project, ProjectMember
+    from app.models.task import Task
+    from app.models.user import User
+    
+    start = datetime(2024, 1, 1)
+    with engine.begin() as connection:
+        user_id = connection.execute(insert(User).values(
+            email="bench@example.com", username="bench", hashed_password="unused"
+        )).inserted_primary_key[0]
+        project_id = connection.execute(insert(Project).values(
+            name="bench", creator_id=user_id
+        )).inserted_primary_key[0]
+        connection.execute(insert(ProjectMember).values(
+            project_id=project_id, user_id=user_id, role=MemberRole.OWNER
+        ))
+        for offset in range(0, rows, BATCH):
+            connection.execute(insert(Task), [
+                {
+                    "title": f"task {i}",
+                    "project_id": project_id,
+                    "creator_id": user_id,
+                    "created_at": start + timedelta(seconds=i)
+                }
+                for i in range(offset, min(offset + BATCH, rows))
+            ])
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_project_created_id ON tasks (project_id, created_at, id)"
+        ))
+    return user_id, project_id
+
+
+def cursor_at(project_id: int, depth: int) -> str:
+    """The cursor a client would hold after reading `depth` rows"""
+    from sqlalchemy import select
+    
+    from app.database import SessionLocal
+    from app.models.task import Task
+    from app.utils.pagination import encode_cursor
+    
+    with SessionLocal() as db:
+        created_at, row_id = db.execute(
+            select(Task.created_at, Task.id).where(Task.project_id == project_id)
+            .order_by(Task.created_at, Task.id).offset(depth - 1).limit(1)
+        ).one()
+    return encode_cursor("created_at", created_at, row_id)
+
+
+def page_query(project_id: int, limit: int, depth: int, cursor: str):
+    """The SELECT get_tasks runs for each mode"""
+    from sqlalchemy import select
+    
+    from app.models.task import Task
+    from app.utils.pagination import decode_cursor, keyset_after, keyset_order
+    
+    query = select(Task).where(Task.project_id == project_id)
+    if cursor is None:
+        return query.offset(depth).limit(limit)
+    value, row_id = decode_cursor(cursor, "created_at")
+    return query.where(keyset_after(Task.created_at, Task.id, value, row_id)).order_by(
+        *keyset_order(Task.created_at, Task.id)
+    ).limit(limit + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="tasks in the project")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--repeat", type=int, default=20, help="requests per measurement")
+    args = parser.parse_args()
+    
+    configure()
+    create_schema()
+    
+    from fastapi.testclient import TestClient
+    
+    from app.database import SessionLocal
+    from app.main import app
+    from app.utils.auth import create_access_token
+    
+    _, project_id = seed(args.rows)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+    depths = sorted({1, args.rows // 10, args.rows // 2, args.rows - args.limit})
+    
+    results = []
+    with TestClient(app) as client:
+        for depth in depths:
+            modes = {
+                "offset": {"project_id": project_id, "limit": args.limit, "skip": depth},
+                "keyset": {"project_id": project_id, "limit": args.limit, "order_by": "created_at", "cursor": cursor_at(project_id, depth)}
+            }
+            for mode, params in modes.items():
+                query = page_query(project_id, args.limit, depth, params.get("cursor"))
+                query_ms, request_ms = [], []
+                with SessionLocal() as db:
+                    for _ in range(args.repeat):
+                        with timed(query_ms):
+                            db.scalars(query).all()
+                for _ in range(args.repeat):
+                    with timed(request_ms):
+                        response = client.get("/api/tasks/", params=params, headers=headers)
+                    assert response.status_code == 200, response.text
+                results.append({
+                    "depth": depth,
+                    "mode": mode,
+                    "query_p50_ms": percentiles(query_ms)["p50"],
+                    "query_p95_ms": percentiles(query_ms)["p95"],
+                    "request_p50_ms": percentiles(request_ms)["p50"],
+                    "request_p95_ms": percentiles(request_ms)["p95"]
+                })
+    
+    report(f"GET /api/tasks/ page of {args.limit} out of {args.rows} tasks", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Concurrent logins against the bcrypt process pool.
+
+Fires a burst of concurrent POST /api/auth/login requests while polling
+GET /health, and reports login latency, 503 rejections and how long the
+health check takes during the burst. --inline hashes on the event loop
+instead of the pool, which is how logins ran before the pool existed.
+
+    python -m benchmarks.password_pool --logins 64 --workers 2
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure, create_schema, percentiles, report, timed
+
+
+async def run(logins: int, inline: bool) -> dict:
+    import httpx
+    
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.user import User
+    from app.passwords import get_password_hash
+    from app.utils import auth
+    
+    if inline:
+        async def run_inline(fn, *args):
+            return fn(*args)
+        auth.run_password_job = run_inline
+    
+    with SessionLocal() as db:
+        if db.query(User).filter(User.username == "bench").first() is None:
+            db.add(User(email="bench@example.com", username="bench", hashed_password=get_password_hash("secret")))
+            db.commit()
+    
+    login_ms, health_ms, statuses = [], [], []
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=120) as client:
+        done = asyncio.Event()
+        
+        async def login():
+            with timed(login_ms):
+                response = await client.post("/api/auth/login", json={"username": "bench", "password": "secret"})
+            statuses.append(response.status_code)
+        
+        async def poll_health():
+            # Timed from when each check was due, so a blocked loop shows up
+            due = time.perf_counter()
+            while not done.is_set():
+                due += 0.01
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/health")
+                health_ms.append((time.perf_counter() - due) * 1000)
+                due = max(due, time.perf_counter())
+        
+        await login()  # start the pool outside the measurement
+        login_ms.clear()
+        statuses.clear()
+        
+        poller = asyncio.create_task(poll_health())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await poller
+    
+    from app.utils.password_pool import shutdown_password_pool
+    shutdown_password_pool()
+    
+    ok = [ms for ms, code in zip(login_ms, statuses) if code == 200]
+    return {
+        "mode": "inline" if inline else "pool",
+        "logins": logins,
+        "ok": statuses.count(200),
+        "rejected_503": statuses.count(503),
+        "burst_s": round(elapsed, 2),
+        "login_p50_ms": percentiles(ok)["p50"],
+        "login_p95_ms": percentiles(ok)["p95"],
+        "health_p50_ms": percentiles(health_ms)["p50"],
+        "health_max_ms": percentiles(health_ms)["max"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="concurrent logins in the burst")
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--queue-depth", type=int, default=32, help="PASSWORD_HASH_QUEUE_DEPTH")
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop instead of the pool")
+    args = parser.parse_args()
+    
+    configure(
+        PASSWORD_HASH_WORKERS=str(args.workers),
+        PASSWORD_HASH_QUEUE_DEPTH=str(args.queue_depth)
+    )
+    create_schema()
+    report("Concurrent logins", [asyncio.run(run(args.logins, args.inline))])
+
+
+if __name__ == "__main__":
+    main()
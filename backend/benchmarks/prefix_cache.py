@@ -0,0 +1,117 @@
+"""
+Time to first token with the system-prompt KV prefix cache off, cold and
+warm.
+
+Summary prompts for notes of several lengths run on a small random Qwen2
+model (or a cached Hugging Face model with --model). Time to first token
+is the wall time of a one-token request: the whole prefill plus one
+decoding step. Per notes length it is measured
+
+    off   with AI_PREFIX_CACHE_ENABLED=false (full prefill every time)
+    cold  on a fresh engine, so the prefix's KV cache is built first
+    warm  once the prefix is cached, so prefill only covers the notes
+
+and greedy output with the warm cache is compared against output without
+it.
+
+    python -m benchmarks.prefix_cache --layers 8 --notes-words 40 160 640
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import configure, percentiles, report, tiny_model, tiny_tokenizer
+
+WORDS = (
+    "alice bob carol dan erin the team agreed to ship release notes by friday schema migration "
+    "review demo room client weekly report dashboard budget invoice staging deploy runbook "
+    "we decided keep postgres drop session cache next sprint owner blocked waiting on feedback"
+).split()
+
+
+def make_notes(words: int, seed: int) -> str:
+    rng = random.Random(seed)
+    sentences, count = [], 0
+    while count < words:
+        length = rng.randint(6, 14)
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + ".")
+        count += length
+    return " ".join(sentences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="Hugging Face model to load from the local cache instead of the random one")
+    parser.add_argument("--layers", type=int, default=8, help="random model depth")
+    parser.add_argument("--hidden", type=int, default=512, help="random model width")
+    parser.add_argument("--notes-words", type=int, nargs="+", default=[40, 160, 640], help="notes lengths")
+    parser.add_argument("--samples", type=int, default=5, help="samples per notes length and mode")
+    parser.add_argument("--tokens", type=int, default=16, help="new tokens for the output comparison")
+    args = parser.parse_args()
+    
+    configure()
+    
+    from app.config import settings
+    from app.services.ai_service import SUMMARY_SYSTEM_PROMPT, AIService, InferenceEngine
+    
+    if args.model:
+        def new_engine():
+            return InferenceEngine(model_name=args.model, temperature=0)
+    else:
+        notes_corpus = [make_notes(200, seed) for seed in range(20)]
+        tokenizer = tiny_tokenizer([SUMMARY_SYSTEM_PROMPT, *notes_corpus] * 5, vocab_size=2000)
+        model = tiny_model(tokenizer, layers=args.layers, hidden_size=args.hidden, max_positions=8192)
+        
+        def new_engine():
+            return InferenceEngine(model=model, tokenizer=tokenizer, temperature=0)
+    
+    def first_token_ms(engine: InferenceEngine, prompt: str) -> float:
+        start = time.perf_counter()
+        engine.submit(prompt, max_new_tokens=1).result()
+        return (time.perf_counter() - start) * 1000
+    
+    def prepared(prefix_cache: bool):
+        settings.AI_PREFIX_CACHE_ENABLED = prefix_cache
+        engine = new_engine()
+        service = AIService(engine=engine)
+        service.register_prompt_prefixes()
+        return engine, service
+    
+    rows = []
+    for words in args.notes_words:
+        engine, service = prepared(prefix_cache=False)
+        prompts = [service.build_prompt(SUMMARY_SYSTEM_PROMPT, make_notes(words, seed)) for seed in range(args.samples)]
+        first_token_ms(engine, prompts[0])  # warm up the model itself
+        off = [first_token_ms(engine, prompt) for prompt in prompts]
+        reference = [engine.submit(prompt, max_new_tokens=args.tokens).result() for prompt in prompts]
+        engine.shutdown()
+        
+        cold = []
+        for prompt in prompts:
+            engine, _ = prepared(prefix_cache=True)
+            cold.append(first_token_ms(engine, prompt))
+            engine.shutdown()
+        
+        engine, _ = prepared(prefix_cache=True)
+        first_token_ms(engine, prompts[0])  # builds the prefix cache
+        hits, reused = engine.prefix_hits, engine.prefix_tokens_reused
+        warm = [first_token_ms(engine, prompt) for prompt in prompts]
+        prefix_tokens = (engine.prefix_tokens_reused - reused) // max(engine.prefix_hits - hits, 1)
+        outputs = [engine.submit(prompt, max_new_tokens=args.tokens).result() for prompt in prompts]
+        engine.shutdown()
+        
+        rows.append({
+            "notes_words": words,
+            "prompt_tokens": len(engine.tokenizer(prompts[0])["input_ids"]),
+            "prefix_tokens": prefix_tokens,
+            "off_p50_ms": percentiles(off)["p50"],
+            "cold_p50_ms": percentiles(cold)["p50"],
+            "warm_p50_ms": percentiles(warm)["p50"],
+            "identical": f"{sum(a == b for a, b in zip(reference, outputs))}/{len(prompts)}"
+        })
+    
+    report(f"Time to first token, {args.model or f'random {args.layers}-layer Qwen2'}, greedy", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Full-text search latency over a synthetic corpus of meetings and tasks.
+
+Seeds --docs documents whose words follow a Zipf distribution, then
+times search_documents for common, rare, multi-word and excluding
+queries across all the projects. On PostgreSQL (DATABASE_URL pointing at
+a database migrated to head) this exercises the tsvector/GIN path;
+otherwise the in-process inverted index, whose build time is reported
+separately.
+
+    python -m benchmarks.search --docs 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime
+
+from benchmarks.common import configure, create_schema, percentiles, report, timed
+
+BATCH = 20000
+PROJECTS = 10
+
+
+def vocabulary(size: int, rng: random.Random) -> list:
+    """Pronounceable made-up words, so stemming leaves them alone"""
+    consonants, vowels = "bdfgklmnprstvz", "aeiou"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def seed(docs: int, words: list, rng: random.Random) -> list:
+    from sqlalchemy import insert
+    
+    from app.database import engine
+    from app.models.meeting import Meeting
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.user import User
+    
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    
+    def text(count: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=cumulative, k=count))
+    
+    with engine.begin() as connection:
+        user_id = connection.execute(insert(User).values(
+            email="bench@example.com", username="bench", hashed_password="unused"
+        )).inserted_primary_key[0]
+        project_ids = [
+            connection.execute(insert(Project).values(name=f"bench {i}", creator_id=user_id)).inserted_primary_key[0]
+            for i in range(PROJECTS)
+        ]
+        meetings = docs // 5
+        for offset in range(0, meetings, BATCH):
+            connection.execute(insert(Meeting), [
+                {
+                    "title": text(4), "raw_notes": text(200), "ai_summary": text(40),
+                    "project_id": project_ids[i % PROJECTS], "creator_id": user_id,
+                    "meeting_date": datetime(2024, 1, 1)
+                }
+                for i in range(offset, min(offset + BATCH, meetings))
+            ])
+        for offset in range(0, docs - meetings, BATCH):
+            connection.execute(insert(Task), [
+                {
+                    "title": text(6), "description": text(30),
+                    "project_id": project_ids[i % PROJECTS], "creator_id": user_id
+                }
+                for i in range(offset, min(offset + BATCH, docs - meetings))
+            ])
+    return project_ids
+
+
+async def measure(queries: dict, project_ids: list, repeat: int) -> list:
+    from app.database import AsyncSessionLocal
+    from app.services.search import search_documents
+    
+    rows = []
+    async with AsyncSessionLocal() as db:
+        if db.bind.dialect.name != "postgresql":
+            start = time.perf_counter()
+            await search_documents(db, next(iter(queries.values())), project_ids)
+            rows.append({"query": "(build in-process index)", "hits": "", "p50_ms": round((time.perf_counter() - start) * 1000, 2), "p95_ms": ""})
+        for name, query in queries.items():
+            samples = []
+            for _ in range(repeat):
+                with timed(samples):
+                    hits = await search_documents(db, query, project_ids, limit=20)
+            stats = percentiles(samples)
+            rows.append({"query": f"{name}: {query}", "hits": len(hits), "p50_ms": stats["p50"], "p95_ms": stats["p95"]})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="meetings + tasks to index")
+    parser.add_argument("--words", type=int, default=20000, help="vocabulary size")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per query")
+    args = parser.parse_args()
+    
+    configure()
+    create_schema()
+    
+    rng = random.Random(42)
+    words = vocabulary(args.words, rng)
+    start = time.perf_counter()
+    project_ids = seed(args.docs, words, rng)
+    print(f"Seeded {args.docs} documents in {time.perf_counter() - start:.1f} s")
+    
+    queries = {
+        "common word": words[0],
+        "rare word": words[len(words) // 2],
+        "two words": f"{words[1]} {words[30]}",
+        "exclusion": f"{words[2]} -{words[3]}"
+    }
+    report(f"search_documents over {args.docs} documents", asyncio.run(measure(queries, project_ids, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
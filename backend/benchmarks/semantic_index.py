@@ -0,0 +1,87 @@
+"""
+Memory, latency and recall of the int8 semantic index: exact blocked
+scoring versus the IVF index.
+
+Indexes --passages synthetic unit vectors drawn around random cluster
+centres (embeddings of real notes are clustered too) as one passage per
+meeting, then runs --queries held-out queries. Recall@k is measured
+against exact float32 cosine over the original vectors.
+
+    python -m benchmarks.semantic_index --passages 200000 --nprobe 16
+"""
+import argparse
+import time
+
+from benchmarks.common import configure, percentiles, report, timed
+
+
+def clustered(rng, rows: int, dim: int, clusters: int, spread: float):
+    import numpy as np
+    
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, rows)] + spread * rng.standard_normal((rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passages", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384, help="MiniLM's embedding size by default")
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=0.6, help="noise around each cluster centre")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=16, help="AI_EMBEDDING_IVF_NPROBE")
+    args = parser.parse_args()
+    
+    configure(AI_EMBEDDING_IVF_NPROBE=str(args.nprobe))
+    
+    import numpy as np
+    
+    from app.config import settings
+    from app.services.embeddings import ProjectIndex, _IndexedMeeting
+    
+    rng = np.random.default_rng(0)
+    data = clustered(rng, args.passages + args.queries, args.dim, args.clusters, args.spread)
+    vectors, queries = data[:args.passages], data[args.passages:]
+    truth = [set(np.argsort(-(vectors @ q))[:args.k].tolist()) for q in queries]
+    
+    index = ProjectIndex(project_id=1, dim=args.dim)
+    start = time.perf_counter()
+    for offset in range(0, args.passages, 10000):
+        index.replace({
+            row: (_IndexedMeeting(marker=None, title=""), [""], vectors[row:row + 1])
+            for row in range(offset, min(offset + 10000, args.passages))
+        })
+    build_s = time.perf_counter() - start
+    
+    rows = []
+    for mode, threshold in (("exact", args.passages + 1), (f"ivf nprobe={args.nprobe}", 0)):
+        settings.AI_EMBEDDING_IVF_THRESHOLD = threshold
+        start = time.perf_counter()
+        index.search(queries[0], args.k)  # trains the IVF lists on first use
+        first_s = time.perf_counter() - start
+        
+        samples, recalls = [], []
+        for query, expected in zip(queries, truth):
+            with timed(samples):
+                hits = index.search(query, args.k)
+            recalls.append(len(expected & {meeting_id for meeting_id, _, _ in hits}) / args.k)
+        stats = percentiles(samples)
+        rows.append({
+            "mode": mode,
+            f"recall@{args.k}": round(float(np.mean(recalls)), 3),
+            "p50_ms": stats["p50"],
+            "p95_ms": stats["p95"],
+            "first_search_s": round(first_s, 2)
+        })
+    
+    int8_mb = (index.codes[:index.count].nbytes + index.scales[:index.count].nbytes) / 2 ** 20
+    float32_mb = vectors.nbytes / 2 ** 20
+    print(f"Indexed {args.passages} x {args.dim} passages in {build_s:.1f} s: "
+          f"{int8_mb:.0f} MB as int8 + scales vs {float32_mb:.0f} MB as float32")
+    report(f"Top-{args.k} semantic search", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+API startup cost: how long `import app.main` takes and which heavy
+packages it drags in.
+
+Each sample imports the app in a fresh interpreter. The process exits
+non-zero if any of the --forbid packages get imported, or if the median
+import time is above --max-seconds, so it can gate CI.
+
+    python -m benchmarks.startup --runs 5 --max-seconds 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import configure, percentiles, report
+
+HEAVY = ["torch", "transformers", "celery", "kombu", "redis", "numpy", "googleapiclient", "slack_sdk"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted({name.split(".")[0] for name in sys.modules})}))
+"""
+
+
+def sample() -> dict:
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=backend, env=os.environ,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--max-seconds", type=float, help="fail if the median import takes longer")
+    parser.add_argument("--forbid", nargs="*", default=HEAVY, help="packages the API must not import at startup")
+    args = parser.parse_args()
+    
+    configure()
+    samples = [sample() for _ in range(args.runs)]
+    seconds = [s["seconds"] * 1000 for s in samples]
+    imported = sorted(set(args.forbid) & set(samples[-1]["modules"]))
+    
+    report("import app.main", [{
+        "runs": args.runs,
+        **{f"{k}_ms": v for k, v in percentiles(seconds).items()},
+        "forbidden_imported": ", ".join(imported) or "none"
+    }])
+    
+    failures = []
+    if imported:
+        failures.append(f"imported at startup: {', '.join(imported)}")
+    if args.max_seconds is not None and percentiles(seconds)["p50"] > args.max_seconds * 1000:
+        failures.append(f"median import time is over {args.max_seconds} s")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
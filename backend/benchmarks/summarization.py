@@ -0,0 +1,101 @@
+"""
+Latency and peak memory of summarizing long transcripts, with chunked
+map-reduce versus the whole transcript in one prompt.
+
+Each run happens in a fresh process (so peak RSS is its own) on a tiny
+random Qwen2 model; pass --model to load a cached Hugging Face model
+instead. The single-prompt mode sets AI_CHUNK_TOKENS past the transcript
+length, which is how summarization worked before chunking.
+
+    python -m benchmarks.summarization --tokens 1000 4000 8000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+from typing import Optional
+
+from benchmarks.common import configure, peak_rss_mb, report, tiny_model, tiny_tokenizer
+
+LINES = [
+    "Alice: the staging deploy failed again because the migration timed out.",
+    "Bob: we agreed to split the migration and run the backfill overnight.",
+    "Carol: I will write the runbook for the backfill by Thursday.",
+    "Dan: the demo for the client moves to next Tuesday, same room.",
+    "Alice: decision - we keep Postgres and drop the Redis cache for sessions."
+]
+
+
+def transcript(tokenizer, tokens: int) -> str:
+    """Meeting-like notes about `tokens` long"""
+    lines, count = [], 0
+    while count < tokens:
+        line = LINES[len(lines) % len(LINES)]
+        lines.append(line)
+        count += len(tokenizer(line + "\n")["input_ids"])
+    return "\n".join(lines)
+
+
+def run(tokens: int, chunked: bool, model_name: Optional[str], results) -> None:
+    overrides = {"AI_MAX_TOKENS": "32", "AI_CHUNK_SUMMARY_TOKENS": "32"}
+    if not chunked:
+        overrides["AI_CHUNK_TOKENS"] = str(10 ** 9)
+    configure(**overrides)
+    
+    from app.services.ai_service import AIService, InferenceEngine
+    
+    if model_name:
+        engine = InferenceEngine(model_name=model_name, temperature=0)
+    else:
+        tokenizer = tiny_tokenizer(LINES * 20)
+        engine = InferenceEngine(model=tiny_model(tokenizer), tokenizer=tokenizer, temperature=0)
+    engine.load()
+    service = AIService(engine=engine)
+    notes = transcript(engine.tokenizer, tokens)
+    
+    longest = [0]
+    submit = engine.submit
+    
+    def measured_submit(prompt, *args, **kwargs):
+        longest[0] = max(longest[0], service.count_tokens(prompt))
+        return submit(prompt, *args, **kwargs)
+    
+    engine.submit = measured_submit
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    asyncio.run(service.summarize_meeting(notes))
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    
+    results.put({
+        "tokens": service.count_tokens(notes),
+        "mode": "chunked" if chunked else "single",
+        "latency_s": round(elapsed, 2),
+        "longest_prompt": longest[0],
+        "batches": engine.batches,
+        "rss_before_mb": baseline,
+        "peak_rss_mb": peak_rss_mb()
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1000, 2000, 4000, 8000], help="transcript lengths")
+    parser.add_argument("--model", help="Hugging Face model to load from the local cache instead of the tiny model")
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    for tokens in args.tokens:
+        for chunked in (True, False):
+            results = context.Queue()
+            process = context.Process(target=run, args=(tokens, chunked, args.model, results))
+            process.start()
+            rows.append(results.get())
+            process.join()
+    
+    report("Summarizing one transcript", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Shared test fixtures.
+
+The app runs against a throwaway SQLite database (schema from create_all)
+with Celery in eager mode on the in-memory broker, so the suite needs no
+Postgres, Redis or model download.
+"""
+import os
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+_data_dir = tempfile.mkdtemp(prefix="workflow-tests-")
+
+# Settings are read at import time, so these must be set before app imports
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_data_dir, 'test.db')}",
+    "DB_SCHEMA_MODE": "create_all",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "CELERY_TASK_ALWAYS_EAGER": "true",
+    "AI_CACHE_DIR": os.path.join(_data_dir, "ai_results")
+})
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import SessionLocal, async_engine
+from app.main import app
+from app.models.meeting import Meeting
+from app.models.project import MemberRole, Project, ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from app.utils.auth import create_access_token
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a user; returns (user, auth headers)"""
+    def make_user():
+        name = f"user-{uuid.uuid4().hex[:12]}"
+        user = User(email=f"{name}@example.com", username=name, hashed_password="unused")
+        db.add(user)
+        db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': name})}"}
+        return user, headers
+    
+    return make_user
+
+
+@pytest.fixture
+def make_project(db):
+    """Create a project owned by `owner` with a few tasks and meetings"""
+    def make_project(owner, tasks: int = 0, meetings: int = 0):
+        project = Project(name=f"project-{uuid.uuid4().hex[:8]}", creator_id=owner.id)
+        db.add(project)
+        db.flush()
+        db.add(ProjectMember(project_id=project.id, user_id=owner.id, role=MemberRole.OWNER))
+        db.add_all(
+            Task(title=f"task {i}", project_id=project.id, creator_id=owner.id)
+            for i in range(tasks)
+        )
+        db.add_all(
+            Meeting(title=f"meeting {i}", project_id=project.id, creator_id=owner.id, meeting_date=datetime.now())
+            for i in range(meetings)
+        )
+        db.commit()
+        return project
+    
+    return make_project
+
+
+@pytest.fixture
+def count_queries():
+    """Collect the SQL statements the API runs inside a `with` block"""
+    @contextmanager
+    def count_queries():
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    
+    return count_queries
@@ -0,0 +1,29 @@
+"""
+AI result cache keys: cached task extractions must not outlive the
+ExtractedTask schema they were produced under.
+"""
+from typing import List, Optional
+
+from app.schemas.task import ExtractedTask
+from app.services import ai_service
+from app.services.ai_cache import AIResultCache
+from app.services.structured_output import Grammar
+
+
+class ExtractedTaskWithLabels(ExtractedTask):
+    labels: Optional[List[str]] = None
+
+
+def test_task_cache_key_follows_the_schema(tmp_path, monkeypatch):
+    service = ai_service.AIService(
+        engine=ai_service.InferenceEngine(model_name="tiny"),
+        cache=AIResultCache(template_version="test", directory=str(tmp_path))
+    )
+    before = service._cache_key("tasks", "Alice writes the docs.")
+    summary = service._cache_key("summary", "Alice writes the docs.")
+    
+    assert Grammar.for_type(List[ExtractedTask]).fingerprint == ai_service.TASK_GRAMMAR.fingerprint
+    monkeypatch.setattr(ai_service, "TASK_GRAMMAR", Grammar.for_type(List[ExtractedTaskWithLabels]))
+    
+    assert service._cache_key("tasks", "Alice writes the docs.") != before
+    assert service._cache_key("summary", "Alice writes the docs.") == summary
@@ -0,0 +1,82 @@
+"""
+Batching in the inference engine, on a tiny randomly initialized model
+with a tokenizer trained on the spot, so nothing is downloaded.
+"""
+import string
+
+import pytest
+import torch
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import PreTrainedTokenizerFast, Qwen2Config, Qwen2ForCausalLM
+
+from app.services.ai_service import InferenceEngine
+
+PROMPTS = [
+    "Summarize: the team decided to ship on Friday.",
+    "Extract tasks: Alice writes the docs.",
+    "Summarize: we use postgres.",
+    "Extract tasks: Bob books a room for the demo next week."
+]
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(
+        vocab_size=400,
+        special_tokens=["<|endoftext|>", "<|im_start|>", "<|im_end|>"],
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet()
+    )
+    tokenizer.train_from_iterator([*PROMPTS, string.printable] * 20, trainer)
+    return PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<|im_end|>", pad_token="<|endoftext|>")
+
+
+@pytest.fixture(scope="module")
+def model(tokenizer):
+    torch.manual_seed(0)
+    config = Qwen2Config(
+        vocab_size=len(tokenizer), hidden_size=64, intermediate_size=128,
+        num_hidden_layers=2, num_attention_heads=4, num_key_value_heads=2,
+        eos_token_id=tokenizer.eos_token_id, pad_token_id=tokenizer.pad_token_id
+    )
+    return Qwen2ForCausalLM(config).eval()
+
+
+@pytest.fixture
+def make_engine(model, tokenizer):
+    engines = []
+    
+    def make_engine(**options):
+        engine = InferenceEngine(model=model, tokenizer=tokenizer, temperature=0, **options)
+        engines.append(engine)
+        return engine
+    
+    yield make_engine
+    for engine in engines:
+        engine.shutdown()
+
+
+def test_concurrent_requests_share_a_batch(make_engine):
+    engine = make_engine(max_batch_size=len(PROMPTS), max_wait_ms=2000)
+    
+    futures = [engine.submit(prompt, max_new_tokens=8) for prompt in PROMPTS]
+    outputs = [future.result(timeout=60) for future in futures]
+    
+    assert all(isinstance(output, str) for output in outputs)
+    stats = engine.stats()
+    assert stats["batches"] == 1
+    assert stats["requests_served"] == len(PROMPTS)
+
+
+def test_batched_output_matches_one_at_a_time(make_engine):
+    batched = make_engine(max_batch_size=len(PROMPTS), max_wait_ms=2000)
+    single = make_engine(max_batch_size=1, max_wait_ms=0)
+    
+    together = [future.result(timeout=60) for future in [batched.submit(p, max_new_tokens=8) for p in PROMPTS]]
+    alone = [single.submit(prompt, max_new_tokens=8).result(timeout=60) for prompt in PROMPTS]
+    
+    # Left padding and the attention mask keep greedy decoding unchanged
+    assert together == alone
+    assert single.stats()["batches"] == len(PROMPTS)
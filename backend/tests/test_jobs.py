@@ -0,0 +1,129 @@
+"""
+Background job flow with Celery in eager mode: enqueue from the API, poll
+/api/jobs/{job_id}, and the per-project slot cap.
+"""
+from datetime import datetime
+
+import pytest
+from celery.canvas import Signature
+
+from app.config import settings
+from app.models.meeting import Meeting
+from app.models.task import Task
+from app.services.ai_service import AIService
+from app.worker import ProjectSlots, celery_app, project_slots, weekly_report_job
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    async def summarize_meeting(self, notes):
+        return {"ai_summary": "We agreed on a plan.", "key_decisions": ["Ship it"], "action_items": ["Write report"]}
+    
+    async def extract_tasks(self, notes):
+        return [
+            {"title": "Write report", "priority": "HIGH", "due_date": "2026-11-01", "ai_confidence": 80},
+            {"title": "Book a room", "due_date": "soon"},
+            {"title": ""}
+        ]
+    
+    monkeypatch.setattr(AIService, "summarize_meeting", summarize_meeting)
+    monkeypatch.setattr(AIService, "extract_tasks", extract_tasks)
+
+
+@pytest.fixture
+def meeting(db, make_user, make_project):
+    owner, headers = make_user()
+    project = make_project(owner)
+    meeting = Meeting(
+        title="Kickoff", project_id=project.id, creator_id=owner.id,
+        meeting_date=datetime.now(), raw_notes="We decided to ship. Alice writes the report."
+    )
+    db.add(meeting)
+    db.commit()
+    return meeting, headers
+
+
+def test_summarize_job_stores_the_summary(client, db, fake_ai, meeting):
+    meeting, headers = meeting
+    
+    response = client.post(f"/api/meetings/{meeting.id}/summarize", headers=headers)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    
+    job = client.get(f"/api/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "success"
+    assert job["result"] == {"meeting_id": meeting.id, "summarized": True}
+    db.refresh(meeting)
+    assert meeting.ai_summary == "We agreed on a plan."
+    assert meeting.key_decisions == ["Ship it"]
+
+
+def test_extract_tasks_job_creates_valid_tasks(client, db, fake_ai, meeting):
+    meeting, headers = meeting
+    
+    job_id = client.post(f"/api/meetings/{meeting.id}/extract-tasks", headers=headers).json()["job_id"]
+    
+    job = client.get(f"/api/jobs/{job_id}", headers=headers).json()
+    assert job["status"] == "success"
+    tasks = db.query(Task).filter(Task.meeting_id == meeting.id).order_by(Task.id).all()
+    assert [task.id for task in tasks] == job["result"]["task_ids"]
+    # The untitled item is dropped; an unparseable due date is cleared
+    assert [(task.title, task.due_date is None) for task in tasks] == [("Write report", False), ("Book a room", True)]
+
+
+def test_job_status_is_limited_to_project_members(client, fake_ai, meeting, make_user):
+    meeting, headers = meeting
+    _, outsider_headers = make_user()
+    job_id = client.post(f"/api/meetings/{meeting.id}/summarize", headers=headers).json()["job_id"]
+    
+    assert client.get(f"/api/jobs/{job_id}", headers=outsider_headers).status_code == 403
+    assert client.get("/api/jobs/not-a-job", headers=headers).status_code == 404
+
+
+def test_waiting_for_a_slot_does_not_spend_retries(monkeypatch, make_user, make_project):
+    owner, _ = make_user()
+    project = make_project(owner)
+    requeued = []
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", False)  # the gate is off in eager mode
+    monkeypatch.setattr(project_slots, "limit", 1)
+    monkeypatch.setattr(Signature, "apply_async", lambda self: requeued.append(self.options))
+    
+    assert project_slots.acquire(project.id, "running")
+    try:
+        job_id = f"{project.id}-waiting"
+        result = weekly_report_job.apply((project.id,), task_id=job_id, retries=2)
+    finally:
+        project_slots.release(project.id, "running")
+    
+    # Dropped here and requeued under the same id with the same retry count
+    assert result.state == "IGNORED"
+    assert [(o["task_id"], o["retries"], o["countdown"]) for o in requeued] == [
+        (job_id, 2, settings.JOB_SLOT_RETRY_SECONDS)
+    ]
+
+
+def test_eager_jobs_skip_the_slot_gate(monkeypatch, make_user, make_project):
+    owner, _ = make_user()
+    project = make_project(owner)
+    monkeypatch.setattr(project_slots, "limit", 1)
+    
+    assert project_slots.acquire(project.id, "running")
+    try:
+        result = weekly_report_job.apply_async((project.id,))
+    finally:
+        project_slots.release(project.id, "running")
+    
+    assert result.state == "SUCCESS"
+
+
+def test_leaked_slots_are_reclaimed(monkeypatch):
+    slots = ProjectSlots(1, "memory://")
+    assert slots.acquire(1, "crashed")
+    assert slots.acquire(1, "crashed")  # a job re-entering keeps its slot
+    assert not slots.acquire(1, "next")
+    
+    slots.release(1, "never-held")  # no-op, the cap still holds
+    assert not slots.acquire(1, "next")
+    
+    monkeypatch.setattr(settings, "JOB_SLOT_TTL_SECONDS", 0)  # every held slot is now stale
+    assert slots.acquire(1, "next")
@@ -0,0 +1,40 @@
+"""
+Meeting writes: members may create and edit meetings, viewers only read.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models.meeting import Meeting
+from app.models.project import MemberRole, ProjectMember
+
+
+@pytest.fixture
+def project_with(db, make_user, make_project):
+    """A project with a meeting and one extra member in `role`; returns (meeting, member headers)"""
+    def project_with(role: MemberRole):
+        owner, _ = make_user()
+        member, headers = make_user()
+        project = make_project(owner)
+        db.add(ProjectMember(project_id=project.id, user_id=member.id, role=role))
+        meeting = Meeting(title="Kickoff", project_id=project.id, creator_id=owner.id, meeting_date=datetime.now())
+        db.add(meeting)
+        db.commit()
+        return meeting, headers
+    
+    return project_with
+
+
+@pytest.mark.parametrize("role, allowed", [(MemberRole.MEMBER, True), (MemberRole.VIEWER, False)])
+def test_meeting_writes_need_an_editing_role(client, db, project_with, role, allowed):
+    meeting, headers = project_with(role)
+    expected = 200 if allowed else 403
+    
+    created = client.post("/api/meetings/", headers=headers, json={
+        "title": "Retro", "project_id": meeting.project_id, "meeting_date": datetime.now().isoformat()
+    })
+    updated = client.patch(f"/api/meetings/{meeting.id}", headers=headers, json={"raw_notes": "rewritten"})
+    
+    assert (created.status_code, updated.status_code) == (expected, expected)
+    db.refresh(meeting)
+    assert (meeting.raw_notes == "rewritten") == allowed
@@ -0,0 +1,73 @@
+"""
+Project endpoints: listing a user's projects and loading a project with
+its members must not issue a query per row, and membership writes must
+not trust the role cache.
+"""
+import pytest
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import engine
+from app.models.project import MemberRole, ProjectMember
+from app.utils.dependencies import role_cache
+
+
+@pytest.mark.parametrize("fast_json", [False, True])
+def test_project_listing_counts_in_one_query(client, make_user, make_project, count_queries, monkeypatch, fast_json):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast_json)
+    user, headers = make_user()
+    for _ in range(30):
+        make_project(user, tasks=3, meetings=2)
+    # Warm the principal cache so only the listing itself is counted
+    assert client.get("/api/projects/", headers=headers).status_code == 200
+    
+    with count_queries() as statements:
+        response = client.get("/api/projects/", headers=headers)
+    
+    assert response.status_code == 200
+    projects = response.json()
+    assert len(projects) == 30
+    assert {(p["member_count"], p["task_count"], p["meeting_count"]) for p in projects} == {(1, 3, 2)}
+    # One statement for the ETag version, one for the projects with their counts
+    assert len(statements) == 2
+
+
+def test_project_members_load_in_one_query(client, db, make_user, make_project, count_queries):
+    owner, headers = make_user()
+    project = make_project(owner)
+    for _ in range(199):
+        member, _ = make_user()
+        db.add(ProjectMember(project_id=project.id, user_id=member.id, role=MemberRole.MEMBER))
+    db.commit()
+    # Warm the principal and role caches
+    assert client.get(f"/api/projects/{project.id}", headers=headers).status_code == 200
+    
+    with count_queries() as statements:
+        response = client.get(f"/api/projects/{project.id}", headers=headers)
+    
+    assert response.status_code == 200
+    members = response.json()["members"]
+    assert len(members) == 200
+    assert all(member["user_name"] and member["user_email"] for member in members)
+    # ETag version, the project with its counts, and one for all 200 members
+    assert len(statements) == 3
+
+
+def test_adding_an_existing_member_ignores_a_stale_role_cache(client, make_user, make_project):
+    owner, headers = make_user()
+    member, _ = make_user()
+    project = make_project(owner)
+    # Cached as a non-member, then added by another process (no mapper events here)
+    role_cache.set((member.id, project.id), "")
+    with engine.begin() as connection:
+        connection.execute(insert(ProjectMember).values(
+            project_id=project.id, user_id=member.id, role=MemberRole.MEMBER
+        ))
+    
+    response = client.post(
+        f"/api/projects/{project.id}/members", headers=headers,
+        json={"user_id": member.id, "role": "member"}
+    )
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User is already a member of this project"
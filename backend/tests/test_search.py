@@ -0,0 +1,34 @@
+"""
+The in-process search index (SQLite) follows committed writes only.
+"""
+from app.models.task import Task
+
+
+def test_index_ignores_rolled_back_writes(client, db, make_user, make_project):
+    owner, headers = make_user()
+    project = make_project(owner)
+    task = Task(title="Calibrate the telescope", project_id=project.id, creator_id=owner.id)
+    db.add(task)
+    db.commit()
+    
+    def titles(q):
+        response = client.get("/api/search/", params={"q": q, "project_id": project.id}, headers=headers)
+        assert response.status_code == 200
+        return [hit["title"] for hit in response.json()]
+    
+    assert titles("telescope") == ["Calibrate the telescope"]  # builds the index
+    
+    db.add(Task(title="Polish the telescope mirror", project_id=project.id, creator_id=owner.id))
+    db.flush()
+    db.rollback()
+    assert titles("mirror") == []
+    
+    db.delete(task)
+    db.flush()
+    db.rollback()
+    assert titles("telescope") == ["Calibrate the telescope"]
+    
+    task.title = "Calibrate the spectrograph"
+    db.commit()
+    assert titles("spectrograph") == ["Calibrate the spectrograph"]
+    assert titles("telescope") == []
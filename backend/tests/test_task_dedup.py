@@ -0,0 +1,35 @@
+"""
+Project task indexes follow writes committed by other sessions.
+"""
+from datetime import timedelta
+
+from sqlalchemy import update
+
+from app.models.task import Task
+from app.services.task_dedup import ProjectTaskIndex, task_terms
+
+
+def test_sync_finds_a_late_commit_stamped_behind_the_watermark(db, make_user, make_project):
+    owner, _ = make_user()
+    project = make_project(owner)
+    early = Task(title="Order the projector", project_id=project.id, creator_id=owner.id)
+    late = Task(title="Book the venue", project_id=project.id, creator_id=owner.id)
+    db.add_all([early, late])
+    db.commit()
+    
+    index = ProjectTaskIndex(project.id)
+    index.sync(db)
+    assert index.best_match(task_terms("Order the projector"), 0.9) == early.id
+    
+    # A transaction that started (and was stamped) before the newest write
+    # seen, but committed after the sync; count and max stamp are unchanged
+    db.execute(
+        update(Task).where(Task.id == early.id).values(
+            title="Rent a sound system", updated_at=index.synced_to - timedelta(seconds=1)
+        )
+    )
+    db.commit()
+    
+    index.sync(db)
+    assert index.best_match(task_terms("Rent a sound system"), 0.9) == early.id
+    assert index.best_match(task_terms("Order the projector"), 0.9) is None
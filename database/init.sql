@@ -72,7 +72,12 @@ CREATE TABLE IF NOT EXISTS meetings (
     google_doc_id VARCHAR(255),
     slack_thread_ts VARCHAR(255),
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMPTZ
+    updated_at TIMESTAMPTZ,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(raw_notes, '')), 'C')
+    ) STORED
 );
 
 -- Tasks table
@@ -93,7 +98,11 @@ CREATE TABLE IF NOT EXISTS tasks (
     ai_extracted TEXT,
     ai_confidence INTEGER CHECK (ai_confidence >= 0 AND ai_confidence <= 100),
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMPTZ
+    updated_at TIMESTAMPTZ,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- Weekly reports table
@@ -149,6 +158,18 @@ CREATE INDEX idx_meetings_date ON meetings(meeting_date);
 CREATE INDEX idx_weekly_reports_project ON weekly_reports(project_id);
 CREATE INDEX idx_integrations_user ON integrations(user_id);
 
+-- Composite indexes backing keyset (cursor) pagination
+CREATE INDEX idx_projects_created_id ON projects(created_at, id);
+CREATE INDEX idx_tasks_project_created_id ON tasks(project_id, created_at, id);
+CREATE INDEX idx_tasks_project_due_id ON tasks(project_id, due_date, id);
+
+-- Covers the per-project GROUP BY status behind task statistics (index-only scan)
+CREATE INDEX idx_tasks_project_status ON tasks(project_id, status);
+
+-- Full-text search over meeting notes and tasks (/api/search)
+CREATE INDEX idx_meetings_search ON meetings USING gin (search_vector);
+CREATE INDEX idx_tasks_search ON tasks USING gin (search_vector);
+
 -- Create update timestamp trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -174,6 +195,14 @@ CREATE TRIGGER update_meetings_updated_at BEFORE UPDATE ON meetings
 CREATE TRIGGER update_integrations_updated_at BEFORE UPDATE ON integrations
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Record the schema as Alembic revision 0002 (backend/alembic), so the
+-- backend's startup check passes and later migrations apply on top
+CREATE TABLE IF NOT EXISTS alembic_version (
+    version_num VARCHAR(32) NOT NULL,
+    CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
+);
+INSERT INTO alembic_version (version_num) VALUES ('0002');
+
 -- Insert default admin user (password: admin123)
 INSERT INTO users (email, username, full_name, hashed_password, is_superuser)
 VALUES (